@@ -10,19 +10,29 @@ Usage:
     python inbound_inbox_triage.py --since-hours 24     # Backfill last 24 hours
     python inbound_inbox_triage.py --daily-summary      # Send summary and exit
     python inbound_inbox_triage.py --dry-run            # Preview without changes
+    python inbound_inbox_triage.py --watch-seconds 60   # Keep polling every 60s
 """
 
 import argparse
 import base64
 import csv
 import email
+import functools
+import hashlib
 import imaplib
+import io
+import itertools
 import json
 import os
+import queue
 import re
 import shutil
 import smtplib
 import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from email.header import decode_header
 from email.mime.text import MIMEText
@@ -77,6 +87,31 @@ IMAP_FOLDER_UNSUB = os.getenv("IMAP_FOLDER_UNSUB", "Processed/Unsubscribe")
 IMAP_FOLDER_BOUNCE = os.getenv("IMAP_FOLDER_BOUNCE", "Processed/Bounce")
 SUPPORT_INBOX = os.getenv("REPLY_TO_EMAIL", "support@microflowops.com").strip().lower()
 
+# SMTP configuration (notifications), resolved once at import
+@dataclass(frozen=True, slots=True)
+class SmtpConfig:
+    host: str
+    port: int
+    user: str
+    password: str
+    from_email: str
+
+
+_SMTP_CFG = SmtpConfig(
+    host=os.getenv("SMTP_HOST", "smtppro.zoho.com"),
+    port=int(os.getenv("SMTP_PORT", "465")),
+    user=os.getenv("SMTP_USER", ""),
+    password=os.getenv("SMTP_PASS", ""),
+    from_email=os.getenv("FROM_EMAIL", os.getenv("SMTP_USER", "")),
+)
+_SMTP_ENABLED = bool(_SMTP_CFG.user and _SMTP_CFG.password)
+
+# Gmail message bodies are truncated to this many chars while decoding
+MAX_BODY_CHARS = 5000
+
+# Gmail detail fetches per batched HTTP request (API max 100; Google advises <= 50)
+GMAIL_BATCH_SIZE = 50
+
 # Gmail OAuth scopes
 SCOPES = [
     "https://www.googleapis.com/auth/gmail.readonly",
@@ -123,6 +158,33 @@ BUG_FEATURE_PATTERNS = [
     "doesn't work", "issue"
 ]
 
+# Precompiled patterns used on every processed message
+_SAFE_ID_RE = re.compile(r'[^a-zA-Z0-9]')
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+_ANGLE_ADDR_RE = re.compile(r'<([^>]+)>')
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+# DSN patterns for recovering the original recipient of a bounce
+_BOUNCE_RECIPIENT_RES = [
+    re.compile(r'Final-Recipient:\s*rfc822;\s*([^\s\n<>]+)', re.IGNORECASE),
+    re.compile(r'Original-Recipient:\s*rfc822;\s*([^\s\n<>]+)', re.IGNORECASE),
+    re.compile(r'rfc822;\s*([^\s\n<>]+@[^\s\n<>]+)', re.IGNORECASE),
+    re.compile(r'<([^>]+@[^>]+)>\s*was not found', re.IGNORECASE),
+    re.compile(r'The email account.*?<([^>]+)>.*?does not exist', re.IGNORECASE),
+    re.compile(r'User\s+([^\s\n<>]+@[^\s\n<>]+)\s+not found', re.IGNORECASE),
+]
+
+# Forwarded-header lines that may carry the original sender
+_FORWARDED_SENDER_RES = [
+    re.compile(r"^From:\s*(.+)$", re.IGNORECASE),
+    re.compile(r"^Reply-To:\s*(.+)$", re.IGNORECASE),
+    re.compile(r"^Original Sender:\s*(.+)$", re.IGNORECASE),
+]
+
+# Triage categories (tally keys for run summaries)
+CATEGORIES = ("unsubscribe", "bounce", "hot_interest", "question", "objection",
+              "out_of_office", "bug_feature", "other")
+
 # Gmail labels
 LABEL_NAMES = {
     "unsubscribe": "OSHA_UNSUB",
@@ -139,6 +201,36 @@ LABEL_NAMES = {
 # =============================================================================
 # STATE MANAGEMENT
 # =============================================================================
+PROCESSED_IDS_MAX = 1000
+
+
+class ProcessedIds:
+    """Bounded, insertion-ordered set of processed message IDs (oldest evicted first)."""
+
+    def __init__(self, ids=(), maxlen: int = PROCESSED_IDS_MAX):
+        self._order = deque(maxlen=maxlen)
+        self._members = set()
+        for msg_id in ids:
+            self.append(msg_id)
+
+    def append(self, msg_id: str):
+        if msg_id in self._members:
+            return
+        if len(self._order) == self._order.maxlen:
+            self._members.discard(self._order[0])
+        self._order.append(msg_id)
+        self._members.add(msg_id)
+
+    def __contains__(self, msg_id) -> bool:
+        return msg_id in self._members
+
+    def __iter__(self):
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
 def load_state() -> dict:
     """Load inbox processing state."""
     default_state = {
@@ -153,15 +245,19 @@ def load_state() -> dict:
             for key in default_state:
                 if key not in state:
                     state[key] = default_state[key]
+            state["processed_message_ids"] = ProcessedIds(state["processed_message_ids"])
             return state
+    default_state["processed_message_ids"] = ProcessedIds()
     return default_state
 
 
 def save_state(state: dict):
     """Save inbox processing state."""
     STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    serializable = dict(state)
+    serializable["processed_message_ids"] = list(state.get("processed_message_ids", []))
     with open(STATE_PATH, "w") as f:
-        json.dump(state, f, indent=2)
+        json.dump(serializable, f, indent=2)
 
 
 # =============================================================================
@@ -287,7 +383,7 @@ def classify_email(subject: str, body: str, from_email: str) -> str:
 
 def extract_sender_email(from_header: str) -> str:
     """Extract email address from From header."""
-    match = re.search(r'<([^>]+)>', from_header)
+    match = _ANGLE_ADDR_RE.search(from_header)
     if match:
         return match.group(1).strip().lower()
     if "@" in from_header:
@@ -301,18 +397,9 @@ def extract_bounce_recipient(body: str, headers: dict) -> str:
     Looks for Final-Recipient, Original-Recipient, or rfc822; patterns.
     """
     # Check common DSN patterns
-    patterns = [
-        r'Final-Recipient:\s*rfc822;\s*([^\s\n<>]+)',
-        r'Original-Recipient:\s*rfc822;\s*([^\s\n<>]+)',
-        r'rfc822;\s*([^\s\n<>]+@[^\s\n<>]+)',
-        r'<([^>]+@[^>]+)>\s*was not found',
-        r'The email account.*?<([^>]+)>.*?does not exist',
-        r'User\s+([^\s\n<>]+@[^\s\n<>]+)\s+not found',
-    ]
-    
     text = body.lower()
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _BOUNCE_RECIPIENT_RES:
+        match = pattern.search(text)
         if match:
             email = match.group(1).strip().lower()
             if "@" in email and "mailer-daemon" not in email:
@@ -360,7 +447,7 @@ def extract_plain_body(msg: email.message.Message) -> str:
                 except Exception:
                     html_body = part.get_payload(decode=True).decode(errors="replace")
                 # Strip tags crudely
-                return re.sub(r"<[^>]+>", " ", html_body)
+                return _HTML_TAG_RE.sub(" ", html_body)
     else:
         try:
             return msg.get_content()
@@ -383,15 +470,10 @@ def extract_original_sender(from_email: str, reply_to: str, body: str) -> str:
         return from_email
     
     # Attempt to extract from forwarded headers in body
-    patterns = [
-        r"^From:\s*(.+)$",
-        r"^Reply-To:\s*(.+)$",
-        r"^Original Sender:\s*(.+)$",
-    ]
     for line in body.splitlines():
         line = line.strip()
-        for pat in patterns:
-            m = re.match(pat, line, re.IGNORECASE)
+        for pat in _FORWARDED_SENDER_RES:
+            m = pat.match(line)
             if m:
                 candidate = m.group(1)
                 _, email_addr = parseaddr(candidate)
@@ -559,7 +641,7 @@ def get_new_messages(service, state: dict, since_hours: int = 24, max_results: i
         messages = results.get("messages", [])
         
         # Filter out already processed
-        processed = set(state.get("processed_message_ids", []))
+        processed = state.get("processed_message_ids", ())
         new_messages = [m for m in messages if m["id"] not in processed]
         
         return new_messages
@@ -568,52 +650,127 @@ def get_new_messages(service, state: dict, since_hours: int = 24, max_results: i
         return []
 
 
-def get_message_details(service, message_id: str) -> dict:
+def _decode_body_data(data: str, max_chars: int) -> str:
+    """Decode base64url body data, decoding only enough input for max_chars."""
+    # UTF-8 uses at most 4 bytes per char; base64 encodes 3 bytes in 4 chars
+    needed_bytes = max_chars * 4
+    data = data[:(needed_bytes + 2) // 3 * 4]
+    return base64.urlsafe_b64decode(data).decode("utf-8", errors="ignore")[:max_chars]
+
+
+@dataclass(slots=True)
+class MessageDetails:
+    """Fields of a fetched Gmail message used by triage."""
+    id: str
+    from_: str
+    subject: str
+    body: str
+    headers: dict = field(default_factory=dict)
+
+
+def _parse_message(msg: dict, message_id: str, max_body_chars: int = MAX_BODY_CHARS) -> MessageDetails:
+    """Extract headers and plain-text body (truncated to max_body_chars) from a Gmail message."""
+    # Extract headers
+    headers = {h["name"].lower(): h["value"] for h in msg.get("payload", {}).get("headers", [])}
+    
+    # Extract body
+    body = ""
+    payload = msg.get("payload", {})
+    
+    # Simple text body
+    if payload.get("body", {}).get("data"):
+        body = _decode_body_data(payload["body"]["data"], max_body_chars)
+    
+    # Multipart - look for text/plain first
+    for part in payload.get("parts", []):
+        if part.get("mimeType") == "text/plain":
+            if part.get("body", {}).get("data"):
+                body = _decode_body_data(part["body"]["data"], max_body_chars)
+                break
+        # Check nested parts
+        for subpart in part.get("parts", []):
+            if subpart.get("mimeType") == "text/plain":
+                if subpart.get("body", {}).get("data"):
+                    body = _decode_body_data(subpart["body"]["data"], max_body_chars)
+                    break
+    
+    return MessageDetails(
+        id=message_id,
+        from_=headers.get("from", ""),
+        subject=headers.get("subject", "(no subject)"),
+        body=body,
+        headers=headers,
+    )
+
+
+def get_message_details(service, message_id: str,
+                        max_body_chars: int = MAX_BODY_CHARS) -> MessageDetails:
     """Get full message details."""
     try:
         msg = service.users().messages().get(
             userId="me", id=message_id, format="full"
         ).execute()
-        
-        # Extract headers
-        headers = {h["name"].lower(): h["value"] for h in msg.get("payload", {}).get("headers", [])}
-        
-        # Extract body
-        body = ""
-        payload = msg.get("payload", {})
-        
-        # Simple text body
-        if payload.get("body", {}).get("data"):
-            body = base64.urlsafe_b64decode(payload["body"]["data"]).decode("utf-8", errors="ignore")
-        
-        # Multipart - look for text/plain first
-        for part in payload.get("parts", []):
-            if part.get("mimeType") == "text/plain":
-                if part.get("body", {}).get("data"):
-                    body = base64.urlsafe_b64decode(part["body"]["data"]).decode("utf-8", errors="ignore")
-                    break
-            # Check nested parts
-            for subpart in part.get("parts", []):
-                if subpart.get("mimeType") == "text/plain":
-                    if subpart.get("body", {}).get("data"):
-                        body = base64.urlsafe_b64decode(subpart["body"]["data"]).decode("utf-8", errors="ignore")
-                        break
-        
-        return {
-            "id": message_id,
-            "subject": headers.get("subject", "(no subject)"),
-            "from": headers.get("from", ""),
-            "to": headers.get("to", ""),
-            "date": headers.get("date", ""),
-            "body": body[:5000],
-            "snippet": msg.get("snippet", ""),
-            "headers": headers
-        }
+        return _parse_message(msg, message_id, max_body_chars)
     except Exception as e:
         print(f"[ERROR] Failed to get message {message_id}: {e}")
         return None
 
 
+def fetch_details_bulk(service, msg_ids: list[str],
+                       max_body_chars: int = MAX_BODY_CHARS) -> dict[str, MessageDetails]:
+    """
+    Fetch full message details via batched HTTP requests (GMAIL_BATCH_SIZE per call).
+    Returns msg_id -> details; failed messages are reported and omitted.
+    """
+    results = {}
+    
+    def on_response(request_id, response, exception):
+        if exception is not None:
+            print(f"[ERROR] Failed to get message {request_id}: {exception}")
+            return
+        try:
+            results[request_id] = _parse_message(response, request_id, max_body_chars)
+        except Exception as e:
+            print(f"[ERROR] Failed to parse message {request_id}: {e}")
+    
+    for i in range(0, len(msg_ids), GMAIL_BATCH_SIZE):
+        chunk = msg_ids[i:i + GMAIL_BATCH_SIZE]
+        batch = service.new_batch_http_request(callback=on_response)
+        for msg_id in chunk:
+            batch.add(service.users().messages().get(userId="me", id=msg_id, format="full"),
+                      request_id=msg_id)
+        try:
+            batch.execute()
+        except Exception as e:
+            print(f"[ERROR] Batch fetch failed ({len(chunk)} messages): {e}")
+    
+    return results
+
+
+def classify_details(details: MessageDetails) -> dict:
+    """Classify fetched message details without touching shared state."""
+    from_email = extract_sender_email(details.from_)
+    category = classify_email(details.subject, details.body, from_email)
+    return {"details": details, "from_email": from_email, "category": category}
+
+
+def fetch_and_classify(service, msg_id: str) -> dict:
+    """Fetch and classify a single message. Returns None on fetch failure."""
+    details = get_message_details(service, msg_id)
+    if not details:
+        return None
+    return classify_details(details)
+
+
+def fetch_and_classify_all(service, msg_ids: list[str]) -> list:
+    """Batch-fetch and classify messages; results keep msg_ids order (None on failure)."""
+    details_by_id = fetch_details_bulk(service, msg_ids)
+    return [
+        classify_details(details_by_id[msg_id]) if msg_id in details_by_id else None
+        for msg_id in msg_ids
+    ]
+
+
 def apply_label(service, message_id: str, label_id: str, dry_run: bool = False):
     """Apply label to message."""
     if dry_run:
@@ -631,16 +788,17 @@ def apply_label(service, message_id: str, label_id: str, dry_run: bool = False):
 # REPLY DRAFTS & TICKETS
 # =============================================================================
 def create_reply_draft(from_email: str, subject: str, body: str, 
-                       category: str, msg_id: str, dry_run: bool = False) -> str:
+                       category: str, msg_id: str, dry_run: bool = False,
+                       now: datetime | None = None) -> str:
     """Create a draft reply for hot_interest or question."""
     if dry_run:
         print(f"    [DRY-RUN] Would create reply draft for {category}")
         return ""
     
-    REPLY_DRAFTS_DIR.mkdir(parents=True, exist_ok=True)
-    
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    safe_id = re.sub(r'[^a-zA-Z0-9]', '', msg_id)[:20]
+    now = now or datetime.now()
+    date_str = now.strftime("%Y-%m-%d")
+    generated = now.strftime("%Y-%m-%d %H:%M")
+    safe_id = _SAFE_ID_RE.sub('', msg_id)[:20]
     filename = f"{date_str}_{safe_id}.md"
     filepath = REPLY_DRAFTS_DIR / filename
     
@@ -649,7 +807,7 @@ def create_reply_draft(from_email: str, subject: str, body: str,
 
 **To**: {from_email}
 **Re**: {subject}
-**Generated**: {datetime.now().strftime("%Y-%m-%d %H:%M")}
+**Generated**: {generated}
 
 ---
 
@@ -678,7 +836,7 @@ Subject: {subject}
 
 **To**: {from_email}
 **Re**: {subject}
-**Generated**: {datetime.now().strftime("%Y-%m-%d %H:%M")}
+**Generated**: {generated}
 
 ---
 
@@ -701,36 +859,32 @@ Subject: {subject}
 {body[:500]}
 """
     
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(template)
+    filepath.write_text(template, encoding="utf-8")
     
     print(f"    [DRAFT] Created: {filepath.name}")
     return str(filepath)
 
 
 def create_eng_ticket(from_email: str, subject: str, body: str, 
-                      msg_id: str, dry_run: bool = False) -> str:
+                      msg_id: str, dry_run: bool = False,
+                      now: datetime | None = None) -> str:
     """Create engineering ticket for bug/feature request."""
     if dry_run:
         print(f"    [DRY-RUN] Would create eng ticket")
         return ""
     
-    ENG_TICKETS_DIR.mkdir(parents=True, exist_ok=True)
-    
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    slug = re.sub(r'[^a-z0-9]+', '_', subject.lower())[:30].strip('_')
-    filename = f"{date_str}_{slug}.md"
+    now = now or datetime.now()
+    date_str = now.strftime("%Y-%m-%d")
+    slug = _SLUG_RE.sub('_', subject.lower())[:30].strip('_')
+    # Message IDs are unique, so a digest suffix avoids collisions without probing
+    # the directory and keeps re-runs of the same message idempotent.
+    msg_digest = hashlib.sha1(msg_id.encode("utf-8")).hexdigest()[:8]
+    filename = f"{date_str}_{slug}_{msg_digest}.md"
     filepath = ENG_TICKETS_DIR / filename
     
-    # Avoid overwriting
-    counter = 1
-    while filepath.exists():
-        filepath = ENG_TICKETS_DIR / f"{date_str}_{slug}_{counter}.md"
-        counter += 1
-    
     ticket = f"""# Engineering Ticket
 
-**Date**: {datetime.now().strftime("%Y-%m-%d %H:%M")}
+**Date**: {now.strftime("%Y-%m-%d %H:%M")}
 **Reporter**: {from_email}
 **Subject**: {subject}
 **Message ID**: {msg_id}
@@ -769,8 +923,7 @@ TBD - needs investigation
 - [ ] No regression
 """
     
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(ticket)
+    filepath.write_text(ticket, encoding="utf-8")
     
     print(f"    [TICKET] Created: {filepath.name}")
     return str(filepath)
@@ -779,38 +932,69 @@ TBD - needs investigation
 # =============================================================================
 # NOTIFICATIONS
 # =============================================================================
+def _build_message(to_email: str, subject: str, body: str, from_email: str) -> MIMEText:
+    """Build a plain-text notification message."""
+    msg = MIMEText(body)
+    msg["Subject"] = subject
+    msg["From"] = from_email
+    msg["To"] = to_email
+    return msg
+
+
+def _encode_plain_message(to_email: str, subject: str, body: str, from_email: str) -> bytes:
+    """
+    Build wire bytes for a short plain-text message without the email package.
+    Returns None for non-ASCII content or header-unsafe values; use MIMEText then.
+    """
+    headers = (from_email, to_email, subject)
+    if not (subject.isascii() and body.isascii()) or any("\r" in h or "\n" in h for h in headers):
+        return None
+    body = body.replace("\r\n", "\n").replace("\n", "\r\n")
+    return (
+        f"From: {from_email}\r\n"
+        f"To: {to_email}\r\n"
+        f"Subject: {subject}\r\n"
+        "MIME-Version: 1.0\r\n"
+        "Content-Type: text/plain; charset=\"us-ascii\"\r\n"
+        "Content-Transfer-Encoding: 7bit\r\n"
+        f"\r\n{body}"
+    ).encode("ascii")
+
+
+def _deliver(server: smtplib.SMTP, to_email: str, subject: str, body: str):
+    """Send one message on an open session, using raw bytes when possible."""
+    payload = _encode_plain_message(to_email, subject, body, _SMTP_CFG.from_email)
+    if payload is None:
+        server.send_message(_build_message(to_email, subject, body, _SMTP_CFG.from_email))
+    else:
+        server.sendmail(_SMTP_CFG.from_email, [to_email], payload)
+
+
+def _open_smtp_session() -> smtplib.SMTP:
+    """Open and authenticate an SMTP session (SSL on 465, STARTTLS otherwise)."""
+    if _SMTP_CFG.port == 465:
+        server = smtplib.SMTP_SSL(_SMTP_CFG.host, _SMTP_CFG.port)
+    else:
+        server = smtplib.SMTP(_SMTP_CFG.host, _SMTP_CFG.port)
+        server.starttls()
+    server.login(_SMTP_CFG.user, _SMTP_CFG.password)
+    return server
+
+
 def send_smtp_email(to_email: str, subject: str, body: str, dry_run: bool = False) -> bool:
     """Send email via SMTP."""
-    smtp_host = os.getenv("SMTP_HOST", "smtppro.zoho.com")
-    smtp_port = int(os.getenv("SMTP_PORT", "465"))
-    smtp_user = os.getenv("SMTP_USER", "")
-    smtp_pass = os.getenv("SMTP_PASS", "")
-    from_email = os.getenv("FROM_EMAIL", smtp_user)
-    
     if dry_run:
         print(f"    [DRY-RUN] Would email: {to_email}")
         print(f"    Subject: {subject}")
         return True
     
-    if not smtp_user or not smtp_pass:
+    if not _SMTP_ENABLED:
         print("[WARN] SMTP not configured")
         return False
     
     try:
-        msg = MIMEText(body)
-        msg["Subject"] = subject
-        msg["From"] = from_email
-        msg["To"] = to_email
-        
-        if smtp_port == 465:
-            with smtplib.SMTP_SSL(smtp_host, smtp_port) as server:
-                server.login(smtp_user, smtp_pass)
-                server.send_message(msg)
-        else:
-            with smtplib.SMTP(smtp_host, smtp_port) as server:
-                server.starttls()
-                server.login(smtp_user, smtp_pass)
-                server.send_message(msg)
+        with _open_smtp_session() as server:
+            _deliver(server, to_email, subject, body)
         
         print(f"    [NOTIFIED] {to_email}")
         return True
@@ -819,6 +1003,86 @@ def send_smtp_email(to_email: str, subject: str, body: str, dry_run: bool = Fals
         return False
 
 
+class NotificationWorker:
+    """
+    Deliver queued notifications on a background thread so SMTP round-trips stay
+    off the message-processing path. One SMTP session is kept open across sends;
+    a failed send drops the session and retries that message on a fresh one.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.sent = 0
+        self._server = None
+        self._thread = None
+
+    def put(self, to_email: str, subject: str, body: str, dry_run: bool = False):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="triage-notify", daemon=True)
+            self._thread.start()
+        self.queue.put_nowait((to_email, subject, body, dry_run))
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                self._send(*item)
+            finally:
+                self.queue.task_done()
+
+    def _send(self, to_email: str, subject: str, body: str, dry_run: bool):
+        if dry_run or not _SMTP_ENABLED:
+            if send_smtp_email(to_email, subject, body, dry_run):
+                self.sent += 1
+            return
+        try:
+            if self._server is None:
+                self._server = _open_smtp_session()
+            _deliver(self._server, to_email, subject, body)
+            print(f"    [NOTIFIED] {to_email}")
+            self.sent += 1
+        except Exception as e:
+            print(f"[WARN] Pooled notification send failed: {e}; retrying on a new connection")
+            self._close_session()
+            if send_smtp_email(to_email, subject, body):
+                self.sent += 1
+
+    def _close_session(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+    def drain(self):
+        """Block until every queued notification has been handled."""
+        self.queue.join()
+
+    def shutdown(self):
+        """Drain the queue, stop the worker thread and close the SMTP session."""
+        if self._thread is not None:
+            self.queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._close_session()
+
+
+_NOTIFIER = NotificationWorker()
+
+
+def queue_notification(to_email: str, subject: str, body: str, dry_run: bool = False):
+    """Hand a notification to the background sender and return immediately."""
+    _NOTIFIER.put(to_email, subject, body, dry_run)
+
+
+def flush_notifications():
+    """Wait for queued notifications to be delivered."""
+    _NOTIFIER.drain()
+
+
 def send_immediate_notification(from_email: str, subject: str, body: str,
                                  category: str, dry_run: bool = False):
     """Send immediate notification for high-priority items."""
@@ -839,7 +1103,7 @@ Subject: {subject}
 Action: Review and respond.
 """
     
-    send_smtp_email(notify_email, notif_subject, notif_body, dry_run)
+    queue_notification(notify_email, notif_subject, notif_body, dry_run)
 
 
 def send_bounce_spike_warning(bounce_count: int, sent_count: int, 
@@ -865,25 +1129,180 @@ This exceeds the 5% threshold. Please investigate:
 Action required to protect sender reputation.
 """
     
-    send_smtp_email(notify_email, subject, body, dry_run)
+    queue_notification(notify_email, subject, body, dry_run)
 
 
 # =============================================================================
 # METRICS
 # =============================================================================
-def get_today_sent_count() -> int:
-    """Get count of emails sent today from cold_email_log.csv."""
-    today = datetime.now().strftime("%Y-%m-%d")
-    count = 0
-    
-    if COLD_EMAIL_LOG_PATH.exists():
-        with open(COLD_EMAIL_LOG_PATH, "r", newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get("campaign_id") == today and row.get("status") == "sent":
-                    count += 1
-    
-    return count
+# Initial tail window for append-ordered logs; doubled until it reaches older rows.
+TAIL_WINDOW_BYTES = 512 * 1024
+
+# Row starts in our append-only logs begin with an ISO-8601 timestamp.
+_ISO_ROW_START_RE = re.compile(rb"\d{4}-\d{2}-\d{2}T")
+_ISO_TS_RE = re.compile(r"\d{4}-\d{2}-\d{2}T")
+
+# Below this span the triage log binary search hands over to a linear scan.
+BISECT_MIN_SPAN_BYTES = 4096
+
+
+def _row_start_at_or_after(f, offset: int) -> int:
+    """
+    Return the byte offset of the first log row starting after `offset`.
+    Skips the partial line at `offset`, then any continuation lines of a
+    quoted multi-line field (rows always start with an ISO timestamp).
+    """
+    f.seek(offset)
+    f.readline()
+    while True:
+        pos = f.tell()
+        line = f.readline()
+        if not line or _ISO_ROW_START_RE.match(line):
+            return pos
+
+
+def _first_row_after(f, data_start: int, size: int, cutoff: bytes) -> int:
+    """
+    Binary-search an append-ordered log for a row-start offset such that every
+    row before it has a timestamp <= cutoff. ISO-8601 timestamps sort
+    lexicographically, so rows are compared as raw bytes without parsing.
+    """
+    lo, hi = data_start, size
+    while hi - lo > BISECT_MIN_SPAN_BYTES:
+        mid = (lo + hi) // 2
+        pos = _row_start_at_or_after(f, mid)
+        if pos >= hi:
+            hi = mid
+            continue
+        f.seek(pos)
+        ts = f.readline().split(b",", 1)[0]
+        if ts > cutoff:
+            hi = mid
+        else:
+            lo = pos
+    return lo
+
+
+def get_today_sent_count(today: str = None) -> int:
+    """
+    Get count of emails sent today from cold_email_log.csv.
+    The log is append-ordered, so only the tail covering today is parsed.
+    """
+    today = today or datetime.now().strftime("%Y-%m-%d")
+    
+    if not COLD_EMAIL_LOG_PATH.exists():
+        return 0
+    
+    with open(COLD_EMAIL_LOG_PATH, "rb") as f:
+        header_line = f.readline()
+        header = next(csv.reader([header_line.decode("utf-8-sig")]), [])
+        if "campaign_id" not in header or "status" not in header:
+            return 0
+        i_campaign = header.index("campaign_id")
+        i_status = header.index("status")
+        i_ts = header.index("timestamp") if "timestamp" in header else None
+        min_len = max(i_campaign, i_status) + 1
+        
+        data_start = f.tell()
+        size = f.seek(0, os.SEEK_END)
+        window = TAIL_WINDOW_BYTES
+        while True:
+            start = data_start
+            if size - window > data_start:
+                start = _row_start_at_or_after(f, size - window)
+            f.seek(start)
+            text = f.read().decode("utf-8", errors="replace")
+            rows = csv.reader(io.StringIO(text, newline=""))
+            first = next(rows, None)
+            # Window must reach back past today unless it already covers the whole file
+            if start > data_start and (
+                first is None
+                or (i_ts is not None and len(first) > i_ts and first[i_ts][:10] >= today)
+            ):
+                window *= 2
+                continue
+            if first is not None:
+                rows = itertools.chain([first], rows)
+            return sum(
+                1 for row in rows
+                if len(row) >= min_len and row[i_campaign] == today and row[i_status] == "sent"
+            )
+
+
+METRICS_FIELDS = ["timestamp", "processed_count", "unsub_count",
+                  "bounce_count", "hot_count", "action_count"]
+TRIAGE_LOG_FIELDS = ["timestamp", "message_id", "from_email", "subject", "category", "action"]
+
+
+_CSV_SPECIAL_RE = re.compile(r'[,"\r\n]')
+
+
+def _csv_escape(value: str) -> str:
+    """Quote a CSV field exactly as csv.QUOTE_MINIMAL would."""
+    if _CSV_SPECIAL_RE.search(value):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+class CsvAppender:
+    """
+    Append rows to a fixed-schema CSV log through one buffered handle held
+    open for the run. Rows are pre-escaped field strings (see _csv_escape),
+    written as CRLF-terminated lines like csv.writer's default dialect.
+    """
+
+    def __init__(self, path: Path, fieldnames: list[str], buffering: int = 65536):
+        self.path = path
+        self.fieldnames = fieldnames
+        self.buffering = buffering
+        self._file = None
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_header = not self.path.exists() or self.path.stat().st_size == 0
+        self._file = open(self.path, "a", newline="", encoding="utf-8", buffering=self.buffering)
+        if write_header:
+            self.writerow(self.fieldnames)
+
+    def writerow(self, fields):
+        if self._file is None:
+            self._open()
+        self._file.write(",".join(fields) + "\r\n")
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+
+_APPENDERS: dict[Path, CsvAppender] = {}
+
+
+def get_appender(path: Path, fieldnames: list[str]) -> CsvAppender:
+    """Return the run-scoped appender for a log path (opened lazily on first write)."""
+    appender = _APPENDERS.get(path)
+    if appender is None:
+        appender = _APPENDERS[path] = CsvAppender(path, fieldnames)
+    return appender
+
+
+def flush_appenders():
+    """Flush and fsync all open CSV appenders, keeping them open."""
+    for appender in _APPENDERS.values():
+        appender.flush()
+
+
+def close_appenders():
+    """Flush, fsync and close all open CSV appenders."""
+    for appender in _APPENDERS.values():
+        appender.close()
+    _APPENDERS.clear()
 
 
 def log_metrics(processed: int, unsub: int, bounce: int, 
@@ -892,43 +1311,24 @@ def log_metrics(processed: int, unsub: int, bounce: int,
     if dry_run:
         return
     
-    write_header = not METRICS_PATH.exists()
-    with open(METRICS_PATH, "a", newline="", encoding="utf-8") as f:
-        fieldnames = ["timestamp", "processed_count", "unsub_count", 
-                      "bounce_count", "hot_count", "action_count"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        if write_header:
-            writer.writeheader()
-        writer.writerow({
-            "timestamp": datetime.now().isoformat(),
-            "processed_count": processed,
-            "unsub_count": unsub,
-            "bounce_count": bounce,
-            "hot_count": hot,
-            "action_count": action
-        })
+    get_appender(METRICS_PATH, METRICS_FIELDS).writerow((
+        datetime.now().isoformat(), str(processed), str(unsub),
+        str(bounce), str(hot), str(action)
+    ))
 
 
 def log_triage(msg_id: str, from_email: str, subject: str,
-               category: str, action: str, dry_run: bool = False):
+               category: str, action: str, dry_run: bool = False,
+               timestamp: str | None = None):
     """Log triage decision."""
     if dry_run:
         return
     
-    write_header = not TRIAGE_LOG_PATH.exists()
-    with open(TRIAGE_LOG_PATH, "a", newline="", encoding="utf-8") as f:
-        fieldnames = ["timestamp", "message_id", "from_email", "subject", "category", "action"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        if write_header:
-            writer.writeheader()
-        writer.writerow({
-            "timestamp": datetime.now().isoformat(),
-            "message_id": msg_id,
-            "from_email": from_email,
-            "subject": subject[:100],
-            "category": category,
-            "action": action
-        })
+    # Only the message-derived fields can contain CSV specials
+    get_appender(TRIAGE_LOG_PATH, TRIAGE_LOG_FIELDS).writerow((
+        timestamp or datetime.now().isoformat(), _csv_escape(msg_id),
+        _csv_escape(from_email), _csv_escape(subject[:100]), category, action
+    ))
 
 
 # =============================================================================
@@ -941,31 +1341,29 @@ def generate_daily_summary(dry_run: bool = False):
         print("[WARN] NOTIFY_EMAIL not set")
         return
     
-    # Read last 24h from triage log
-    cutoff = datetime.now() - timedelta(hours=24)
+    # Read last 24h from triage log (ISO timestamps compare as strings)
+    cutoff = (datetime.now() - timedelta(hours=24)).isoformat()
     
-    counts = {"unsubscribe": 0, "bounce": 0, "hot_interest": 0, 
-              "question": 0, "objection": 0, "out_of_office": 0, 
-              "bug_feature": 0, "other": 0}
-    hot_items = []
-    questions = []
+    counts = Counter(dict.fromkeys(CATEGORIES, 0))
+    recent = []
     
     if TRIAGE_LOG_PATH.exists():
-        with open(TRIAGE_LOG_PATH, "r", newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    ts = datetime.fromisoformat(row.get("timestamp", ""))
-                    if ts > cutoff:
-                        cat = row.get("category", "other")
-                        counts[cat] = counts.get(cat, 0) + 1
-                        
-                        if cat == "hot_interest":
-                            hot_items.append(row)
-                        elif cat == "question":
-                            questions.append(row)
-                except:
-                    pass
+        with open(TRIAGE_LOG_PATH, "rb") as f:
+            header_line = f.readline()
+            header = next(csv.reader([header_line.decode("utf-8-sig")]), [])
+            data_start = f.tell()
+            size = f.seek(0, os.SEEK_END)
+            f.seek(_first_row_after(f, data_start, size, cutoff.encode("ascii")))
+            text = f.read().decode("utf-8", errors="replace")
+        
+        recent = [
+            row for row in csv.DictReader(io.StringIO(text, newline=""), fieldnames=header)
+            if (row.get("timestamp") or "") > cutoff and _ISO_TS_RE.match(row["timestamp"])
+        ]
+    
+    counts.update(row.get("category", "other") for row in recent)
+    hot_items = [row for row in recent if row.get("category") == "hot_interest"]
+    questions = [row for row in recent if row.get("category") == "question"]
     
     # Build summary
     date_str = datetime.now().strftime("%Y-%m-%d")
@@ -1001,25 +1399,29 @@ COUNTS BY CATEGORY:
 # MAIN PROCESSING
 # =============================================================================
 def process_message(service, msg: dict, state: dict, label_map: dict,
-                    dry_run: bool = False) -> dict:
-    """Process a single message. Returns stats dict."""
+                    dry_run: bool = False, classified: dict = None) -> dict:
+    """
+    Process a single message. Returns stats dict.
+    `classified` is a prefetched fetch_and_classify() result; fetched inline if omitted.
+    """
     msg_id = msg["id"]
     
-    details = get_message_details(service, msg_id)
-    if not details:
+    if classified is None:
+        classified = fetch_and_classify(service, msg_id)
+    if not classified:
         return {"category": None}
     
-    from_email = extract_sender_email(details["from"])
-    subject = details["subject"]
-    body = details["body"]
+    details = classified["details"]
+    from_email = classified["from_email"]
+    category = classified["category"]
+    subject = details.subject
+    body = details.body
     
     print(f"  [{msg_id[:8]}] {from_email}: {subject[:40]}...")
-    
-    # Classify
-    category = classify_email(subject, body, from_email)
     print(f"    -> {category}")
     
     action = ""
+    now = datetime.now()
     
     # Handle each category
     if category == "unsubscribe":
@@ -1032,7 +1434,7 @@ def process_message(service, msg: dict, state: dict, label_map: dict,
     
     elif category == "bounce":
         # Try to extract original recipient
-        recipient = extract_bounce_recipient(body, details.get("headers", {}))
+        recipient = extract_bounce_recipient(body, details.headers)
         if recipient:
             add_to_suppression(recipient, "bounce", "inbound_triage", msg_id, dry_run)
             action = "suppressed_recipient"
@@ -1042,17 +1444,17 @@ def process_message(service, msg: dict, state: dict, label_map: dict,
             action = "bounce_unknown"
     
     elif category == "hot_interest":
-        create_reply_draft(from_email, subject, body, category, msg_id, dry_run)
+        create_reply_draft(from_email, subject, body, category, msg_id, dry_run, now=now)
         send_immediate_notification(from_email, subject, body, category, dry_run)
         action = "notified+draft"
     
     elif category == "question":
-        create_reply_draft(from_email, subject, body, category, msg_id, dry_run)
+        create_reply_draft(from_email, subject, body, category, msg_id, dry_run, now=now)
         send_immediate_notification(from_email, subject, body, category, dry_run)
         action = "notified+draft"
     
     elif category == "bug_feature":
-        create_eng_ticket(from_email, subject, body, msg_id, dry_run)
+        create_eng_ticket(from_email, subject, body, msg_id, dry_run, now=now)
         action = "ticket_created"
     
     elif category == "out_of_office":
@@ -1068,14 +1470,13 @@ def process_message(service, msg: dict, state: dict, label_map: dict,
         apply_label(service, msg_id, label_id, dry_run)
     
     # Log triage
-    log_triage(msg_id, from_email, subject, category, action, dry_run)
+    log_triage(msg_id, from_email, subject, category, action, dry_run,
+               timestamp=now.isoformat())
     
     # Mark processed
     if not dry_run:
+        # Bounded to the last PROCESSED_IDS_MAX ids
         state["processed_message_ids"].append(msg_id)
-        # Keep last 1000
-        if len(state["processed_message_ids"]) > 1000:
-            state["processed_message_ids"] = state["processed_message_ids"][-1000:]
     
     return {"category": category}
 
@@ -1104,6 +1505,7 @@ def process_imap_message(conn: imaplib.IMAP4_SSL, msg_id: str, state: dict,
     print(f"    -> {category}")
     
     action = ""
+    now = datetime.now()
     
     if category == "unsubscribe":
         add_to_suppression(effective_from, "unsubscribe", "inbound_triage", message_id, dry_run)
@@ -1126,17 +1528,17 @@ def process_imap_message(conn: imaplib.IMAP4_SSL, msg_id: str, state: dict,
             action = "bounce_unknown"
     
     elif category == "hot_interest":
-        create_reply_draft(effective_from, subject, body, category, message_id, dry_run)
+        create_reply_draft(effective_from, subject, body, category, message_id, dry_run, now=now)
         send_immediate_notification(effective_from, subject, body, category, dry_run)
         action = "notified+draft"
     
     elif category == "question":
-        create_reply_draft(effective_from, subject, body, category, message_id, dry_run)
+        create_reply_draft(effective_from, subject, body, category, message_id, dry_run, now=now)
         send_immediate_notification(effective_from, subject, body, category, dry_run)
         action = "notified+draft"
     
     elif category == "bug_feature":
-        create_eng_ticket(effective_from, subject, body, message_id, dry_run)
+        create_eng_ticket(effective_from, subject, body, message_id, dry_run, now=now)
         action = "ticket_created"
     
     elif category == "out_of_office":
@@ -1146,14 +1548,13 @@ def process_imap_message(conn: imaplib.IMAP4_SSL, msg_id: str, state: dict,
         action = "ignored"
     
     # Log triage
-    log_triage(message_id, effective_from, subject, category, action, dry_run)
+    log_triage(message_id, effective_from, subject, category, action, dry_run,
+               timestamp=now.isoformat())
     
     # Mark seen & record processed
     if not dry_run:
         conn.store(msg_id, "+FLAGS", "\\Seen")
         state["processed_message_ids"].append(message_id)
-        if len(state["processed_message_ids"]) > 1000:
-            state["processed_message_ids"] = state["processed_message_ids"][-1000:]
     
     return {"category": category}
 
@@ -1161,151 +1562,8 @@ def process_imap_message(conn: imaplib.IMAP4_SSL, msg_id: str, state: dict,
 # =============================================================================
 # MAIN
 # =============================================================================
-def main():
-    parser = argparse.ArgumentParser(
-        description="OSHA Inbox Triage - Gmail/IMAP classification and auto-actions"
-    )
-    parser.add_argument("--run-once", action="store_true",
-                        help="Process new mail then exit")
-    parser.add_argument("--since-hours", type=int, default=24,
-                        help="Backfill window in hours (default: 24)")
-    parser.add_argument("--daily-summary", action="store_true",
-                        help="Send daily summary email and exit")
-    parser.add_argument("--dry-run", action="store_true",
-                        help="Preview without changes")
-    parser.add_argument("--max-messages", type=int, default=100,
-                        help="Max messages to process")
-    args = parser.parse_args()
-    
-    print(f"[INFO] OSHA Inbox Triage")
-    print(f"[INFO] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"[INFO] Mode: {'DRY-RUN' if args.dry_run else 'LIVE'}")
-    
-    # Daily summary mode
-    if args.daily_summary:
-        generate_daily_summary(args.dry_run)
-        return
-    
-    # Load state
-    state = load_state()
-    
-    if INBOUND_BACKEND == "imap":
-        print("[INFO] Backend: IMAP")
-        conn = imap_connect()
-        if not conn:
-            sys.exit(1)
-        
-        # Ensure folders exist
-        imap_ensure_folder(conn, IMAP_FOLDER)
-        imap_ensure_folder(conn, IMAP_FOLDER_UNSUB)
-        imap_ensure_folder(conn, IMAP_FOLDER_BOUNCE)
-        
-        print(f"[INFO] Fetching IMAP messages (last {args.since_hours}h)...")
-        msg_ids = imap_search_unseen(conn, IMAP_FOLDER, args.since_hours)
-        if args.max_messages:
-            msg_ids = msg_ids[:args.max_messages]
-        print(f"[INFO] Found {len(msg_ids)} new messages")
-        
-        if not msg_ids:
-            print("[INFO] No new messages to process")
-            conn.logout()
-            return
-        
-        counts = {"unsubscribe": 0, "bounce": 0, "hot_interest": 0, 
-                  "question": 0, "objection": 0, "out_of_office": 0,
-                  "bug_feature": 0, "other": 0}
-        
-        for msg_id in msg_ids:
-            try:
-                result = process_imap_message(conn, msg_id, state, args.dry_run)
-                cat = result.get("category")
-                if cat:
-                    counts[cat] = counts.get(cat, 0) + 1
-            except Exception as e:
-                print(f"[ERROR] Failed to process IMAP message: {e}")
-        
-        # Expunge deleted after moves
-        if not args.dry_run:
-            try:
-                conn.expunge()
-            except Exception:
-                pass
-        conn.logout()
-        
-        # Check bounce rate
-        bounce_count = counts.get("bounce", 0)
-        sent_count = get_today_sent_count()
-        if sent_count > 0 and bounce_count > 0:
-            bounce_rate = bounce_count / sent_count
-            if bounce_rate > 0.05:
-                print(f"[WARNING] High bounce rate: {bounce_rate:.1%}")
-                send_bounce_spike_warning(bounce_count, sent_count, bounce_rate, args.dry_run)
-        
-        # Log metrics
-        log_metrics(
-            processed=len(msg_ids),
-            unsub=counts.get("unsubscribe", 0) + counts.get("objection", 0),
-            bounce=counts.get("bounce", 0),
-            hot=counts.get("hot_interest", 0),
-            action=counts.get("question", 0) + counts.get("bug_feature", 0) + counts.get("other", 0),
-            dry_run=args.dry_run
-        )
-        
-        if not args.dry_run:
-            state["last_processed_time"] = datetime.now().isoformat()
-            save_state(state)
-            
-            if (counts.get("unsubscribe", 0) > 0 or 
-                counts.get("objection", 0) > 0 or 
-                counts.get("bounce", 0) > 0):
-                backup_suppression_file()
-        
-        # Summary
-        print(f"\n{'='*50}")
-        print(f"[SUMMARY] Processed: {len(msg_ids)}")
-        for cat, count in sorted(counts.items()):
-            if count > 0:
-                print(f"  {cat}: {count}")
-        print(f"{'='*50}")
-        return
-    
-    # Default: Gmail API
-    if not GMAIL_AVAILABLE:
-        print("[ERROR] Gmail API not installed.")
-        print("  pip install google-api-python-client google-auth-oauthlib")
-        sys.exit(1)
-    
-    service = get_gmail_service(args.dry_run)
-    if not service:
-        sys.exit(1)
-    
-    # Ensure labels exist
-    print("[INFO] Checking labels...")
-    label_map = ensure_labels_exist(service, state, args.dry_run)
-    
-    # Get messages
-    print(f"[INFO] Fetching messages (last {args.since_hours}h)...")
-    messages = get_new_messages(service, state, args.since_hours, args.max_messages)
-    print(f"[INFO] Found {len(messages)} new messages")
-    
-    if not messages:
-        print("[INFO] No new messages to process")
-        return
-    
-    # Process messages
-    counts = {"unsubscribe": 0, "bounce": 0, "hot_interest": 0, 
-              "question": 0, "objection": 0, "out_of_office": 0,
-              "bug_feature": 0, "other": 0}
-    
-    for msg in messages:
-        try:
-            result = process_message(service, msg, state, label_map, args.dry_run)
-            cat = result.get("category")
-            if cat:
-                counts[cat] = counts.get(cat, 0) + 1
-        except Exception as e:
-            print(f"[ERROR] Failed to process: {e}")
-    
+def _finish_batch(counts: Counter, processed: int, state: dict, args: argparse.Namespace):
+    """Bounce-rate check, notification drain, metrics, state save and summary for one batch."""
     # Check bounce rate
     bounce_count = counts.get("bounce", 0)
     sent_count = get_today_sent_count()
@@ -1315,9 +1573,12 @@ def main():
             print(f"[WARNING] High bounce rate: {bounce_rate:.1%}")
             send_bounce_spike_warning(bounce_count, sent_count, bounce_rate, args.dry_run)
     
+    # Wait for background notification delivery
+    flush_notifications()
+    
     # Log metrics
     log_metrics(
-        processed=len(messages),
+        processed=processed,
         unsub=counts.get("unsubscribe", 0) + counts.get("objection", 0),
         bounce=counts.get("bounce", 0),
         hot=counts.get("hot_interest", 0),
@@ -1338,12 +1599,172 @@ def main():
     
     # Summary
     print(f"\n{'='*50}")
-    print(f"[SUMMARY] Processed: {len(messages)}")
+    print(f"[SUMMARY] Processed: {processed}")
     for cat, count in sorted(counts.items()):
         if count > 0:
             print(f"  {cat}: {count}")
     print(f"{'='*50}")
 
 
+def run_imap_batch(state: dict, args: argparse.Namespace) -> bool:
+    """Process one batch of unseen IMAP mail. Returns False if IMAP is unreachable."""
+    conn = imap_connect()
+    if not conn:
+        return False
+    
+    # Ensure folders exist
+    imap_ensure_folder(conn, IMAP_FOLDER)
+    imap_ensure_folder(conn, IMAP_FOLDER_UNSUB)
+    imap_ensure_folder(conn, IMAP_FOLDER_BOUNCE)
+    
+    print(f"[INFO] Fetching IMAP messages (last {args.since_hours}h)...")
+    msg_ids = imap_search_unseen(conn, IMAP_FOLDER, args.since_hours)
+    if args.max_messages:
+        msg_ids = msg_ids[:args.max_messages]
+    print(f"[INFO] Found {len(msg_ids)} new messages")
+    
+    if not msg_ids:
+        print("[INFO] No new messages to process")
+        conn.logout()
+        return True
+    
+    counts = Counter(dict.fromkeys(CATEGORIES, 0))
+    
+    for msg_id in msg_ids:
+        try:
+            result = process_imap_message(conn, msg_id, state, args.dry_run)
+            cat = result.get("category")
+            if cat:
+                counts[cat] += 1
+        except Exception as e:
+            print(f"[ERROR] Failed to process IMAP message: {e}")
+    
+    # Expunge deleted after moves
+    if not args.dry_run:
+        try:
+            conn.expunge()
+        except Exception:
+            pass
+    conn.logout()
+    
+    _finish_batch(counts, len(msg_ids), state, args)
+    return True
+
+
+def run_gmail_batch(service, state: dict, label_map: dict, args: argparse.Namespace) -> bool:
+    """Process one batch of new Gmail messages."""
+    # Get messages
+    print(f"[INFO] Fetching messages (last {args.since_hours}h)...")
+    messages = get_new_messages(service, state, args.since_hours, args.max_messages)
+    print(f"[INFO] Found {len(messages)} new messages")
+    
+    if not messages:
+        print("[INFO] No new messages to process")
+        return True
+    
+    # Process messages
+    counts = Counter(dict.fromkeys(CATEGORIES, 0))
+    
+    # Detail fetches go out as batched HTTP requests; state mutation stays serial
+    fetched = fetch_and_classify_all(service, [m["id"] for m in messages])
+    
+    for msg, classified in zip(messages, fetched):
+        if classified is None:
+            continue  # fetch failure already reported
+        try:
+            result = process_message(service, msg, state, label_map, args.dry_run,
+                                     classified=classified)
+            cat = result.get("category")
+            if cat:
+                counts[cat] += 1
+        except Exception as e:
+            print(f"[ERROR] Failed to process: {e}")
+    
+    _finish_batch(counts, len(messages), state, args)
+    return True
+
+
+def run_triage(args: argparse.Namespace):
+    """
+    Run triage for the parsed CLI arguments. With --watch-seconds, keeps the
+    Gmail service, label map, state, SMTP session and CSV handles across batches.
+    """
+    print(f"[INFO] OSHA Inbox Triage")
+    print(f"[INFO] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"[INFO] Mode: {'DRY-RUN' if args.dry_run else 'LIVE'}")
+    
+    # Daily summary mode
+    if args.daily_summary:
+        generate_daily_summary(args.dry_run)
+        return
+    
+    # Output dirs are created once per run, not per draft/ticket
+    if not args.dry_run:
+        REPLY_DRAFTS_DIR.mkdir(parents=True, exist_ok=True)
+        ENG_TICKETS_DIR.mkdir(parents=True, exist_ok=True)
+    
+    # Load state
+    state = load_state()
+    
+    if INBOUND_BACKEND == "imap":
+        print("[INFO] Backend: IMAP")
+        run_batch = functools.partial(run_imap_batch, state, args)
+    else:
+        # Default: Gmail API
+        if not GMAIL_AVAILABLE:
+            print("[ERROR] Gmail API not installed.")
+            print("  pip install google-api-python-client google-auth-oauthlib")
+            sys.exit(1)
+        
+        service = get_gmail_service(args.dry_run)
+        if not service:
+            sys.exit(1)
+        
+        # Ensure labels exist
+        print("[INFO] Checking labels...")
+        label_map = ensure_labels_exist(service, state, args.dry_run)
+        run_batch = functools.partial(run_gmail_batch, service, state, label_map, args)
+    
+    while True:
+        ok = run_batch()
+        if not args.watch_seconds:
+            if not ok:
+                sys.exit(1)
+            return
+        
+        flush_appenders()
+        print(f"[INFO] Next check in {args.watch_seconds}s (Ctrl+C to stop)")
+        try:
+            time.sleep(args.watch_seconds)
+        except KeyboardInterrupt:
+            print("[INFO] Watch stopped")
+            return
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="OSHA Inbox Triage - Gmail/IMAP classification and auto-actions"
+    )
+    parser.add_argument("--run-once", action="store_true",
+                        help="Process new mail then exit")
+    parser.add_argument("--since-hours", type=int, default=24,
+                        help="Backfill window in hours (default: 24)")
+    parser.add_argument("--daily-summary", action="store_true",
+                        help="Send daily summary email and exit")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Preview without changes")
+    parser.add_argument("--max-messages", type=int, default=100,
+                        help="Max messages to process")
+    parser.add_argument("--watch-seconds", type=int, default=0,
+                        help="Keep running, checking for new mail every N seconds (default: off)")
+    args = parser.parse_args()
+    
+    try:
+        run_triage(args)
+    finally:
+        _NOTIFIER.shutdown()
+        close_appenders()
+
+
 if __name__ == "__main__":
     main()
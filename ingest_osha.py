@@ -10,30 +10,99 @@ Usage:
 """
 
 import argparse
+import codecs
+import functools
+import html as html_lib
 import json
 import hashlib
 import logging
-import random
 import re
+import socket
 import sqlite3
 import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from urllib.parse import urljoin, urlencode, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 from bs4 import BeautifulSoup
 
+# lxml builds the tree in C; html.parser is the pure-Python fallback
+try:
+    import lxml.html
+    from lxml import etree
+    HTML_PARSER = "lxml"
+    # Text nodes BeautifulSoup's get_text() would return (it skips script/style/template)
+    _VISIBLE_TEXT = etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+except ImportError:
+    lxml = None
+    HTML_PARSER = "html.parser"
+
 # Constants
 OSHA_BASE_URL = "https://www.osha.gov"
 OSHA_SEARCH_URL = "https://www.osha.gov/ords/imis/establishment.html"
 USER_AGENT = "OSHA-Lead-Monitor/0.1 (Educational/Research; +compliance)"
 REQUEST_TIMEOUT = 30
-MIN_DELAY = 0.3
-MAX_DELAY = 0.7
+# Shared request budget across all workers (the old 0.3-0.7s sleep averaged ~2/s)
+RATE_LIMIT_PER_SEC = 2.0
+RATE_LIMIT_BURST = 4
 BACKOFF_BASE = 2.0
 MAX_RETRIES = 3
+# Upper bound on in-flight OSHA requests; all workers draw from one rate limiter
+MAX_CONCURRENT_REQUESTS = 8
+# Common business name patterns to search - covers most establishments.
+# Each search returns up to ~500 results, so we use multiple terms
+SEARCH_TERMS = ("inc", "llc", "corp", "co", "services", "construction", "contractors")
+# TCP keepalive for pooled sockets (seconds idle before probing, between probes)
+KEEPALIVE_IDLE_SECONDS = 60
+KEEPALIVE_INTERVAL_SECONDS = 10
+# Detail records written per SQLite transaction
+UPSERT_BATCH_SIZE = 200
+# Fresh databases loading more details than this build secondary indexes afterwards
+BULK_LOAD_MIN_ROWS = 1000
+SQLITE_CACHE_KIB = 65536  # PRAGMA cache_size (negative = KiB)
+SQLITE_MMAP_BYTES = 256 * 1024 * 1024
+# Every request goes to osha.gov: one host pool, one warm socket per worker thread
+POOL_MAXSIZE = MAX_CONCURRENT_REQUESTS
+
+# Precompiled patterns; these run for every line/cell of every page
+_ACTIVITY_NR_RE = re.compile(r"\b(\d{9})\b")
+_ID_PARAM_RE = re.compile(r"id=(\d+)")
+_ACTIVITY_NR_PARAM_RE = re.compile(r"[?&]activity_nr=(\d+)")
+_DIGITS_RE = re.compile(r"\d+")
+_HAS_ALPHA_RE = re.compile(r"[A-Za-z]")
+_NAICS_CODE_RE = re.compile(r"^\d{6}$")
+_NAICS_RE = re.compile(r"(\d+)\s*[-/]?\s*(.*)")
+_LEADING_NUMBER_RE = re.compile(r"^\d+\s+")
+_SITE_CSZ_RE = re.compile(r"([A-Za-z][A-Za-z\s]{2,}),\s*([A-Z]{2})\s+(\d{5}(?:-\d{4})?)\s*$")
+_CAMEL_SPLIT_RE = re.compile(r"(?<=[a-z])(?=[A-Z])")
+_STREET_TAIL_RE = re.compile(r"(.+?)([A-Z][a-z]+)$")
+_MAIL_ADDRESS_RE = re.compile(r"(.+),\s*([A-Za-z\s]+),\s*([A-Z]{2})\s+(\d{5}(?:-\d{4})?)")
+_NUMERIC_ID_RE = re.compile(r"^\d+\.?\d*$")
+_CITY_RE = re.compile(r"^[A-Za-z\s]+$")
+# Keyword checks as one alternation each instead of a substring test per keyword
+_RESULT_TYPE_RE = re.compile(r"complaint|accident|referral|fat|cat|planned|programmed")
+_DETAIL_TYPE_RE = re.compile(r"inspection|accident|complaint|referral|planned|programmed|fat/cat|follow-up|other")
+_SCOPES = frozenset(("complete", "partial"))
+# Search results scanned without building a DOM (see scan_result_rows)
+_TABLE_OPEN_RE = re.compile(r"<table[\s>]", re.I)
+_TR_OPEN_RE = re.compile(r"<tr[\s>]", re.I)
+_TR_CLOSE_RE = re.compile(r"</tr\s*>", re.I)
+_CELL_OPEN_RE = re.compile(r"<t[dh][\s>]", re.I)
+_CELL_CLOSE_RE = re.compile(r"</t[dh]\s*>", re.I)
+_ROW_RE = re.compile(r"<tr(?:\s[^>]*)?>(.*?)</tr\s*>", re.S | re.I)
+_CELL_RE = re.compile(r"<t[dh](?:\s[^>]*)?>(.*?)</t[dh]\s*>", re.S | re.I)
+_LINK_RE = re.compile(
+    r"""<a\s[^>]*?(?<![\w-])href\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))[^>]*>(.*?)</a\s*>""",
+    re.S | re.I,
+)
+_HREF_ATTR_RE = re.compile(r"(?<![\w-])href\s*=", re.I)
+_TAG_RE = re.compile(r"<[^>]*>")
 
 # Logging setup
 logger = logging.getLogger(__name__)
@@ -48,20 +117,167 @@ def setup_logging(level: str) -> None:
     )
 
 
+def _keepalive_socket_options() -> list[tuple[int, int, int]]:
+    """urllib3's defaults (TCP_NODELAY) plus TCP keepalive probes where the platform has them."""
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE_SECONDS))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVAL_SECONDS))
+    return options
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose pooled sockets send TCP keepalive probes, so idle
+    connections to osha.gov survive between phases instead of being dropped
+    by middleboxes and paying a fresh TCP+TLS handshake.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", _keepalive_socket_options())
+        super().init_poolmanager(*args, **kwargs)
+
+
 def get_session() -> requests.Session:
-    """Create a requests session with appropriate headers."""
+    """
+    Create a requests session with appropriate headers.
+    Create it once per run and pass it down so keep-alive connections
+    (and their TLS handshakes) are reused across every search and detail fetch.
+    """
     session = requests.Session()
     session.headers.update({
         "User-Agent": USER_AGENT,
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.5",
+        "Connection": "keep-alive",
     })
+    # fetch_with_retry owns retry/backoff, so the adapter itself never retries
+    adapter = KeepAliveAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=0, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
     return session
 
 
-def polite_delay() -> None:
-    """Sleep for a random interval between MIN_DELAY and MAX_DELAY."""
-    time.sleep(random.uniform(MIN_DELAY, MAX_DELAY))
+class TokenBucket:
+    """
+    Thread-safe token bucket: at most `rate` requests/sec, bursts up to `capacity`.
+    Time already spent waiting on slow responses refills the bucket, so
+    requests only sleep when they would actually exceed the rate.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for `seconds` (server asked us to slow down)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+_RATE_LIMITER = TokenBucket(RATE_LIMIT_PER_SEC, RATE_LIMIT_BURST)
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Numeric Retry-After header, if the server sent one."""
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+def make_soup(html: str) -> BeautifulSoup:
+    """Parse HTML with the fastest available parser, falling back to html.parser."""
+    if HTML_PARSER != "html.parser":
+        try:
+            return BeautifulSoup(html, HTML_PARSER)
+        except Exception as e:
+            logger.debug(f"{HTML_PARSER} failed to parse page ({e}); using html.parser")
+    return BeautifulSoup(html, "html.parser")
+
+
+_thread_parsers = threading.local()
+
+
+def _html_parser(encoding: str) -> "lxml.html.HTMLParser":
+    """lxml parser for pages in `encoding`, created once per worker thread and reused."""
+    parsers = getattr(_thread_parsers, "by_encoding", None)
+    if parsers is None:
+        parsers = _thread_parsers.by_encoding = {}
+    parser = parsers.get(encoding)
+    if parser is None:
+        parser = parsers[encoding] = lxml.html.HTMLParser(encoding=encoding)
+    return parser
+
+
+def _cell_texts(pieces: list[str]) -> tuple[str, str]:
+    """(get_text(), get_text(strip=True)) equivalents for a cell's text nodes."""
+    return "".join(pieces), "".join(p.strip() for p in pieces)
+
+
+def extract_page(html: str | bytes, encoding: Optional[str] = None) -> tuple[str, list[list[list[tuple[str, str]]]]]:
+    """
+    Parse a detail page once and return (page_text, tables).
+    tables holds, per <table>, each <tr>'s <td>/<th> cells as
+    (text, stripped_text) pairs, in document order like find_all().
+    With lxml the page is read straight from the lxml tree with compiled
+    XPath, without building BeautifulSoup wrappers for every node.
+    `html` may be the undecoded body; `encoding` is then the charset to
+    decode it with (the one requests would use for response.text).
+    """
+    if lxml is not None:
+        try:
+            if isinstance(html, bytes):
+                root = lxml.html.document_fromstring(html, parser=_html_parser(encoding or "utf-8"))
+            else:
+                root = lxml.html.document_fromstring(html)
+        except Exception as e:
+            logger.debug(f"lxml failed to parse page ({e}); using BeautifulSoup")
+        else:
+            # Rows of a nested table also belong to every enclosing table (find_all
+            # semantics); extract each <tr> once and share its cell list.
+            row_cells = {}
+            tables = []
+            for table in root.iter("table"):
+                rows = []
+                for row in table.iter("tr"):
+                    cells = row_cells.get(row)
+                    if cells is None:
+                        cells = row_cells[row] = [_cell_texts(_VISIBLE_TEXT(cell)) for cell in row.iter("td", "th")]
+                    rows.append(cells)
+                tables.append(rows)
+            return "".join(_VISIBLE_TEXT(root)), tables
+
+    if isinstance(html, bytes):
+        html = html.decode(encoding or "utf-8", errors="replace")
+    soup = make_soup(html)
+    tables = [
+        [[(cell.get_text(), cell.get_text(strip=True)) for cell in row.find_all(["td", "th"])] for row in table.find_all("tr")]
+        for table in soup.find_all("table")
+    ]
+    return soup.get_text(), tables
 
 
 def compute_hash(text: str) -> str:
@@ -69,6 +285,16 @@ def compute_hash(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
 
 
+def compute_page_hash(page: str | bytes) -> str:
+    """
+    Fingerprint a detail page: the same truncated sha256 as compute_hash, so
+    stored raw_hash values match across installs. Bytes are hashed as given,
+    which matches the hash of the decoded text only for UTF-8 (or ASCII) bodies.
+    """
+    data = page.encode("utf-8") if isinstance(page, str) else page
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
 def _normalize_record_value(value):
     if value is None:
         return ""
@@ -77,40 +303,44 @@ def _normalize_record_value(value):
     return value
 
 
-def compute_record_hash(inspection: dict) -> str:
+# Fields that make up record_hash, pre-sorted so the payload is built in
+# sort_keys order without re-sorting (and the hash is unchanged)
+_RECORD_HASH_FIELDS = tuple(sorted((
+    "activity_nr",
+    "date_opened",
+    "inspection_type",
+    "scope",
+    "case_status",
+    "emphasis",
+    "safety_health",
+    "sic",
+    "naics",
+    "naics_desc",
+    "violations_count",
+    "serious_violations",
+    "willful_violations",
+    "repeat_violations",
+    "other_violations",
+    "establishment_name",
+    "site_address1",
+    "site_city",
+    "site_state",
+    "site_zip",
+    "area_office",
+    "mail_address1",
+    "mail_city",
+    "mail_state",
+    "mail_zip",
+    "report_id",
+    "source_url",
+)))
+
+
+def compute_record_hash(inspection: dict) -> str:
     """Compute stable hash of normalized inspection record content."""
-    fields = [
-        "activity_nr",
-        "date_opened",
-        "inspection_type",
-        "scope",
-        "case_status",
-        "emphasis",
-        "safety_health",
-        "sic",
-        "naics",
-        "naics_desc",
-        "violations_count",
-        "serious_violations",
-        "willful_violations",
-        "repeat_violations",
-        "other_violations",
-        "establishment_name",
-        "site_address1",
-        "site_city",
-        "site_state",
-        "site_zip",
-        "area_office",
-        "mail_address1",
-        "mail_city",
-        "mail_state",
-        "mail_zip",
-        "report_id",
-        "source_url",
-    ]
-    normalized = {field: _normalize_record_value(inspection.get(field)) for field in fields}
-    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
-    return compute_hash(payload)
+    normalized = {field: _normalize_record_value(inspection.get(field)) for field in _RECORD_HASH_FIELDS}
+    payload = json.dumps(normalized, separators=(",", ":"))
+    return compute_hash(payload)
 
 
 def _normalize_lead_identity_part(value: object) -> str:
@@ -142,22 +372,47 @@ def build_lead_key(inspection: dict) -> Optional[str]:
     return f"osha:composite:{digest}"
 
 
-def parse_date(date_str: Optional[str]) -> Optional[str]:
-    """Parse various date formats to YYYY-MM-DD."""
+_DATE_FORMATS = (
+    "%m/%d/%Y",
+    "%Y-%m-%d",
+    "%m-%d-%Y",
+    "%B %d, %Y",
+    "%b %d, %Y",
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_date(date_str: Optional[str]) -> Optional[str]:
+    """
+    Parse various date formats to YYYY-MM-DD.
+    Cached: OSHA pages repeat the same few dates across headers and tables.
+    """
     if not date_str:
         return None
     date_str = date_str.strip()
+    # Shortest accepted form is "1/5/2025"; skip strptime for shorter strings
+    if len(date_str) < 8:
+        return None
     
-    # Try common formats
-    formats = [
-        "%m/%d/%Y",
-        "%Y-%m-%d",
-        "%m-%d-%Y",
-        "%B %d, %Y",
-        "%b %d, %Y",
-    ]
+    # Separator positions identify the zero-padded numeric forms, so those take
+    # one strptime call instead of raising ValueError through the list. Only one
+    # format in the list can match each shape, so the result is the same.
+    if date_str[2] == "/" and date_str[5] == "/":
+        guess = "%m/%d/%Y"
+    elif date_str[4] == "-":
+        guess = "%Y-%m-%d"
+    elif date_str[2] == "-":
+        guess = "%m-%d-%Y"
+    else:
+        guess = None
+    if guess:
+        try:
+            return datetime.strptime(date_str, guess).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
     
-    for fmt in formats:
+    # Try common formats
+    for fmt in _DATE_FORMATS:
         try:
             return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
         except ValueError:
@@ -170,34 +425,39 @@ def clean_text(text: Optional[str]) -> Optional[str]:
     """Clean and normalize text."""
     if not text:
         return None
-    # Normalize whitespace
-    text = " ".join(text.split())
-    return text.strip() if text else None
+    # Normalize whitespace. str.split()/join beat a compiled r"\s+" sub on
+    # every cell size measured, and the joined result is already stripped.
+    return " ".join(text.split()) or None
 
 
 def extract_activity_nr(text: str) -> Optional[str]:
     """Extract OSHA activity number from text."""
     # Activity numbers are typically 9 digits
-    match = re.search(r"\b(\d{9})\b", text)
+    match = _ACTIVITY_NR_RE.search(text)
     return match.group(1) if match else None
 
 
-def calculate_lead_score(inspection: dict) -> int:
-    """Calculate lead score based on scoring algorithm."""
-    score = 0
-    
-    # Inspection type scoring
-    insp_type = (inspection.get("inspection_type") or "").lower()
+@functools.lru_cache(maxsize=256)
+def _inspection_type_points(inspection_type: str) -> int:
+    """Score contribution of an inspection type; a run only sees a handful of distinct values."""
+    insp_type = inspection_type.lower()
     if "fat" in insp_type or "cat" in insp_type:
-        score += 10
+        return 10
     elif "accident" in insp_type:
-        score += 8
+        return 8
     elif "complaint" in insp_type:
-        score += 4
+        return 4
     elif "referral" in insp_type:
-        score += 3
+        return 3
     elif "planned" in insp_type or "programmed" in insp_type:
-        score += 1
+        return 1
+    return 0
+
+
+def calculate_lead_score(inspection: dict) -> int:
+    """Calculate lead score based on scoring algorithm."""
+    # Inspection type scoring
+    score = _inspection_type_points(inspection.get("inspection_type") or "")
     
     # Scope scoring
     scope = (inspection.get("scope") or "").lower()
@@ -222,11 +482,12 @@ def calculate_lead_score(inspection: dict) -> int:
     return score
 
 
+_REVIEW_REQUIRED_FIELDS = ("activity_nr", "establishment_name", "site_state", "date_opened")
+
+
 def check_needs_review(inspection: dict) -> bool:
     """Check if inspection is missing required fields."""
-    required = ["activity_nr", "establishment_name", "site_state", "date_opened"]
-    
-    for field in required:
+    for field in _REVIEW_REQUIRED_FIELDS:
         if not inspection.get(field):
             return True
     
@@ -241,16 +502,16 @@ def fetch_with_retry(session: requests.Session, url: str, retries: int = MAX_RET
     """Fetch URL with exponential backoff on errors."""
     for attempt in range(retries):
         try:
-            polite_delay()
+            _RATE_LIMITER.acquire()
             response = session.get(url, timeout=REQUEST_TIMEOUT)
             
             if response.status_code == 200:
                 return response
             elif response.status_code == 429:
-                # Rate limited - back off significantly
-                wait_time = BACKOFF_BASE ** (attempt + 2)
+                # Rate limited - back off significantly, and hold the other workers too
+                wait_time = _retry_after_seconds(response) or BACKOFF_BASE ** (attempt + 2)
                 logger.warning(f"Rate limited. Waiting {wait_time:.1f}s before retry...")
-                time.sleep(wait_time)
+                _RATE_LIMITER.pause(wait_time)
             elif response.status_code >= 500:
                 # Server error - back off
                 wait_time = BACKOFF_BASE ** attempt
@@ -269,161 +530,251 @@ def fetch_with_retry(session: requests.Session, url: str, retries: int = MAX_RET
     return None
 
 
-def search_osha_inspections(
+def soup_result_rows(soup: BeautifulSoup) -> list[tuple[list[str], Optional[str], str]]:
+    """
+    Rows of a search results page as (cell_texts, href, link_text).
+    href/link_text come from the row's first <a href>; href is None if it has none.
+    """
+    rows = []
+    for row in soup.select("table tr"):
+        cells = [c.get_text() for c in row.find_all(["td", "th"])]
+        link = row.find("a", href=True)
+        if link:
+            rows.append((cells, link.get("href", ""), link.get_text(strip=True)))
+        else:
+            rows.append((cells, None, ""))
+    return rows
+
+
+def tree_result_rows(html: str) -> Optional[tuple[str, list[tuple[list[str], Optional[str], str]]]]:
+    """
+    (page_text, rows) for a search results page read straight from the lxml
+    tree, with rows shaped like soup_result_rows(). Returns None when lxml is
+    unavailable or can't parse the page; the caller then uses BeautifulSoup.
+    """
+    if lxml is None:
+        return None
+    try:
+        root = lxml.html.document_fromstring(html)
+    except Exception as e:
+        logger.debug(f"lxml failed to parse results page ({e}); using BeautifulSoup")
+        return None
+    
+    rows = []
+    for row in root.iter("tr"):
+        if next(row.iterancestors("table"), None) is None:
+            continue
+        cells = ["".join(_VISIBLE_TEXT(cell)) for cell in row.iter("td", "th")]
+        link = next((a for a in row.iter("a") if a.get("href") is not None), None)
+        if link is not None:
+            rows.append((cells, link.get("href"), _cell_texts(_VISIBLE_TEXT(link))[1]))
+        else:
+            rows.append((cells, None, ""))
+    return "".join(_VISIBLE_TEXT(root)), rows
+
+
+def _markup_text(fragment: str) -> str:
+    return html_lib.unescape(_TAG_RE.sub("", fragment))
+
+
+def scan_result_rows(html: str) -> Optional[list[tuple[list[str], Optional[str], str]]]:
+    """
+    Regex fast path for soup_result_rows() on plain results markup.
+    Returns None when the page isn't simple enough to scan safely (nested
+    tables, omitted </tr>/</td> tags, unmatched links, or rows without a
+    table); the caller then builds the full BeautifulSoup tree.
+    """
+    tables = len(_TABLE_OPEN_RE.findall(html))
+    if tables > 1:
+        return None
+    row_count = len(_TR_OPEN_RE.findall(html))
+    if row_count != len(_TR_CLOSE_RE.findall(html)) or (row_count and not tables):
+        return None
+    if len(_CELL_OPEN_RE.findall(html)) != len(_CELL_CLOSE_RE.findall(html)):
+        return None
+    
+    rows = []
+    for row_html in _ROW_RE.findall(html):
+        cells = [_markup_text(cell) for cell in _CELL_RE.findall(row_html)]
+        link = _LINK_RE.search(row_html)
+        if link:
+            href = html_lib.unescape(next(g for g in link.group(1, 2, 3) if g is not None))
+            link_text = "".join(html_lib.unescape(piece).strip() for piece in _TAG_RE.split(link.group(4)))
+            rows.append((cells, href, link_text))
+        elif _HREF_ATTR_RE.search(row_html):
+            return None
+        else:
+            rows.append((cells, None, ""))
+    if len(rows) != row_count:
+        return None
+    return rows
+
+
+def _search_term(
     session: requests.Session,
     state: str,
-    since_date: str,
+    term: str,
+    since_dt: datetime,
+    now: datetime,
 ) -> list[dict]:
-    """
-    Search OSHA for inspections in a state since a date.
-    Returns list of basic inspection info from results page.
+    """Fetch one establishment search page and return the inspection rows on it."""
+    params = {
+        "p_logger": "1",
+        "establishment": term,
+        "State": state,
+        "officetype": "all",
+        "Office": "all",
+        "sitezip": "",
+        "p_case": "all",
+        "p_violations_exist": "all",
+        "startmonth": since_dt.strftime("%m"),
+        "startday": since_dt.strftime("%d"),
+        "startyear": since_dt.strftime("%Y"),
+        "endmonth": now.strftime("%m"),
+        "endday": now.strftime("%d"),
+        "endyear": now.strftime("%Y"),
+    }
     
-    Note: OSHA requires a specific establishment search term, office, or zip.
-    We search with common business name patterns to get broad coverage.
-    """
-    results = []
-    seen_activity_nrs = set()
+    search_url = f"https://www.osha.gov/ords/imis/establishment.search?{urlencode(params)}"
+    logger.info(f"Searching OSHA for state={state} term='{term}' since={since_dt:%Y-%m-%d}")
+    logger.debug(f"Search URL: {search_url}")
     
-    # Parse since_date
-    since_dt = datetime.strptime(since_date, "%Y-%m-%d")
-    now = datetime.now()
+    response = fetch_with_retry(session, search_url)
+    if not response:
+        logger.warning(f"Failed to fetch search results for {state}/{term}")
+        return []
     
-    # Common business name patterns to search - covers most establishments
-    # Each search returns up to ~500 results, so we use multiple terms
-    search_terms = ["inc", "llc", "corp", "co", "services", "construction", "contractors"]
-    
-    for term in search_terms:
-        # Build search URL
-        params = {
-            "p_logger": "1",
-            "establishment": term,
-            "State": state,
-            "officetype": "all",
-            "Office": "all",
-            "sitezip": "",
-            "p_case": "all",
-            "p_violations_exist": "all",
-            "startmonth": since_dt.strftime("%m"),
-            "startday": since_dt.strftime("%d"),
-            "startyear": since_dt.strftime("%Y"),
-            "endmonth": now.strftime("%m"),
-            "endday": now.strftime("%d"),
-            "endyear": now.strftime("%Y"),
-        }
+    # A redirect back to the search form may carry a "no results" message;
+    # only the full parse below can check for it
+    rows = None
+    if "p_message" not in response.url:
+        rows = scan_result_rows(response.text)
+    if rows is None:
+        parsed = tree_result_rows(response.text)
+        if parsed is None:
+            soup = make_soup(response.text)
+            parsed = soup.get_text(), soup_result_rows(soup)
+        page_text, rows = parsed
+        
+        # Check for "no results" or redirect back to form
+        if "enter an establishment" in page_text.lower() and "p_message" in response.url:
+            logger.debug(f"No results for {state}/{term}")
+            return []
+    
+    # Find results table - look for rows with inspection detail links
+    results = []
+    for cells, href, link_text in rows:
+        if len(cells) < 5:
+            continue
         
-        search_url = f"https://www.osha.gov/ords/imis/establishment.search?{urlencode(params)}"
-        logger.info(f"Searching OSHA for state={state} term='{term}' since={since_date}")
-        logger.debug(f"Search URL: {search_url}")
+        # Look for activity number links (format: establishment.inspection_detail?id=XXXXXXX.XXX)
+        if href is None:
+            continue
         
-        response = fetch_with_retry(session, search_url)
-        if not response:
-            logger.warning(f"Failed to fetch search results for {state}/{term}")
+        if "inspection_detail" not in href.lower():
             continue
         
-        soup = BeautifulSoup(response.text, "html.parser")
+        # Extract activity number from link text or URL
+        activity_nr = extract_activity_nr(link_text) or extract_activity_nr(href)
         
-        # Check for "no results" or redirect back to form
-        page_text = soup.get_text().lower()
-        if "enter an establishment" in page_text and "p_message" in response.url:
-            logger.debug(f"No results for {state}/{term}")
+        # Also try extracting from the id parameter (format: id=XXXXXXX.XXX)
+        if not activity_nr:
+            id_match = _ID_PARAM_RE.search(href)
+            if id_match:
+                activity_nr = id_match.group(1)
+        
+        if not activity_nr:
             continue
         
-        # Find results table - look for table with inspection detail links
-        term_results = 0
-        for table in soup.find_all("table"):
-            rows = table.find_all("tr")
+        # Build detail URL - must include /ords/imis/ path
+        if href.startswith("http"):
+            detail_url = href
+        else:
+            # OSHA detail pages are under /ords/imis/
+            detail_url = f"https://www.osha.gov/ords/imis/{href}"
+        
+        inspection = {
+            "activity_nr": activity_nr,
+            "detail_url": detail_url,
+            "site_state": state,
+        }
+        
+        # Try to extract fields from result row cells
+        cell_texts = [clean_text(c) for c in cells]
+        
+        for i, text in enumerate(cell_texts):
+            if not text:
+                continue
             
-            for row in rows:
-                cells = row.find_all(["td", "th"])
-                if len(cells) < 5:
-                    continue
-                
-                # Look for activity number links (format: establishment.inspection_detail?id=XXXXXXX.XXX)
-                link = row.find("a", href=True)
-                if not link:
+            # Look for date pattern (MM/DD/YYYY)
+            parsed_date = parse_date(text)
+            if parsed_date and not inspection.get("date_opened"):
+                inspection["date_opened"] = parsed_date
+                continue
+            
+            # Look for inspection type keywords
+            text_lower = text.lower()
+            if _RESULT_TYPE_RE.search(text_lower):
+                if not inspection.get("inspection_type"):
+                    inspection["inspection_type"] = text
                     continue
-                
-                href = link.get("href", "")
-                if "inspection_detail" not in href.lower():
+            
+            # Look for scope
+            if text_lower in _SCOPES:
+                if not inspection.get("scope"):
+                    inspection["scope"] = text
                     continue
-                
-                # Extract activity number from link text or URL
-                link_text = link.get_text(strip=True)
-                activity_nr = extract_activity_nr(link_text) or extract_activity_nr(href)
-                
-                # Also try extracting from the id parameter (format: id=XXXXXXX.XXX)
-                if not activity_nr:
-                    id_match = re.search(r"id=(\d+)", href)
-                    if id_match:
-                        activity_nr = id_match.group(1)
-                
-                if not activity_nr:
+            
+            # Look for NAICS (6 digits starting with 2-9)
+            if _NAICS_CODE_RE.match(text) and text[0] != "0":
+                if not inspection.get("naics"):
+                    inspection["naics"] = text
                     continue
-                
-                # Dedupe across search terms
-                if activity_nr in seen_activity_nrs:
+            
+            # Look for violation count
+            if text.isdigit() and int(text) < 1000:
+                if not inspection.get("violations_count") and i > 5:
+                    inspection["violations_count"] = int(text)
                     continue
-                seen_activity_nrs.add(activity_nr)
-                
-                # Build detail URL - must include /ords/imis/ path
-                if href.startswith("http"):
-                    detail_url = href
-                else:
-                    # OSHA detail pages are under /ords/imis/
-                    detail_url = f"https://www.osha.gov/ords/imis/{href}"
-                
-                inspection = {
-                    "activity_nr": activity_nr,
-                    "detail_url": detail_url,
-                    "site_state": state,
-                }
-                
-                # Try to extract fields from result row cells
-                cell_texts = [clean_text(c.get_text()) for c in cells]
-                
-                for i, text in enumerate(cell_texts):
-                    if not text:
-                        continue
-                    
-                    # Look for date pattern (MM/DD/YYYY)
-                    parsed_date = parse_date(text)
-                    if parsed_date and not inspection.get("date_opened"):
-                        inspection["date_opened"] = parsed_date
-                        continue
-                    
-                    # Look for inspection type keywords
-                    text_lower = text.lower()
-                    if any(t in text_lower for t in ["complaint", "accident", "referral", "fat", "cat", "planned", "programmed"]):
-                        if not inspection.get("inspection_type"):
-                            inspection["inspection_type"] = text
-                            continue
-                    
-                    # Look for scope
-                    if text_lower in ["complete", "partial"]:
-                        if not inspection.get("scope"):
-                            inspection["scope"] = text
-                            continue
-                    
-                    # Look for NAICS (6 digits starting with 2-9)
-                    if re.match(r"^\d{6}$", text) and text[0] != "0":
-                        if not inspection.get("naics"):
-                            inspection["naics"] = text
-                            continue
-                    
-                    # Look for violation count
-                    if text.isdigit() and int(text) < 1000:
-                        if not inspection.get("violations_count") and i > 5:
-                            inspection["violations_count"] = int(text)
-                            continue
-                    
-                    # Establishment name is usually the longest text, appears last
-                    if len(text) > 10 and not text.isdigit() and "/" not in text:
-                        if not inspection.get("establishment_name"):
-                            inspection["establishment_name"] = text
-                
-                results.append(inspection)
-                term_results += 1
-                logger.debug(f"Found inspection: {activity_nr}")
+            
+            # Establishment name is usually the longest text, appears last
+            if len(text) > 10 and not text.isdigit() and "/" not in text:
+                if not inspection.get("establishment_name"):
+                    inspection["establishment_name"] = text
+        
+        results.append(inspection)
+
+    return results
+
+
+def _submit_state_search(
+    pool: ThreadPoolExecutor,
+    session: requests.Session,
+    state: str,
+    since_date: str,
+) -> list[Future]:
+    """Queue one search per SEARCH_TERMS entry for a state; futures keep term order."""
+    since_dt = datetime.strptime(since_date, "%Y-%m-%d")
+    now = datetime.now()
+    return [pool.submit(_search_term, session, state, term, since_dt, now) for term in SEARCH_TERMS]
+
+
+def _collect_state_search(state: str, futures: list[Future]) -> list[dict]:
+    """Merge per-term search pages in term order, deduping by activity_nr."""
+    results = []
+    seen_activity_nrs = set()
+    
+    for term, future in zip(SEARCH_TERMS, futures):
+        term_results = 0
+        for inspection in future.result():
+            activity_nr = inspection["activity_nr"]
+            # Dedupe across search terms
+            if activity_nr in seen_activity_nrs:
+                continue
+            seen_activity_nrs.add(activity_nr)
+            results.append(inspection)
+            term_results += 1
+            logger.debug(f"Found inspection: {activity_nr}")
         
         if term_results > 0:
             logger.info(f"Found {term_results} new inspections for {state}/{term}")
@@ -432,66 +783,211 @@ def search_osha_inspections(
     return results
 
 
-def parse_inspection_detail(html: str, url: str) -> dict:
+def search_osha_inspections(
+    session: requests.Session,
+    state: str,
+    since_date: str,
+) -> list[dict]:
+    """
+    Search OSHA for inspections in a state since a date.
+    Returns list of basic inspection info from results page.
+    
+    Note: OSHA requires a specific establishment search term, office, or zip.
+    We search with common business name patterns to get broad coverage.
+    The per-term pages are fetched concurrently (up to MAX_CONCURRENT_REQUESTS).
+    """
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+        futures = _submit_state_search(pool, session, state, since_date)
+        return _collect_state_search(state, futures)
+
+
+def _set_field(field: str):
+    """Handler that always overwrites data[field] with the label's value."""
+    def handler(data: dict, value: str) -> None:
+        data[field] = value
+    return handler
+
+
+def _fill_field(field: str):
+    """Handler that sets data[field] only if it is still empty and the value is non-empty."""
+    def handler(data: dict, value: str) -> None:
+        if value and not data.get(field):
+            data[field] = value
+    return handler
+
+
+def _set_date_opened(data: dict, value: str) -> None:
+    data["date_opened"] = parse_date(value)
+
+
+def _set_inspection_nr(data: dict, value: str) -> None:
+    # Extract just the numeric part
+    nr_match = _DIGITS_RE.match(value)
+    if nr_match:
+        data["activity_nr"] = nr_match.group()
+
+
+def _fill_activity_nr(data: dict, value: str) -> None:
+    if data.get("activity_nr"):
+        return
+    nr_match = _DIGITS_RE.search(value)
+    if nr_match:
+        data["activity_nr"] = nr_match.group()
+
+
+def _fill_establishment_name(data: dict, value: str) -> None:
+    if value and not data.get("establishment_name") and _HAS_ALPHA_RE.search(value):
+        data["establishment_name"] = value
+
+
+def _set_naics(data: dict, value: str) -> None:
+    naics_match = _NAICS_RE.match(value)
+    if naics_match:
+        data["naics"] = naics_match.group(1)
+        if naics_match.group(2):
+            data["naics_desc"] = naics_match.group(2).strip()
+    else:
+        data["naics"] = value
+
+
+_MAX_LABEL_LEN = 40
+
+# First-table header row -> (indices of "type" columns, indices of "scope" columns).
+# OSHA serves a handful of layouts, so each header row is resolved once per run.
+_HEADER_SCHEMAS: dict[tuple[str, ...], tuple[tuple[int, ...], tuple[int, ...]]] = {}
+_HEADER_SCHEMAS_MAX = 256
+
+
+def _header_schema(header_cells: tuple[str, ...]) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    schema = _HEADER_SCHEMAS.get(header_cells)
+    if schema is None:
+        schema = (
+            tuple(i for i, header in enumerate(header_cells) if header == "type"),
+            tuple(i for i, header in enumerate(header_cells) if header == "scope"),
+        )
+        if len(_HEADER_SCHEMAS) < _HEADER_SCHEMAS_MAX:
+            _HEADER_SCHEMAS[header_cells] = schema
+    return schema
+
+
+# "Label: value" lines on detail pages, keyed by lowercased label.
+# Several labels are alternates seen on some pages/fixtures.
+_FIELD_HANDLERS = {
+    "case status": _set_field("case_status"),
+    "date opened": _set_date_opened,
+    "open date": _set_date_opened,
+    "inspection nr": _set_inspection_nr,
+    "activity nr": _fill_activity_nr,
+    "report id": _set_field("report_id"),
+    "area office": _fill_field("area_office"),
+    "office": _fill_field("area_office"),
+    "establishment name": _fill_establishment_name,
+    "inspection type": _fill_field("inspection_type"),
+    "scope": _fill_field("scope"),
+    "emphasis": _fill_field("emphasis"),
+    "naics": _set_naics,
+    "sic": _set_field("sic"),
+}
+
+
+def parse_inspection_detail(
+    html: str | bytes,
+    url: str,
+    raw: Optional[bytes] = None,
+    encoding: Optional[str] = None,
+) -> dict:
     """
     Parse an OSHA inspection detail page.
+    `raw` is the undecoded response body; when given, raw_hash is taken from it.
+    `html` may itself be the undecoded body, decoded with `encoding`.
     Returns dict with all available fields.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    data = {"source_url": url, "raw_hash": compute_hash(html)}
+    page_text, tables = extract_page(html, encoding)
+    data = {"source_url": url, "raw_hash": compute_page_hash(raw if raw is not None else html)}
     
     # Extract activity number from URL
-    id_match = re.search(r"id=(\d+)", url)
+    id_match = _ID_PARAM_RE.search(url)
     if id_match:
         data["activity_nr"] = id_match.group(1)
     else:
         # Some callers/tests use activity_nr= in the query string.
-        q_match = re.search(r"(?:\\?|&)activity_nr=(\\d+)", url)
+        q_match = _ACTIVITY_NR_PARAM_RE.search(url)
         if q_match:
             data["activity_nr"] = q_match.group(1)
     
     # Get page text for parsing
-    page_text = soup.get_text()
     page_lines = [l.strip() for l in page_text.split("\n") if l.strip()]
     
-    # === PRIMARY: Extract establishment name from "Inspection: XXXXXXX.XXX - Company Name" ===
-    for line in page_lines:
-        if line.startswith("Inspection:") and " - " in line:
-            # Format: "Inspection: 1866601.015 - Miss Saigon Cafe, Inc."
-            parts = line.split(" - ", 1)
-            if len(parts) == 2:
-                company_name = parts[1].strip()
-                # Validate: must contain letters, not just numbers
-                if company_name and re.search(r"[A-Za-z]", company_name):
-                    data["establishment_name"] = company_name
-                    logger.debug(f"Extracted establishment from header: {company_name}")
-            break
-    
-    # === Parse Site Address block ===
-    in_site_address = False
+    # === Single pass: header, Site Address block, Mailing Address block, labels ===
+    # Each section keeps its own state (0 = not reached, 1 = collecting,
+    # 2 = done) so a line can feed several sections, exactly as the separate
+    # scans did. Label handlers are queued and applied after the address blocks
+    # so header/site fallbacks still win over fill-if-empty labels.
+    header_line = None
+    site_state = mail_state = 0
     site_lines = []
-    for i, line in enumerate(page_lines):
-        # Some variants omit the colon (e.g., "Site Address")
-        if line.replace(":", "").strip() == "Site Address":
-            in_site_address = True
+    mail_lines = []
+    label_hits = []
+    for line in page_lines:
+        if header_line is None and line.startswith("Inspection:") and " - " in line:
+            header_line = line
+
+        if site_state < 2:
+            # Some variants omit the colon (e.g., "Site Address")
+            if line.replace(":", "").strip() == "Site Address":
+                site_state = 1
+            elif site_state == 1:
+                # Stop at next section
+                if "Mailing Address:" in line or "SIC:" in line or "NAICS:" in line:
+                    site_state = 2
+                else:
+                    if not line.startswith("Inspection"):
+                        site_lines.append(line)
+                    if len(site_lines) >= 3:  # Max 3 lines for address
+                        site_state = 2
+
+        if mail_state < 2:
+            if "Mailing Address:" in line:
+                mail_state = 1
+            elif mail_state == 1:
+                if "SIC:" in line or "NAICS:" in line or line.startswith("Inspection"):
+                    mail_state = 2
+                else:
+                    mail_lines.append(line)
+                    if len(mail_lines) >= 2:
+                        mail_state = 2
+
+        # Most lines (addresses, table text, footer) aren't "Label: value"; skip
+        # them before any string work. Real labels are well under 40 chars.
+        colon = line.find(":")
+        if colon < 0 or colon > _MAX_LABEL_LEN:
             continue
-        if in_site_address:
-            # Stop at next section
-            if "Mailing Address:" in line or "SIC:" in line or "NAICS:" in line:
-                break
-            if line and not line.startswith("Inspection"):
-                site_lines.append(line)
-            if len(site_lines) >= 3:  # Max 3 lines for address
-                break
+        label = line[:colon].strip().lower()
+        handler = _FIELD_HANDLERS.get(label)
+        if handler:
+            label_hits.append((handler, line[colon + 1:].strip()))
+        elif label.startswith("total") and "violation" in line.lower():
+            label_hits.append((None, line[colon + 1:].strip()))
+
+    # === PRIMARY: Extract establishment name from "Inspection: XXXXXXX.XXX - Company Name" ===
+    if header_line is not None:
+        # Format: "Inspection: 1866601.015 - Miss Saigon Cafe, Inc."
+        parts = header_line.split(" - ", 1)
+        if len(parts) == 2:
+            company_name = parts[1].strip()
+            # Validate: must contain letters, not just numbers
+            if company_name and _HAS_ALPHA_RE.search(company_name):
+                data["establishment_name"] = company_name
+                logger.debug(f"Extracted establishment from header: {company_name}")
     
     # Parse site address lines
     if site_lines:
         # First line after "Site Address:" is often the company name (backup)
         if not data.get("establishment_name"):
             first_line = site_lines[0]
-            if first_line and re.search(r"[A-Za-z]", first_line):
+            if first_line and _HAS_ALPHA_RE.search(first_line):
                 # Make sure it's not an address (no numbers at start)
-                if not re.match(r"^\d+\s+", first_line):
+                if not _LEADING_NUMBER_RE.match(first_line):
                     data["establishment_name"] = first_line
                     logger.debug(f"Extracted establishment from site address: {first_line}")
         
@@ -499,13 +995,13 @@ def parse_inspection_detail(html: str, url: str) -> dict:
         for line in site_lines:
             # Look for City, ST ZZZZZ pattern (with possible street prefix concatenated)
             # Pattern: ...City, ST 12345 or ...City, ST 12345-6789
-            csz_match = re.search(r"([A-Za-z][A-Za-z\s]{2,}),\s*([A-Z]{2})\s+(\d{5}(?:-\d{4})?)\s*$", line)
+            csz_match = _SITE_CSZ_RE.search(line)
             if csz_match:
                 raw_city = csz_match.group(1).strip()
                 
                 # Clean city - if it has lowercase followed by uppercase, it's concatenated
                 # e.g., "Richmond AvenueHouston" -> "Houston"
-                city_parts = re.split(r"(?<=[a-z])(?=[A-Z])", raw_city)
+                city_parts = _CAMEL_SPLIT_RE.split(raw_city)
                 if len(city_parts) > 1:
                     # Take the last part (the actual city)
                     data["site_city"] = city_parts[-1].strip()
@@ -521,7 +1017,7 @@ def parse_inspection_detail(html: str, url: str) -> dict:
                     # Clean up if concatenated with city
                     if city_parts and len(city_parts) > 1:
                         # Street is everything before the last camelCase split
-                        street_match = re.match(r"(.+?)([A-Z][a-z]+)$", street_part)
+                        street_match = _STREET_TAIL_RE.match(street_part)
                         if street_match:
                             street_part = street_match.group(1).strip()
                     if street_part and not street_part.isdigit():
@@ -529,23 +1025,9 @@ def parse_inspection_detail(html: str, url: str) -> dict:
                 break
     
     # === Parse Mailing Address (similar logic) ===
-    in_mail_address = False
-    mail_lines = []
-    for line in page_lines:
-        if "Mailing Address:" in line:
-            in_mail_address = True
-            continue
-        if in_mail_address:
-            if "SIC:" in line or "NAICS:" in line or line.startswith("Inspection"):
-                break
-            if line:
-                mail_lines.append(line)
-            if len(mail_lines) >= 2:
-                break
-    
     for line in mail_lines:
         # Mailing format is often: "1421 Richmond Avenue, Houston, TX 77006"
-        mail_match = re.search(r"(.+),\s*([A-Za-z\s]+),\s*([A-Z]{2})\s+(\d{5}(?:-\d{4})?)", line)
+        mail_match = _MAIL_ADDRESS_RE.search(line)
         if mail_match:
             data["mail_address1"] = mail_match.group(1).strip()
             data["mail_city"] = mail_match.group(2).strip()
@@ -554,146 +1036,48 @@ def parse_inspection_detail(html: str, url: str) -> dict:
             break
     
     # === Parse other fields from page text ===
-    for line in page_lines:
-        line_lower = line.lower()
-        
-        # Case Status
-        if line.startswith("Case Status:"):
-            data["case_status"] = line.split(":", 1)[1].strip()
-        
-        # Date Opened
-        elif line.startswith("Date Opened:"):
-            date_str = line.split(":", 1)[1].strip()
-            data["date_opened"] = parse_date(date_str)
-        
-        # Alternate label used on some pages/fixtures
-        elif line.startswith("Open Date:"):
-            date_str = line.split(":", 1)[1].strip()
-            data["date_opened"] = parse_date(date_str)
-        
-        # Inspection Nr
-        elif line.startswith("Inspection Nr:"):
-            nr = line.split(":", 1)[1].strip()
-            # Extract just the numeric part
-            nr_match = re.match(r"(\d+)", nr)
-            if nr_match:
-                data["activity_nr"] = nr_match.group(1)
-        
-        # Alternate label used on some pages/fixtures
-        elif line.startswith("Activity Nr:") and not data.get("activity_nr"):
-            nr = line.split(":", 1)[1].strip()
-            nr_match = re.search(r"(\\d+)", nr)
-            if nr_match:
-                data["activity_nr"] = nr_match.group(1)
-        
-        # Report ID
-        elif line.startswith("Report ID:"):
-            data["report_id"] = line.split(":", 1)[1].strip()
-
-        # Area office
-        elif line.startswith("Area Office:") and not data.get("area_office"):
-            office = line.split(":", 1)[1].strip()
-            if office:
-                data["area_office"] = office
-
-        # Alternate office label used on some pages/fixtures
-        elif line.startswith("Office:") and not data.get("area_office"):
-            office = line.split(":", 1)[1].strip()
-            if office:
-                data["area_office"] = office
-
-        # Establishment Name (alternate path)
-        elif line.startswith("Establishment Name:") and not data.get("establishment_name"):
-            name = line.split(":", 1)[1].strip()
-            if name and re.search(r"[A-Za-z]", name):
-                data["establishment_name"] = name
-
-        # Inspection Type (alternate path)
-        elif line.startswith("Inspection Type:") and not data.get("inspection_type"):
-            insp = line.split(":", 1)[1].strip()
-            if insp:
-                data["inspection_type"] = insp
-
-        # Scope (alternate path)
-        elif line.startswith("Scope:") and not data.get("scope"):
-            scope_val = line.split(":", 1)[1].strip()
-            if scope_val:
-                data["scope"] = scope_val
-
-        # Emphasis (alternate path)
-        elif line.startswith("Emphasis:") and not data.get("emphasis"):
-            emph = line.split(":", 1)[1].strip()
-            if emph:
-                data["emphasis"] = emph
-
-        # Total violations (alternate path)
-        elif ("violation" in line_lower) and line_lower.startswith("total"):
-            try:
-                value = line.split(":", 1)[1]
-                m = re.search(r"\\d+", value)
-                if m:
-                    data["violations_count"] = int(m.group())
-            except Exception:
-                pass
-        
-        # NAICS
-        elif line.startswith("NAICS:"):
-            naics_val = line.split(":", 1)[1].strip()
-            naics_match = re.match(r"(\d+)\s*[-/]?\s*(.*)", naics_val)
-            if naics_match:
-                data["naics"] = naics_match.group(1)
-                if naics_match.group(2):
-                    data["naics_desc"] = naics_match.group(2).strip()
-            else:
-                data["naics"] = naics_val
-        
-        # SIC
-        elif line.startswith("SIC:"):
-            data["sic"] = line.split(":", 1)[1].strip()
+    for handler, value in label_hits:
+        if handler:
+            handler(data, value)
+        else:
+            # Total violations (alternate path)
+            m = _DIGITS_RE.search(value)
+            if m:
+                data["violations_count"] = int(m.group())
     
     # === Parse table data for inspection type, scope, violations ===
     # OSHA detail pages have a specific table structure:
     # - First table: Header row with ['Type', 'Activity Nr', 'Safety', 'Health']
     #                Data row with ['Accident', '2384224', '', '']
-    tables = soup.find_all("table")
-    
     if tables:
-        first_table = tables[0]
-        rows = first_table.find_all("tr")
+        rows = tables[0]
         
         if len(rows) >= 2:
             # First row is header, second row is data
-            header_cells = [c.get_text(strip=True).lower() for c in rows[0].find_all(["td", "th"])]
-            data_cells = [c.get_text(strip=True) for c in rows[1].find_all(["td", "th"])]
+            type_columns, scope_columns = _header_schema(tuple(stripped.lower() for _, stripped in rows[0]))
+            data_cells = [stripped for _, stripped in rows[1]]
             
             # Map header names to data values
-            for i, header in enumerate(header_cells):
-                if i < len(data_cells):
-                    value = data_cells[i]
-                    if not value:
-                        continue
-                    
-                    if header == "type":
-                        # Validate it's a real type, not a label like "Activity Nr"
-                        valid_types = ["inspection", "accident", "complaint", "referral", 
-                                       "planned", "programmed", "fat/cat", "follow-up", "other"]
-                        if value.lower() in valid_types or any(t in value.lower() for t in valid_types):
-                            data["inspection_type"] = value
-                        else:
-                            logger.debug(f"Skipping invalid inspection_type: {value}")
-                    elif header == "scope":
-                        if value.lower() in ["complete", "partial"]:
-                            data["scope"] = value
+            for i in type_columns:
+                value = data_cells[i] if i < len(data_cells) else ""
+                if not value:
+                    continue
+                # Validate it's a real type, not a label like "Activity Nr"
+                if _DETAIL_TYPE_RE.search(value.lower()):
+                    data["inspection_type"] = value
+                else:
+                    logger.debug(f"Skipping invalid inspection_type: {value}")
+            for i in scope_columns:
+                value = data_cells[i] if i < len(data_cells) else ""
+                if value and value.lower() in _SCOPES:
+                    data["scope"] = value
     
     # Also check for violations table (second table)
     if len(tables) >= 2:
-        viol_table = tables[1]
-        rows = viol_table.find_all("tr")
-        for row in rows:
-            cells = row.find_all(["td", "th"])
+        for cells in tables[1]:
             if len(cells) >= 2:
-                label = clean_text(cells[0].get_text())
-                value = clean_text(cells[1].get_text())
+                label = clean_text(cells[0][0])
+                value = clean_text(cells[1][0])
                 
                 if not label or not value:
                     continue
@@ -702,30 +1086,28 @@ def parse_inspection_detail(html: str, url: str) -> dict:
                 
                 if "total" in label_lower and "violation" in label_lower:
                     try:
-                        data["violations_count"] = int(re.search(r"\d+", value).group())
+                        data["violations_count"] = int(_DIGITS_RE.search(value).group())
                     except (AttributeError, ValueError):
                         pass
                 elif "serious" in label_lower:
                     try:
-                        data["serious_violations"] = int(re.search(r"\d+", value).group())
+                        data["serious_violations"] = int(_DIGITS_RE.search(value).group())
                     except (AttributeError, ValueError):
                         pass
 
     # Generic table label/value extraction (helps with alternate OSHA layouts and local fixtures)
-    for table in tables:
-        rows = table.find_all("tr")
-        for row in rows:
-            cells = row.find_all(["td", "th"])
+    for rows in tables:
+        for cells in rows:
             if len(cells) < 2:
                 continue
-            label = clean_text(cells[0].get_text())
-            value = clean_text(cells[1].get_text())
+            label = clean_text(cells[0][0])
+            value = clean_text(cells[1][0])
             if not label or not value:
                 continue
 
             label_norm = label.strip().rstrip(":").lower()
             if label_norm == "activity nr" and not data.get("activity_nr"):
-                m = re.search(r"\d+", value)
+                m = _DIGITS_RE.search(value)
                 if m:
                     data["activity_nr"] = m.group()
             elif label_norm in ("date opened", "open date") and not data.get("date_opened"):
@@ -743,7 +1125,7 @@ def parse_inspection_detail(html: str, url: str) -> dict:
             elif label_norm == "sic" and not data.get("sic"):
                 data["sic"] = value
             elif label_norm == "naics" and not data.get("naics"):
-                naics_match = re.match(r"(\d+)\s*[-/]?\s*(.*)", value)
+                naics_match = _NAICS_RE.match(value)
                 if naics_match:
                     data["naics"] = naics_match.group(1)
                     if naics_match.group(2):
@@ -751,10 +1133,10 @@ def parse_inspection_detail(html: str, url: str) -> dict:
                 else:
                     data["naics"] = value
             elif label_norm == "establishment name" and not data.get("establishment_name"):
-                if re.search(r"[A-Za-z]", value):
+                if _HAS_ALPHA_RE.search(value):
                     data["establishment_name"] = value
             elif label_norm == "total violations" and data.get("violations_count") is None:
-                m = re.search(r"\d+", value)
+                m = _DIGITS_RE.search(value)
                 if m:
                     data["violations_count"] = int(m.group())
             elif label_norm in ("area office", "office", "osha office") and not data.get("area_office"):
@@ -768,10 +1150,10 @@ def validate_establishment_name(name: Optional[str]) -> bool:
     if not name:
         return False
     # Must contain at least one letter
-    if not re.search(r"[A-Za-z]", name):
+    if not _HAS_ALPHA_RE.search(name):
         return False
     # Should not be just a numeric ID like "1866601.015"
-    if re.match(r"^\d+\.?\d*$", name.strip()):
+    if _NUMERIC_ID_RE.match(name.strip()):
         return False
     # Should have reasonable length
     if len(name.strip()) < 3:
@@ -784,7 +1166,7 @@ def validate_city(city: Optional[str]) -> bool:
     if not city:
         return False
     # Must contain only letters and spaces
-    if not re.match(r"^[A-Za-z\s]+$", city.strip()):
+    if not _CITY_RE.match(city.strip()):
         return False
     # Should have reasonable length
     if len(city.strip()) < 2 or len(city.strip()) > 50:
@@ -792,30 +1174,88 @@ def validate_city(city: Optional[str]) -> bool:
     return True
 
 
-def upsert_inspection(conn: sqlite3.Connection, inspection: dict) -> tuple[bool, bool]:
+# Fields copied onto an existing row when the new value is non-null
+# (don't overwrite existing data with nulls)
+_UPDATE_FIELDS = (
+    "date_opened", "inspection_type", "scope", "case_status", "emphasis",
+    "safety_health", "sic", "naics", "naics_desc", "violations_count",
+    "serious_violations", "willful_violations", "repeat_violations", "other_violations",
+    "establishment_name", "site_address1", "site_city", "site_state", "site_zip",
+    "area_office", "mail_address1", "mail_city", "mail_state", "mail_zip",
+    "report_id", "source_url", "raw_hash", "lead_score", "needs_review", "parse_invalid", "lead_key",
+)
+
+_INSERT_FIELDS = (
+    "activity_nr", "lead_key", "date_opened", "inspection_type", "scope", "case_status",
+    "emphasis", "safety_health", "sic", "naics", "naics_desc",
+    "violations_count", "serious_violations", "willful_violations",
+    "repeat_violations", "other_violations", "establishment_name",
+    "site_address1", "site_city", "site_state", "site_zip",
+    "area_office", "mail_address1", "mail_city", "mail_state", "mail_zip",
+    "report_id", "source_url", "raw_hash", "record_hash", "changed_at",
+    "lead_score", "needs_review", "parse_invalid", "first_seen_at", "last_seen_at",
+)
+
+# One statement per record: new leads insert, known lead_keys take the DO UPDATE
+# branch. COALESCE keeps stored values where the new one is NULL ("don't
+# overwrite existing data with nulls"); re_alert and changed_at are decided
+# against the stored row in SQL, so no per-record SELECT is needed.
+_UPSERT_SQL = (
+    f"INSERT INTO inspections ({', '.join(_INSERT_FIELDS)}) "
+    f"VALUES ({', '.join('?' for _ in _INSERT_FIELDS)}) "
+    "ON CONFLICT(lead_key) DO UPDATE SET "
+    + ", ".join(f"{field} = COALESCE(excluded.{field}, {field})" for field in _UPDATE_FIELDS)
+    + ", last_seen_at = excluded.last_seen_at"
+    ", changed_at = CASE WHEN record_hash IS excluded.record_hash THEN changed_at ELSE excluded.changed_at END"
+    ", record_hash = excluded.record_hash"
+    ", re_alert = CASE WHEN (violations_count IS NULL AND excluded.violations_count >= 1)"
+    " OR (upper(case_status) = 'OPEN' AND upper(excluded.case_status) = 'CLOSED')"
+    " THEN 1 ELSE re_alert END"
+)
+
+# Positions in an _UPSERT_SQL row stamped with the batch time
+_STAMPED_SLOTS = tuple(
+    i for i, field in enumerate(_INSERT_FIELDS) if field in ("changed_at", "first_seen_at", "last_seen_at")
+)
+
+_EXISTING_SQL = (
+    "SELECT lead_key, violations_count, case_status "
+    "FROM inspections WHERE lead_key IN ({})"
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _existing_sql(count: int) -> str:
+    """_EXISTING_SQL with `count` placeholders; full chunks reuse one string."""
+    return _EXISTING_SQL.format(", ".join("?" * count))
+
+# SQLite's default host-parameter limit is 999 on older builds
+_LOOKUP_CHUNK = 500
+
+
+def _prepare_upsert(inspection: dict, lead_key: str, existing: dict, now: str) -> Optional[tuple[bool, tuple]]:
     """
-    Insert or update inspection record.
-    Returns (is_new, is_updated).
+    Validate/score one inspection and build its _UPSERT_SQL row.
+    `lead_key` is build_lead_key(inspection), computed once by the caller.
+    `existing` maps lead_key -> (violations_count, case_status) and is updated
+    in place so later records in the same batch see this write.
+    Returns (is_new, row), or None if the record can't be keyed.
     """
-    cursor = conn.cursor()
-    activity_nr = str(inspection.get("activity_nr") or "").strip()
-    lead_key = build_lead_key(inspection)
-    inspection["lead_key"] = lead_key
+    activity_nr = str(inspection.get("activity_nr") or "").strip()
+    inspection["lead_key"] = lead_key
 
     if not lead_key:
         logger.warning("Cannot upsert inspection without stable lead_key")
-        return False, False
+        return None
     if not activity_nr:
         logger.warning("Cannot upsert inspection without activity_nr")
-        return False, False
+        return None
     
     # Validate key fields and set parse_invalid
     parse_invalid = 0
-    invalid_reasons = []
     
     if not validate_establishment_name(inspection.get("establishment_name")):
         parse_invalid = 1
-        invalid_reasons.append("establishment_name")
         logger.warning(f"Invalid establishment_name for {activity_nr}: '{inspection.get('establishment_name')}' - URL: {inspection.get('source_url')}")
     
     if not validate_city(inspection.get("site_city")):
@@ -826,109 +1266,102 @@ def upsert_inspection(conn: sqlite3.Connection, inspection: dict) -> tuple[bool,
     
     inspection["parse_invalid"] = parse_invalid
     
-    # Check for existing record
-    cursor.execute(
-        "SELECT id, violations_count, case_status, raw_hash, parse_invalid, record_hash FROM inspections WHERE lead_key = ?",
-        (lead_key,)
-    )
-    existing = cursor.fetchone()
-    
     # Calculate score and review status
     inspection["lead_score"] = calculate_lead_score(inspection)
     inspection["needs_review"] = 1 if check_needs_review(inspection) else 0
-    
-    now = datetime.now(timezone.utc).isoformat()
     inspection["record_hash"] = compute_record_hash(inspection)
     
-    if existing:
-        # Update existing record
-        existing_id, old_violations, old_status, old_hash, old_parse_invalid, old_record_hash = existing
-        
-        # Check for material upgrade (re-alert)
-        re_alert = 0
-        new_violations = inspection.get("violations_count")
-        new_status = inspection.get("case_status")
+    new_violations = inspection.get("violations_count")
+    new_status = inspection.get("case_status")
+    
+    params = list(map(inspection.get, _INSERT_FIELDS))
+    for slot in _STAMPED_SLOTS:
+        params[slot] = now
+    params = tuple(params)
+    
+    if lead_key in existing:
+        old_violations, old_status = existing[lead_key]
         
+        # Material upgrades; _UPSERT_SQL sets re_alert from the same conditions
         if old_violations is None and new_violations is not None and new_violations >= 1:
-            re_alert = 1
             logger.info(f"Material upgrade: {activity_nr} - violations posted")
         
         if old_status and new_status and old_status.upper() == "OPEN" and new_status.upper() == "CLOSED":
-            re_alert = 1
             logger.info(f"Material upgrade: {activity_nr} - case closed")
         
-        # Update only non-null fields (don't overwrite existing data with nulls)
-        update_fields = []
-        update_values = []
-        
-        for field in [
-            "date_opened", "inspection_type", "scope", "case_status", "emphasis",
-            "safety_health", "sic", "naics", "naics_desc", "violations_count",
-            "serious_violations", "willful_violations", "repeat_violations", "other_violations",
-            "establishment_name", "site_address1", "site_city", "site_state", "site_zip",
-            "area_office", "mail_address1", "mail_city", "mail_state", "mail_zip",
-            "report_id", "source_url", "raw_hash", "lead_score", "needs_review", "parse_invalid", "lead_key"
-        ]:
-            value = inspection.get(field)
-            if value is not None:
-                update_fields.append(f"{field} = ?")
-                update_values.append(value)
-        
-        update_fields.append("last_seen_at = ?")
-        update_values.append(now)
-
-        if old_record_hash != inspection.get("record_hash"):
-            update_fields.append("record_hash = ?")
-            update_values.append(inspection.get("record_hash"))
-            update_fields.append("changed_at = ?")
-            update_values.append(now)
-        
-        if re_alert:
-            update_fields.append("re_alert = ?")
-            update_values.append(re_alert)
-        
-        update_values.append(existing_id)
-        
-        cursor.execute(
-            f"UPDATE inspections SET {', '.join(update_fields)} WHERE id = ?",
-            update_values
+        existing[lead_key] = (
+            old_violations if new_violations is None else new_violations,
+            old_status if new_status is None else new_status,
         )
-        
-        return False, True
+        return False, params
     
-    else:
-        # Insert new record
-        fields = [
-            "activity_nr", "lead_key", "date_opened", "inspection_type", "scope", "case_status",
-            "emphasis", "safety_health", "sic", "naics", "naics_desc",
-            "violations_count", "serious_violations", "willful_violations",
-            "repeat_violations", "other_violations", "establishment_name",
-            "site_address1", "site_city", "site_state", "site_zip",
-            "area_office", "mail_address1", "mail_city", "mail_state", "mail_zip",
-            "report_id", "source_url", "raw_hash", "record_hash", "changed_at",
-            "lead_score", "needs_review", "parse_invalid", "first_seen_at", "last_seen_at"
-        ]
-        
-        inspection["first_seen_at"] = now
-        inspection["last_seen_at"] = now
-        inspection["changed_at"] = now
-        
-        values = [inspection.get(f) for f in fields]
-        placeholders = ", ".join(["?" for _ in fields])
-        field_names = ", ".join(fields)
-        
-        cursor.execute(
-            f"INSERT INTO inspections ({field_names}) VALUES ({placeholders})",
-            values
-        )
-        
-        return True, False
+    inspection["first_seen_at"] = now
+    inspection["last_seen_at"] = now
+    inspection["changed_at"] = now
+    existing[lead_key] = (new_violations, new_status)
+    return True, params
+
+
+def _load_existing(cursor: sqlite3.Cursor, lead_keys: list[str]) -> dict:
+    """Fetch (violations_count, case_status) for known lead_keys."""
+    existing = {}
+    for start in range(0, len(lead_keys), _LOOKUP_CHUNK):
+        chunk = lead_keys[start:start + _LOOKUP_CHUNK]
+        cursor.execute(_existing_sql(len(chunk)), chunk)
+        for lead_key, violations, status in cursor.fetchall():
+            existing[lead_key] = (violations, status)
+    return existing
+
+
+def upsert_inspections(conn: sqlite3.Connection, inspections: list[dict]) -> tuple[int, int]:
+    """
+    Insert or update a batch of inspection records in one transaction.
+    Known lead_keys are looked up with one query per batch (for stats and
+    upgrade logging); every record is then written by a single executemany
+    of the INSERT ... ON CONFLICT statement.
+    Returns (rows_inserted, rows_updated).
+    """
+    cursor = conn.cursor()
+    keys = [build_lead_key(insp) for insp in inspections]
+    existing = _load_existing(cursor, list({key for key in keys if key}))
+    now = datetime.now(timezone.utc).isoformat()
+    
+    inserted = updated = 0
+    rows = []
+    for inspection, lead_key in zip(inspections, keys):
+        prepared = _prepare_upsert(inspection, lead_key, existing, now)
+        if prepared:
+            is_new, params = prepared
+            inserted += is_new
+            updated += not is_new
+            rows.append(params)
+    
+    # Statement order is kept, so a lead seen twice in one batch inserts then updates
+    cursor.executemany(_UPSERT_SQL, rows)
+    
+    return inserted, updated
+
+
+def upsert_inspection(conn: sqlite3.Connection, inspection: dict) -> tuple[bool, bool]:
+    """
+    Insert or update inspection record.
+    Returns (is_new, is_updated).
+    """
+    inserted, updated = upsert_inspections(conn, [inspection])
+    return inserted > 0, updated > 0
 
 
+# Rows refresh_invalid_records re-fetches: flagged invalid, missing a name, or
+# a name containing "." (IDs like "1866601.015" leaked into the name field).
+# Same test as the old LIKE '%.%' scan, kept in a generated column so it can be indexed.
+_NEEDS_REFRESH_EXPR = "parse_invalid = 1 OR establishment_name IS NULL OR instr(establishment_name, '.') > 0"
+
+
 def ensure_inspection_columns(conn: sqlite3.Connection) -> None:
     """Backfill optional columns for older databases."""
     cursor = conn.cursor()
-    cursor.execute("PRAGMA table_info(inspections)")
+    # table_xinfo so generated columns (needs_refresh) are listed too
+    cursor.execute("PRAGMA table_xinfo(inspections)")
     existing = {row[1] for row in cursor.fetchall()}
 
     if "area_office" not in existing:
@@ -947,6 +1380,10 @@ def ensure_inspection_columns(conn: sqlite3.Connection) -> None:
         cursor.execute("ALTER TABLE inspections ADD COLUMN lead_key TEXT")
         conn.commit()
         logger.info("Added missing inspections.lead_key column")
+    if "needs_refresh" not in existing:
+        cursor.execute(f"ALTER TABLE inspections ADD COLUMN needs_refresh INTEGER GENERATED ALWAYS AS ({_NEEDS_REFRESH_EXPR}) VIRTUAL")
+        conn.commit()
+        logger.info("Added missing inspections.needs_refresh column")
 
     cursor.execute("SELECT id, activity_nr, establishment_name, site_city, site_state, inspection_type, date_opened FROM inspections WHERE lead_key IS NULL OR trim(lead_key) = ''")
     rows = cursor.fetchall()
@@ -972,7 +1409,135 @@ def ensure_inspection_columns(conn: sqlite3.Connection) -> None:
         logger.info(f"Backfilled inspections.lead_key for {backfilled} rows")
 
     cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_inspections_lead_key ON inspections(lead_key)")
+    # Partial indexes: only the handful of rows refresh_invalid_records looks for
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_inspections_parse_invalid ON inspections(parse_invalid) WHERE parse_invalid = 1"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_inspections_needs_refresh ON inspections(needs_refresh) WHERE needs_refresh = 1"
+    )
+    # Indexes dropped for a bulk load that never finished are rebuilt here
+    cursor.execute("CREATE TABLE IF NOT EXISTS deferred_indexes (name TEXT PRIMARY KEY, sql TEXT NOT NULL)")
     conn.commit()
+    _restore_deferred_indexes(conn)
+
+
+def configure_connection(conn: sqlite3.Connection) -> None:
+    """
+    WAL + NORMAL sync so batch commits no longer fsync the journal on every
+    write, plus an in-memory temp store, a 64 MiB page cache and a 256 MiB
+    mmap window for the read side of the upserts.
+    WAL is skipped for in-memory databases, which have no file to log beside.
+    """
+    db_file = conn.execute("PRAGMA database_list").fetchone()[2]
+    if db_file:
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_BYTES}")
+    conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KIB}")
+
+
+def _defer_secondary_indexes(conn: sqlite3.Connection) -> list[str]:
+    """
+    Drop the non-unique indexes on inspections and return their names.
+    Unique indexes stay: the upsert's ON CONFLICT needs them.
+    Each CREATE statement is saved in deferred_indexes before its DROP, so an
+    interrupted load is repaired by the next ensure_inspection_columns.
+    """
+    names = []
+    for _, name, unique, origin, _ in conn.execute("PRAGMA index_list(inspections)").fetchall():
+        if unique or origin != "c":
+            continue
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone()[0]
+        conn.execute("INSERT OR REPLACE INTO deferred_indexes (name, sql) VALUES (?, ?)", (name, sql))
+        conn.commit()
+        conn.execute(f'DROP INDEX "{name}"')
+        conn.commit()
+        names.append(name)
+    return names
+
+
+def _restore_deferred_indexes(conn: sqlite3.Connection) -> None:
+    """Rebuild indexes recorded by _defer_secondary_indexes (one sorted build each)."""
+    pending = conn.execute("SELECT name, sql FROM deferred_indexes").fetchall()
+    if not pending:
+        return
+    for name, sql in pending:
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone() is None:
+            conn.execute(sql)
+        conn.execute("DELETE FROM deferred_indexes WHERE name = ?", (name,))
+        conn.commit()
+    logger.info(f"Rebuilt {len(pending)} deferred inspections indexes")
+
+
+def _flush_upserts(conn: sqlite3.Connection, pending: list[dict]) -> tuple[int, int, int]:
+    """
+    Write buffered detail records in one transaction and clear the buffer.
+    If the batch fails, retry record by record so one bad row only costs itself.
+    BEGIN IMMEDIATE takes the write lock up front, so a batch never has to
+    upgrade a read lock (and hit SQLITE_BUSY) halfway through.
+    Returns (inserted, updated, failed).
+    """
+    errors = 0
+    if not pending:
+        return 0, 0, errors
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        inserted, updated = upsert_inspections(conn, pending)
+        conn.execute("COMMIT")
+    except Exception as e:
+        conn.rollback()
+        logger.warning(f"Batch upsert failed ({e}); retrying {len(pending)} records individually")
+        inserted = updated = 0
+        conn.execute("BEGIN IMMEDIATE")
+        for insp in pending:
+            try:
+                is_new, is_updated = upsert_inspection(conn, insp)
+                inserted += is_new
+                updated += is_updated
+            except Exception as row_error:
+                logger.error(f"Error processing {insp.get('detail_url') or insp.get('source_url')}: {row_error}")
+                errors += 1
+        conn.execute("COMMIT")
+    pending.clear()
+    return inserted, updated, errors
+
+
+def _is_utf8_body(encoding: Optional[str]) -> bool:
+    """True when the body bytes equal response.text re-encoded as UTF-8."""
+    try:
+        return bool(encoding) and codecs.lookup(encoding).name in ("utf-8", "ascii")
+    except LookupError:
+        return False
+
+
+def parse_detail_response(response: requests.Response, url: str) -> dict:
+    """
+    parse_inspection_detail() for a fetched page. UTF-8 bodies are parsed and
+    hashed as bytes, skipping the response.text decode. Any other charset goes
+    through response.text, so raw_hash stays the sha256 of the UTF-8 text, as
+    it always has been.
+    """
+    if _is_utf8_body(response.encoding):
+        return parse_inspection_detail(response.content, url, encoding=response.encoding)
+    return parse_inspection_detail(response.text, url)
+
+
+def _fetch_detail(session: requests.Session, insp: dict, position: int, total: int) -> Optional[dict]:
+    """
+    Fetch and parse one detail page on a worker thread.
+    Returns the parsed fields, or None if there is no URL or the fetch failed.
+    """
+    detail_url = insp.get("detail_url")
+    if not detail_url:
+        return None
+    
+    logger.info(f"Fetching detail {position}/{total}: {insp.get('activity_nr')}")
+    response = fetch_with_retry(session, detail_url)
+    if not response:
+        return None
+    return parse_detail_response(response, detail_url)
 
 
 def run_ingestion(
@@ -980,6 +1545,7 @@ def run_ingestion(
     since_days: int,
     states: list[str],
     max_details: int,
+    session: Optional[requests.Session] = None,
 ) -> dict:
     """
     Main ingestion routine.
@@ -997,7 +1563,9 @@ def run_ingestion(
     since_date = (datetime.now() - timedelta(days=since_days)).strftime("%Y-%m-%d")
     
     # Connect to database
-    conn = sqlite3.connect(db_path)
+    # Autocommit: batches open their own BEGIN IMMEDIATE ... COMMIT (see _flush_upserts)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    configure_connection(conn)
     cursor = conn.cursor()
     ensure_inspection_columns(conn)
     
@@ -1010,72 +1578,76 @@ def run_ingestion(
     log_id = cursor.lastrowid
     conn.commit()
     
-    session = get_session()
-    all_inspections = []
+    session = session or get_session()
+    deferred_indexes = []
+    # Dedupe by activity_nr as results arrive (may appear in multiple states)
+    seen_activity_nrs = set()
+    unique_inspections = []
+    
+    def flush(pending):
+        inserted, updated, errors = _flush_upserts(conn, pending)
+        stats["rows_inserted"] += inserted
+        stats["rows_updated"] += updated
+        stats["errors_count"] += errors
     
     try:
-        # Search each state
-        for state in states:
-            try:
-                results = search_osha_inspections(session, state, since_date)
-                all_inspections.extend(results)
-                stats["results_found"] += len(results)
-            except Exception as e:
-                logger.error(f"Error searching state {state}: {e}")
-                stats["errors_count"] += 1
-        
-        # Dedupe by activity_nr (may appear in multiple states)
-        seen_activity_nrs = set()
-        unique_inspections = []
-        
-        for insp in all_inspections:
-            activity_nr = insp.get("activity_nr")
-            if activity_nr and activity_nr not in seen_activity_nrs:
-                seen_activity_nrs.add(activity_nr)
-                unique_inspections.append(insp)
+        # Search every state/term pair concurrently, then merge per state in order
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+            pending = [(state, _submit_state_search(pool, session, state, since_date)) for state in states]
+            for state, futures in pending:
+                try:
+                    results = _collect_state_search(state, futures)
+                    stats["results_found"] += len(results)
+                    for insp in results:
+                        activity_nr = insp.get("activity_nr")
+                        if activity_nr and activity_nr not in seen_activity_nrs:
+                            seen_activity_nrs.add(activity_nr)
+                            unique_inspections.append(insp)
+                except Exception as e:
+                    logger.error(f"Error searching state {state}: {e}")
+                    stats["errors_count"] += 1
         
         logger.info(f"Found {len(unique_inspections)} unique inspections to process")
         
         # Fetch detail pages (up to max)
         details_to_fetch = unique_inspections[:max_details]
+        pending = []
+        total = len(details_to_fetch)
         
-        for i, insp in enumerate(details_to_fetch):
-            detail_url = insp.get("detail_url")
-            if not detail_url:
-                continue
-            
-            logger.info(f"Fetching detail {i+1}/{len(details_to_fetch)}: {insp.get('activity_nr')}")
-            
-            try:
-                response = fetch_with_retry(session, detail_url)
-                if response:
+        # First population of a fresh DB: build secondary indexes once at the end
+        # instead of updating them row by row
+        if total > BULK_LOAD_MIN_ROWS and cursor.execute("SELECT 1 FROM inspections LIMIT 1").fetchone() is None:
+            deferred_indexes = _defer_secondary_indexes(conn)
+        
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+            futures = [
+                pool.submit(_fetch_detail, session, insp, i + 1, total)
+                for i, insp in enumerate(details_to_fetch)
+            ]
+            # Single writer: results are consumed here in order; only this thread touches SQLite
+            for i, (insp, future) in enumerate(zip(details_to_fetch, futures)):
+                try:
+                    detail_data = future.result()
+                    if detail_data is None:
+                        continue
                     stats["details_fetched"] += 1
                     
-                    # Parse detail page
-                    detail_data = parse_inspection_detail(response.text, detail_url)
-                    
-                    # Merge with search results (detail is canonical)
-                    merged = {**insp, **detail_data}
-                    
-                    # Upsert to database
-                    is_new, is_updated = upsert_inspection(conn, merged)
+                    # Merge into the search result in place (detail is canonical);
+                    # each search row is written once, so no copy is needed
+                    insp.update(detail_data)
+                    pending.append(insp)
                     
-                    if is_new:
-                        stats["rows_inserted"] += 1
-                    elif is_updated:
-                        stats["rows_updated"] += 1
-                    
-                    # Commit periodically
-                    if (i + 1) % 10 == 0:
-                        conn.commit()
-                        logger.info(f"Progress: {i+1}/{len(details_to_fetch)} details processed")
+                    # Upsert to database in batches, one transaction each
+                    if len(pending) >= UPSERT_BATCH_SIZE:
+                        flush(pending)
+                        logger.info(f"Progress: {i+1}/{total} details processed")
                         
-            except Exception as e:
-                logger.error(f"Error processing {detail_url}: {e}")
-                stats["errors_count"] += 1
+                except Exception as e:
+                    logger.error(f"Error processing {insp.get('detail_url')}: {e}")
+                    stats["errors_count"] += 1
         
-        # Final commit
-        conn.commit()
+        # Final batch
+        flush(pending)
         
         # Update log
         cursor.execute(
@@ -1106,12 +1678,20 @@ def run_ingestion(
         raise
         
     finally:
-        conn.close()
+        try:
+            if deferred_indexes:
+                _restore_deferred_indexes(conn)
+        finally:
+            conn.close()
     
     return stats
 
 
-def refresh_invalid_records(db_path: str, max_details: int) -> dict:
+def refresh_invalid_records(
+    db_path: str,
+    max_details: int,
+    session: Optional[requests.Session] = None,
+) -> dict:
     """
     Re-fetch and re-parse records that have parse_invalid=1.
     Returns stats dict.
@@ -1124,17 +1704,18 @@ def refresh_invalid_records(db_path: str, max_details: int) -> dict:
         "errors": 0,
     }
     
-    conn = sqlite3.connect(db_path)
+    # Autocommit: batches open their own BEGIN IMMEDIATE ... COMMIT (see _flush_upserts)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    configure_connection(conn)
     cursor = conn.cursor()
+    ensure_inspection_columns(conn)
     
-    # Find records with parse_invalid=1 or NULL establishment_name
+    # Find records with parse_invalid=1, NULL or ID-like establishment_name
+    # (needs_refresh; served by its partial index instead of a table scan)
     cursor.execute("""
         SELECT activity_nr, source_url 
         FROM inspections 
-        WHERE parse_invalid = 1 
-           OR establishment_name IS NULL 
-           OR establishment_name LIKE '%%.015'
-           OR establishment_name LIKE '%%.%'
+        WHERE needs_refresh = 1
         LIMIT ?
     """, (max_details,))
     
@@ -1148,7 +1729,8 @@ def refresh_invalid_records(db_path: str, max_details: int) -> dict:
     
     logger.info(f"Found {len(invalid_records)} invalid records to refresh")
     
-    session = get_session()
+    session = session or get_session()
+    pending = []
     
     for i, (activity_nr, source_url) in enumerate(invalid_records):
         if not source_url:
@@ -1163,11 +1745,11 @@ def refresh_invalid_records(db_path: str, max_details: int) -> dict:
                 stats["refreshed"] += 1
                 
                 # Re-parse
-                detail_data = parse_inspection_detail(response.text, source_url)
+                detail_data = parse_detail_response(response, source_url)
                 detail_data["activity_nr"] = activity_nr
                 
-                # Upsert (will update existing)
-                is_new, is_updated = upsert_inspection(conn, detail_data)
+                # Queue the upsert (will update existing); written in batches below
+                pending.append(detail_data)
                 
                 # Check if now valid
                 if validate_establishment_name(detail_data.get("establishment_name")):
@@ -1177,15 +1759,15 @@ def refresh_invalid_records(db_path: str, max_details: int) -> dict:
                     stats["still_invalid"] += 1
                     logger.warning(f"Still invalid: {activity_nr}")
                 
-                if (i + 1) % 10 == 0:
-                    conn.commit()
+                if len(pending) >= UPSERT_BATCH_SIZE:
+                    stats["errors"] += _flush_upserts(conn, pending)[2]
                     logger.info(f"Progress: {i+1}/{len(invalid_records)} refreshed")
                     
         except Exception as e:
             logger.error(f"Error refreshing {activity_nr}: {e}")
             stats["errors"] += 1
     
-    conn.commit()
+    stats["errors"] += _flush_upserts(conn, pending)[2]
     conn.close()
     
     return stats
@@ -1,9 +1,10 @@
+import functools
 import json
 import os
 import re
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
 
 DEFAULT_TERRITORIES = {
@@ -58,6 +59,9 @@ def _parse_datetime(value: Any) -> datetime:
     return datetime.min
 
 
+_MIN_SORT_VALUE = datetime.min.replace(tzinfo=timezone.utc).timestamp()
+
+
 def _coerce_datetime_aware_utc(dt: datetime | None) -> datetime | None:
     if dt is None:
         return None
@@ -66,18 +70,38 @@ def _coerce_datetime_aware_utc(dt: datetime | None) -> datetime | None:
     return dt.astimezone(timezone.utc)
 
 
-def _normalized_datetime_sort_value(value: Any) -> datetime:
-    dt = _coerce_datetime_aware_utc(_parse_datetime(value))
-    if dt is None:
-        return datetime.min.replace(tzinfo=timezone.utc)
-    return dt
+def _normalized_datetime_sort_value(value: Any) -> float:
+    # UTC epoch seconds: compares like the aware datetime but as a plain float.
+    if not value:
+        return _MIN_SORT_VALUE
+    return _datetime_sort_value_from_text(str(value))
+
+
+@functools.lru_cache(maxsize=8192)
+def _datetime_sort_value_from_text(text: str) -> float:
+    # Batches repeat the same timestamps (one date_opened per inspection, DB defaults).
+    dt = _coerce_datetime_aware_utc(_parse_datetime(text))
+    return dt.timestamp()
 
 
 def load_territory_definitions(path: str = "territories.json") -> dict[str, dict[str, Any]]:
+    # Parsed once per file version; the (mtime, size) stamp picks up edits,
+    # including merge_territory_definition writes.
+    json_path = os.path.abspath(path)
+    try:
+        stat = os.stat(json_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        stamp = None
+    return dict(_load_territory_definitions_cached(json_path, stamp))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_territory_definitions_cached(path: str, stamp: tuple[int, int] | None) -> dict[str, dict[str, Any]]:
     definitions = dict(DEFAULT_TERRITORIES)
     json_path = Path(path)
 
-    if json_path.exists():
+    if stamp is not None and json_path.exists():
         with open(json_path, "r", encoding="utf-8") as f:
             loaded = json.load(f)
         if isinstance(loaded, dict):
@@ -114,56 +138,68 @@ def apply_content_filter(leads: list[dict], content_filter: str | None) -> tuple
         return list(leads), 0
 
     min_score = 10 if mode == CONTENT_FILTER_HIGH_ONLY else 6
-    filtered = [lead for lead in leads if int(lead.get("lead_score") or 0) >= min_score]
+    filtered = list(_iter_content_filter(leads, min_score))
     excluded = len(leads) - len(filtered)
     return filtered, excluded
 
 
+def _iter_content_filter(leads: Iterable[dict], min_score: int) -> Iterator[dict]:
+    # Streaming core of apply_content_filter, for chaining without an intermediate list.
+    for lead in leads:
+        if int(lead.get("lead_score") or 0) >= min_score:
+            yield lead
+
+
+def _dedupe_rank(lead: dict) -> tuple[int, float, float, float]:
+    return (
+        int(lead.get("lead_score") or 0),
+        _normalized_datetime_sort_value(lead.get("first_seen_at")),
+        _normalized_datetime_sort_value(lead.get("last_seen_at")),
+        _normalized_datetime_sort_value(lead.get("date_opened")),
+    )
+
+
 def dedupe_by_activity_nr(leads: list[dict]) -> tuple[list[dict], int]:
-    by_key: dict[str, dict] = {}
+    # Each lead's rank is parsed once and kept next to it for both the
+    # winner comparison and the final ordering.
+    by_key: dict[str, tuple[tuple[int, float, float, float], dict]] = {}
 
     for lead in leads:
         key = str(lead.get("lead_key") or lead.get("activity_nr") or lead.get("lead_id") or "").strip()
         if not key:
             continue
 
+        candidate_key = _dedupe_rank(lead)
         current = by_key.get(key)
-        if not current:
-            by_key[key] = lead
-            continue
+        if not current or candidate_key > current[0]:
+            by_key[key] = (candidate_key, lead)
 
-        current_key = (
-            int(current.get("lead_score") or 0),
-            _normalized_datetime_sort_value(current.get("first_seen_at")),
-            _normalized_datetime_sort_value(current.get("last_seen_at")),
-            _normalized_datetime_sort_value(current.get("date_opened")),
-        )
-        candidate_key = (
-            int(lead.get("lead_score") or 0),
-            _normalized_datetime_sort_value(lead.get("first_seen_at")),
-            _normalized_datetime_sort_value(lead.get("last_seen_at")),
-            _normalized_datetime_sort_value(lead.get("date_opened")),
-        )
-
-        if candidate_key > current_key:
-            by_key[key] = lead
-
-    deduped = sorted(
-        by_key.values(),
-        key=lambda row: (
-            int(row.get("lead_score") or 0),
-            _normalized_datetime_sort_value(row.get("date_opened")),
-            _normalized_datetime_sort_value(row.get("first_seen_at")),
-        ),
-        reverse=True,
-    )
+    # Ordered by (lead_score, date_opened, first_seen_at)
+    ranked = sorted(by_key.values(), key=lambda item: (item[0][0], item[0][3], item[0][1]), reverse=True)
+    deduped = [lead for _, lead in ranked]
 
     removed = len(leads) - len(deduped)
     return deduped, removed
 
 
-def _matches_any(text: str, patterns: list[str]) -> bool:
-    return any(re.search(pattern, text, flags=re.IGNORECASE) for pattern in patterns)
+# Group numbers shift once patterns are joined, so these can't share an alternation
+_BACKREFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+@functools.lru_cache(maxsize=64)
+def _pattern_matcher(patterns: tuple[str, ...]) -> Callable[[str], Any] | None:
+    # Keyed by the pattern strings, so definitions loaded from JSON or the DB share one compile.
+    # The patterns are fused into one alternation (one scan per text instead of one per pattern);
+    # patterns that can't be joined (inline global flags, backreferences) are matched one by one.
+    if not patterns:
+        return None
+    try:
+        if not any(_BACKREFERENCE_RE.search(pattern) for pattern in patterns):
+            return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE).search
+    except re.error:
+        pass
+    compiled = tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+    return lambda text: any(pattern.search(text) for pattern in compiled)
 
 
 def _normalize_location_text(text: str) -> str:
@@ -189,50 +225,61 @@ def filter_by_territory(
         raise ValueError(f"Unknown territory_code='{territory_code}'")
 
     territory = defs[territory_code]
-    states = [s.upper() for s in territory.get("states", [])]
-    office_patterns = territory.get("office_patterns", [])
-    fallback_patterns = territory.get("fallback_city_patterns", [])
+    states = {s.upper() for s in territory.get("states", [])}
+    office_match = _pattern_matcher(tuple(territory.get("office_patterns", [])))
+    fallback_match = _pattern_matcher(tuple(territory.get("fallback_city_patterns", [])))
 
-    filtered: list[dict] = []
     stats = {
         "excluded_state": 0,
         "excluded_territory": 0,
         "matched_by_office": 0,
         "matched_by_fallback": 0,
     }
+    filtered = list(_iter_territory(leads, states, office_match, fallback_match, stats))
+    return filtered, stats
 
+
+def _iter_territory(
+    leads: Iterable[dict],
+    states: set[str],
+    office_match: Callable[[str], Any] | None,
+    fallback_match: Callable[[str], Any] | None,
+    stats: dict[str, int],
+) -> Iterator[dict]:
+    # Streaming core of filter_by_territory; stats are updated as leads are consumed.
     for lead in leads:
         state = str(lead.get("site_state") or "").upper()
         if states and state not in states:
             stats["excluded_state"] += 1
             continue
 
-        office_text = " ".join(
-            str(lead.get(field) or "")
-            for field in ("area_office", "office", "osha_office")
-        )
+        # Only build the match texts for territories that have patterns for them
+        if office_match:
+            office_text = " ".join(
+                str(lead.get(field) or "")
+                for field in ("area_office", "office", "osha_office")
+            )
 
-        if office_text.strip() and office_patterns and _matches_any(office_text, office_patterns):
-            filtered.append(lead)
-            stats["matched_by_office"] += 1
-            continue
+            if office_text.strip() and office_match(office_text):
+                stats["matched_by_office"] += 1
+                yield lead
+                continue
 
         # Equivalent fallback field: city when office metadata is absent in source record.
-        fallback_fields = [
-            lead.get("site_city"),
-            lead.get("mail_city"),
-            lead.get("site_address1"),
-        ]
-        city_text = " ".join(_normalize_location_text(value) for value in fallback_fields if value)
-        if fallback_patterns and _matches_any(city_text, fallback_patterns):
-            filtered.append(lead)
-            stats["matched_by_fallback"] += 1
-            continue
+        if fallback_match:
+            fallback_fields = [
+                lead.get("site_city"),
+                lead.get("mail_city"),
+                lead.get("site_address1"),
+            ]
+            city_text = " ".join(_normalize_location_text(value) for value in fallback_fields if value)
+            if fallback_match(city_text):
+                stats["matched_by_fallback"] += 1
+                yield lead
+                continue
 
         stats["excluded_territory"] += 1
 
-    return filtered, stats
-
 
 def merge_territory_definition(code: str, definition: dict, path: str = "territories.json") -> None:
     json_path = Path(path)
@@ -12,17 +12,19 @@ from __future__ import annotations
 
 import argparse
 import csv
+import functools
 import hashlib
 import json
 import os
 import re
 import sqlite3
 import sys
-from dataclasses import dataclass
+import zlib
+from dataclasses import dataclass, replace
 from datetime import date, datetime, time, timedelta, timezone
 from email.mime.text import MIMEText
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 try:
     from zoneinfo import ZoneInfo
@@ -54,6 +56,59 @@ TERRITORY_ALIASES = {
 
 _EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 _TIME_RE = re.compile(r"^(?P<h>\d{2}):(?P<m>\d{2})$")
+_RECIPIENT_SCAN_RE = re.compile(
+    r"\s*(?P<email>[^@\s;,]+@[^@\s;,]+\.[^@\s;,]+)?\s*(?P<rest>[^;,]*)(?:[;,]|\Z)"
+)
+_SUB_KEY_SANITIZE_RE = re.compile(r"[^A-Za-z0-9_-]+")
+_SCHEMA_OBJECT_RE = re.compile(
+    r"\bCREATE\s+(?:UNIQUE\s+)?(?:TABLE|INDEX|TRIGGER|VIEW)\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE
+)
+
+
+# Statement text is kept in constants so sqlite3's per-connection statement cache
+# sees the same SQL each call.
+_UPSERT_TERRITORY_SQL = """
+    INSERT INTO territories
+        (territory_code, description, states_json, office_patterns_json, fallback_city_patterns_json, active)
+    VALUES (?, ?, ?, ?, ?, 1)
+    ON CONFLICT(territory_code) DO UPDATE SET
+        description=excluded.description,
+        states_json=excluded.states_json,
+        office_patterns_json=excluded.office_patterns_json,
+        fallback_city_patterns_json=excluded.fallback_city_patterns_json,
+        active=1
+    WHERE territories.description IS NOT excluded.description
+       OR territories.states_json IS NOT excluded.states_json
+       OR territories.office_patterns_json IS NOT excluded.office_patterns_json
+       OR territories.fallback_city_patterns_json IS NOT excluded.fallback_city_patterns_json
+       OR territories.active IS NOT 1
+"""
+
+_UPSERT_SUBSCRIBER_SQL = """
+    INSERT INTO subscribers
+        (subscriber_key, display_name, email, recipients_json, territory_code, content_filter, include_low_fallback,
+         trial_length_days, trial_started_at, trial_ends_at, active, send_enabled,
+         send_time_local, timezone, customer_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, 1, ?, ?, ?)
+    ON CONFLICT(subscriber_key) DO UPDATE SET
+        display_name=excluded.display_name,
+        email=excluded.email,
+        recipients_json=excluded.recipients_json,
+        territory_code=excluded.territory_code,
+        content_filter=excluded.content_filter,
+        include_low_fallback=excluded.include_low_fallback,
+        active=1,
+        send_enabled=1,
+        send_time_local=excluded.send_time_local,
+        timezone=excluded.timezone,
+        customer_id=excluded.customer_id,
+        updated_at=CURRENT_TIMESTAMP
+    WHERE lower(trim(subscribers.email)) = excluded.email
+    RETURNING subscriber_key
+"""
+
+_SUBSCRIBER_KEY_FOR_EMAIL_SQL = "SELECT subscriber_key FROM subscribers WHERE lower(email) = ? LIMIT 1"
+_SUBSCRIBER_EMAIL_FOR_KEY_SQL = "SELECT email FROM subscribers WHERE subscriber_key = ? LIMIT 1"
 
 
 class OnboardingError(RuntimeError):
@@ -76,18 +131,57 @@ class OnboardingRequest:
     trial_length_days: int
 
 
+@dataclass(frozen=True)
+class SenderConfig:
+    smtp_host: str
+    smtp_port: int
+    smtp_user: str
+    smtp_pass: str
+    from_email: str
+    from_name: str
+    reply_to: str
+    brand_name: str
+    mailing_address: str
+    operator_email: str
+
+
 def _repo_root() -> Path:
     return Path(__file__).resolve().parent
 
 
-def _load_env(repo_root: Path) -> None:
+@functools.lru_cache(maxsize=1)
+def _load_env(dotenv_path: str) -> None:
+    # override=False makes a second load a no-op, so parse the file once per process.
     if load_dotenv is None:
         return
-    dotenv_path = repo_root / ".env"
-    if dotenv_path.exists():
+    if os.path.exists(dotenv_path):
         load_dotenv(dotenv_path=dotenv_path, override=False)
 
 
+@functools.lru_cache(maxsize=1)
+def _sender_config() -> SenderConfig:
+    """
+    Resolve sender/brand settings from the environment once per process.
+    Must run after _load_env so .env values are visible.
+    """
+    env = os.environ
+    smtp_user = env.get("SMTP_USER", "").strip()
+    brand_name = env.get("BRAND_NAME", "").strip() or "MicroFlowOps"
+    reply_to_env = env.get("REPLY_TO_EMAIL", "").strip()
+    return SenderConfig(
+        smtp_host=env.get("SMTP_HOST", "smtp.zoho.com").strip(),
+        smtp_port=int(env.get("SMTP_PORT", "587")),
+        smtp_user=smtp_user,
+        smtp_pass=env.get("SMTP_PASS", "").strip(),
+        from_email=env.get("FROM_EMAIL", "").strip() or smtp_user,
+        from_name=env.get("FROM_NAME", "").strip() or brand_name,
+        reply_to=reply_to_env or "support@microflowops.com",
+        brand_name=brand_name,
+        mailing_address=env.get("MAILING_ADDRESS", "").strip(),
+        operator_email=env.get("OPERATOR_EMAIL", "").strip() or reply_to_env or "support@microflowops.com",
+    )
+
+
 def _read_text(path: str) -> str:
     return Path(path).read_text(encoding="utf-8")
 
@@ -99,51 +193,59 @@ def _parse_block(text: str) -> dict[str, str]:
     values: dict[str, str] = {}
     for raw in text.splitlines():
         line = raw.strip()
-        if not line or line.startswith("#"):
+        if not line or line[0] == "#":
             continue
-        if "=" not in line:
+        k, sep, v = line.partition("=")
+        if not sep:
             raise OnboardingError(f"Invalid line (expected KEY=VALUE): {raw}")
-        k, v = line.split("=", 1)
         key = k.strip().upper()
-        val = v.strip()
         if not key:
             raise OnboardingError(f"Invalid line (empty key): {raw}")
-        values[key] = val
+        values[key] = v.strip()
     return values
 
 
 def _normalize_recipients(value: str) -> list[str]:
     if not value.strip():
         return []
-    parts = re.split(r"[;,]", value)
-    cleaned: list[str] = []
-    seen: set[str] = set()
-    for part in parts:
-        email = part.strip().lower()
-        if not email:
+    # dict.fromkeys keeps first-seen order; validation still fails on the first bad address.
+    return list(dict.fromkeys(_scan_recipients(value)))
+
+
+def _scan_recipients(value: str) -> Iterator[str]:
+    """
+    Tokenize and validate in one regex pass: each match is one separator-delimited
+    token, valid when the address group covers it (same rule as _EMAIL_RE).
+    """
+    for m in _RECIPIENT_SCAN_RE.finditer(value):
+        email, rest = m.group("email"), m.group("rest")
+        if email and not rest:
+            yield email.lower()
             continue
-        if not _EMAIL_RE.match(email):
-            raise OnboardingError(f"Invalid recipient email: {email}")
-        if email not in seen:
-            seen.add(email)
-            cleaned.append(email)
-    return cleaned
+        token = m.group(0).rstrip(";,").strip()
+        if token:
+            raise OnboardingError(f"Invalid recipient email: {token.lower()}")
 
 
 def _validate_send_time_local(value: str) -> str:
     text = (value or "").strip()
     if not text:
         return DEFAULT_SEND_TIME_LOCAL
-    m = _TIME_RE.match(text)
-    if not m:
+    # Slice check equivalent to _TIME_RE (isdecimal matches \d) without a regex call.
+    if not (len(text) == 5 and text[2] == ":" and text[:2].isdecimal() and text[3:].isdecimal()):
         raise OnboardingError("SEND_TIME_LOCAL must be HH:MM (24-hour), e.g. 08:00")
-    hour = int(m.group("h"))
-    minute = int(m.group("m"))
+    hour = int(text[:2])
+    minute = int(text[3:])
     if not (0 <= hour <= 23 and 0 <= minute <= 59):
         raise OnboardingError("SEND_TIME_LOCAL out of range (expected 00:00..23:59)")
     return f"{hour:02d}:{minute:02d}"
 
 
+@functools.lru_cache(maxsize=64)
+def _zone(tz_name: str):
+    return ZoneInfo(tz_name)
+
+
 def _validate_timezone(value: str) -> str:
     tz_name = (value or "").strip() or DEFAULT_TIMEZONE
     if ZoneInfo is None:
@@ -152,7 +254,7 @@ def _validate_timezone(value: str) -> str:
             raise OnboardingError("TIMEZONE must be an IANA name (e.g. America/Chicago)")
         return tz_name
     try:
-        ZoneInfo(tz_name)
+        _zone(tz_name)
     except Exception as exc:
         raise OnboardingError(f"Invalid TIMEZONE '{tz_name}': {exc}") from exc
     return tz_name
@@ -191,91 +293,82 @@ def _generate_subscriber_key(territory_code: str, primary_email: str) -> str:
     return f"sub_{territory_code.lower()}_{digest}"
 
 
+def _schema_stamp(script: str) -> int:
+    # PRAGMA user_version is a signed 32-bit int; keep the checksum positive and non-zero.
+    return (zlib.crc32(script.encode("utf-8")) & 0x7FFFFFFF) or 1
+
+
 def _ensure_schema(db_path: str, schema_path: str) -> None:
+    """
+    Apply schema.sql unless the DB is already stamped (PRAGMA user_version) with
+    this exact script and still has every table, index and trigger it creates.
+    Editing schema.sql changes the stamp; a dropped object triggers a re-apply.
+    """
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    script = Path(schema_path).read_text(encoding="utf-8")
+    stamp = _schema_stamp(script)
     conn = sqlite3.connect(db_path)
     try:
-        with open(schema_path, "r", encoding="utf-8") as f:
-            conn.executescript(f.read())
+        if conn.execute("PRAGMA user_version").fetchone()[0] == stamp:
+            present = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+            if set(_SCHEMA_OBJECT_RE.findall(script)) <= present:
+                return
+        conn.executescript(script)
+        conn.execute(f"PRAGMA user_version = {stamp}")
         conn.commit()
     finally:
         conn.close()
 
 
-def _upsert_territory_from_json(conn: sqlite3.Connection, territory_code: str) -> None:
-    defs = load_territory_definitions()
-    terr = defs.get(territory_code)
+def _connect_for_writes(db_path: str) -> sqlite3.Connection:
+    # Autocommit connection: main() wraps the onboarding writes in one
+    # BEGIN IMMEDIATE ... COMMIT so the run pays a single WAL sync.
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def _territory_row(territory_code: str) -> tuple[str, str, str, str]:
+    """
+    (description, states_json, office_patterns_json, fallback_city_patterns_json)
+    for a territory in territories.json.
+    """
+    terr = load_territory_definitions().get(territory_code)
     if not terr:
         raise OnboardingError(f"Territory not found in territories.json: {territory_code}")
-    conn.execute(
-        """
-        INSERT INTO territories
-            (territory_code, description, states_json, office_patterns_json, fallback_city_patterns_json, active)
-        VALUES (?, ?, ?, ?, ?, 1)
-        ON CONFLICT(territory_code) DO UPDATE SET
-            description=excluded.description,
-            states_json=excluded.states_json,
-            office_patterns_json=excluded.office_patterns_json,
-            fallback_city_patterns_json=excluded.fallback_city_patterns_json,
-            active=1
-        """,
-        (
-            territory_code,
-            (terr.get("description") or "").strip(),
-            json.dumps([str(s).upper() for s in (terr.get("states") or [])]),
-            json.dumps(list(terr.get("office_patterns") or [])),
-            json.dumps(list(terr.get("fallback_city_patterns") or [])),
-        ),
+    return (
+        (terr.get("description") or "").strip(),
+        json.dumps([str(s).upper() for s in (terr.get("states") or [])]),
+        json.dumps(list(terr.get("office_patterns") or [])),
+        json.dumps(list(terr.get("fallback_city_patterns") or [])),
     )
 
 
-def _existing_subscriber_key_for_email(conn: sqlite3.Connection, email: str) -> str | None:
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT subscriber_key FROM subscribers WHERE lower(email) = ? LIMIT 1",
-        (email.lower(),),
-    )
-    row = cur.fetchone()
-    return str(row[0]) if row else None
+def _upsert_territory_from_json(conn: sqlite3.Connection, territory_code: str) -> None:
+    conn.execute(_UPSERT_TERRITORY_SQL, (territory_code, *_territory_row(territory_code)))
 
 
-def _subscriber_exists(conn: sqlite3.Connection, subscriber_key: str) -> bool:
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT 1 FROM subscribers WHERE subscriber_key = ? LIMIT 1",
-        (subscriber_key,),
-    )
-    return cur.fetchone() is not None
+def _existing_subscriber_key_for_email(conn: sqlite3.Connection, email: str) -> str | None:
+    row = conn.execute(_SUBSCRIBER_KEY_FOR_EMAIL_SQL, (email.lower(),)).fetchone()
+    return str(row[0]) if row else None
 
 
 def _upsert_subscriber(conn: sqlite3.Connection, req: OnboardingRequest) -> None:
+    """
+    Insert or update the subscriber in one statement. An existing subscriber_key is
+    only updated when it belongs to the same primary email (avoid accidental
+    reassignment); otherwise nothing is returned and OnboardingError is raised.
+    """
     start = date.today()
     end = start + timedelta(days=int(req.trial_length_days))
     recipients_json = json.dumps(req.recipients, ensure_ascii=True)
     primary_email = req.recipients[0].lower()
 
     # Preserve trial dates on update unless operator explicitly resets them (not supported yet).
-    conn.execute(
-        """
-        INSERT INTO subscribers
-            (subscriber_key, display_name, email, recipients_json, territory_code, content_filter, include_low_fallback,
-             trial_length_days, trial_started_at, trial_ends_at, active, send_enabled,
-             send_time_local, timezone, customer_id)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, 1, ?, ?, ?)
-        ON CONFLICT(subscriber_key) DO UPDATE SET
-            display_name=excluded.display_name,
-            email=excluded.email,
-            recipients_json=excluded.recipients_json,
-            territory_code=excluded.territory_code,
-            content_filter=excluded.content_filter,
-            include_low_fallback=excluded.include_low_fallback,
-            active=1,
-            send_enabled=1,
-            send_time_local=excluded.send_time_local,
-            timezone=excluded.timezone,
-            customer_id=excluded.customer_id,
-            updated_at=CURRENT_TIMESTAMP
-        """,
+    row = conn.execute(
+        _UPSERT_SUBSCRIBER_SQL,
         (
             req.subscriber_key,
             req.display_name,
@@ -283,7 +376,7 @@ def _upsert_subscriber(conn: sqlite3.Connection, req: OnboardingRequest) -> None
             recipients_json,
             req.territory_code,
             req.content_filter,
-            1 if req.include_low_fallback else 0,
+            int(req.include_low_fallback),
             int(req.trial_length_days),
             start.isoformat(),
             end.isoformat(),
@@ -291,14 +384,20 @@ def _upsert_subscriber(conn: sqlite3.Connection, req: OnboardingRequest) -> None
             req.timezone,
             req.subscriber_key,
         ),
-    )
+    ).fetchone()
+    if row is None:
+        other = conn.execute(_SUBSCRIBER_EMAIL_FOR_KEY_SQL, (req.subscriber_key,)).fetchone()
+        raise OnboardingError(
+            f"subscriber_key '{req.subscriber_key}' already exists for a different email ({other[0] if other else ''}). "
+            "Provide SUBSCRIBER_KEY explicitly or use a different primary recipient."
+        )
 
 
 def _next_scheduled_run_local(send_time_local: str, tz_name: str) -> tuple[str, str]:
     if ZoneInfo is None:
         # Fallback: can't reliably compute; return generic.
         return "next scheduled run", f"{send_time_local} {tz_name}"
-    tz = ZoneInfo(tz_name)
+    tz = _zone(tz_name)
     now = datetime.now(tz)
     hh, mm = [int(x) for x in send_time_local.split(":")]
     candidate = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
@@ -308,50 +407,65 @@ def _next_scheduled_run_local(send_time_local: str, tz_name: str) -> tuple[str,
     return candidate.strftime("%Y-%m-%d"), candidate.strftime("%H:%M %Z")
 
 
-def _is_suppressed(conn: sqlite3.Connection, email: str) -> bool:
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT 1 FROM suppression_list WHERE lower(email_or_domain) = ? LIMIT 1",
-        (email.lower(),),
-    )
-    if cur.fetchone():
-        return True
-    domain = email.split("@")[-1].lower()
-    cur.execute(
-        "SELECT 1 FROM suppression_list WHERE lower(email_or_domain) = ? LIMIT 1",
-        (domain,),
-    )
-    return cur.fetchone() is not None
+def _suppressed_recipients(conn: sqlite3.Connection, emails: list[str]) -> list[str]:
+    """
+    Return the recipients (in order) blocked by suppression_list, by exact email or domain.
+    """
+    if not emails:
+        return []
+    lowered = [email.lower() for email in emails]
+    keys = list(dict.fromkeys(lowered + [email.split("@")[-1] for email in lowered]))
+    placeholders = ",".join("?" * len(keys))
+    rows = conn.execute(
+        f"SELECT lower(email_or_domain) FROM suppression_list WHERE lower(email_or_domain) IN ({placeholders})",
+        keys,
+    ).fetchall()
+    blocked = {row[0] for row in rows}
+    return [
+        email
+        for email, norm in zip(emails, lowered)
+        if norm in blocked or norm.split("@")[-1] in blocked
+    ]
 
 
-def _send_email(to_email: str, subject: str, body: str) -> None:
+def _open_smtp_session():
     import smtplib
 
-    smtp_host = os.environ.get("SMTP_HOST", "smtp.zoho.com").strip()
-    smtp_port = int(os.environ.get("SMTP_PORT", "587"))
-    smtp_user = os.environ.get("SMTP_USER", "").strip()
-    smtp_pass = os.environ.get("SMTP_PASS", "").strip()
-    if not smtp_user or not smtp_pass:
+    cfg = _sender_config()
+    if not cfg.smtp_user or not cfg.smtp_pass:
         raise OnboardingError("SMTP_USER/SMTP_PASS missing in environment (.env)")
 
-    from_email = (os.environ.get("FROM_EMAIL", "").strip() or smtp_user).strip()
-    from_name = (os.environ.get("FROM_NAME", "").strip() or os.environ.get("BRAND_NAME", "").strip() or "MicroFlowOps")
-    reply_to = (os.environ.get("REPLY_TO_EMAIL", "").strip() or "support@microflowops.com").strip()
+    server = smtplib.SMTP(cfg.smtp_host, cfg.smtp_port)
+    try:
+        server.starttls()
+        server.login(cfg.smtp_user, cfg.smtp_pass)
+    except Exception:
+        server.close()
+        raise
+    return server
 
+
+def _close_smtp_session(server) -> None:
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
+def _build_message(subject: str, body: str) -> MIMEText:
+    """
+    Build the confirmation once; callers set the To header per recipient.
+    """
+    cfg = _sender_config()
     msg = MIMEText(body, _charset="utf-8")
     msg["Subject"] = subject
-    msg["From"] = f"{from_name} <{from_email}>"
-    msg["To"] = to_email
-    msg["Reply-To"] = reply_to
-
-    with smtplib.SMTP(smtp_host, smtp_port) as server:
-        server.starttls()
-        server.login(smtp_user, smtp_pass)
-        server.send_message(msg)
+    msg["From"] = f"{cfg.from_name} <{cfg.from_email}>"
+    msg["Reply-To"] = cfg.reply_to
+    return msg
 
 
 def _send_confirmation_emails(db_path: str, req: OnboardingRequest) -> dict[str, Any]:
-    brand = (os.environ.get("BRAND_NAME", "").strip() or "MicroFlowOps").strip()
+    brand = _sender_config().brand_name
     subj = f"[{brand}] Confirmed: OSHA Activity Signals ({req.territory_tag})"
     run_date, run_time = _next_scheduled_run_local(req.send_time_local, req.timezone)
     recipients_text = ", ".join(req.recipients)
@@ -372,43 +486,83 @@ def _send_confirmation_emails(db_path: str, req: OnboardingRequest) -> dict[str,
     conn = sqlite3.connect(db_path)
     try:
         sent = 0
-        suppressed = 0
+        blocked = set(_suppressed_recipients(conn, req.recipients))
+        suppressed = len(blocked)
         errors: list[str] = []
-        for email in req.recipients:
-            if _is_suppressed(conn, email):
-                suppressed += 1
-                continue
-            try:
-                _send_email(email, subj, body)
-                sent += 1
-            except Exception as exc:
-                errors.append(f"{email}: {exc}")
+        # One SMTP session (STARTTLS + AUTH) serves every recipient; a failed send
+        # drops it so the next recipient starts on a fresh connection.
+        server = None
+        msg = _build_message(subj, body)
+        try:
+            for email in req.recipients:
+                if email in blocked:
+                    continue
+                del msg["To"]
+                msg["To"] = email
+                try:
+                    if server is None:
+                        server = _open_smtp_session()
+                    server.send_message(msg)
+                    sent += 1
+                except Exception as exc:
+                    errors.append(f"{email}: {exc}")
+                    if server is not None:
+                        _close_smtp_session(server)
+                        server = None
+        finally:
+            if server is not None:
+                _close_smtp_session(server)
         return {"subject": subj, "sent": sent, "suppressed": suppressed, "errors": errors}
     finally:
         conn.close()
 
 
-def _append_audit_row(out_dir: str, row: dict[str, str]) -> str:
-    Path(out_dir).mkdir(parents=True, exist_ok=True)
-    path = Path(out_dir) / "onboarding_audit_log.csv"
-    fieldnames = [
-        "timestamp_utc",
-        "prospect_emails",
-        "subscriber_key",
-        "territory",
-        "send_time_local",
-        "timezone",
-        "threshold",
-        "operator_action",
-        "status",
-    ]
-    exists = path.exists()
-    with open(path, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+AUDIT_LOG_FIELDS = [
+    "timestamp_utc",
+    "prospect_emails",
+    "subscriber_key",
+    "territory",
+    "send_time_local",
+    "timezone",
+    "threshold",
+    "operator_action",
+    "status",
+]
+
+
+class _AuditLog:
+    """
+    Append rows to out/onboarding_audit_log.csv over one open file handle.
+    Scripted batch onboarding can keep a single instance open for the whole loop.
+    """
+
+    def __init__(self, out_dir: str):
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+        self.path = Path(out_dir) / "onboarding_audit_log.csv"
+        self._file = None
+        self._writer = None
+
+    def __enter__(self) -> "_AuditLog":
+        exists = self.path.exists()
+        self._file = open(self.path, "a", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=AUDIT_LOG_FIELDS)
         if not exists:
-            writer.writeheader()
-        writer.writerow(row)
-    return str(path)
+            self._writer.writeheader()
+        return self
+
+    def append(self, row: dict[str, str]) -> None:
+        self._writer.writerow(row)
+
+    def __exit__(self, *exc_info) -> None:
+        self._file.close()
+        self._file = None
+        self._writer = None
+
+
+def _append_audit_row(out_dir: str, row: dict[str, str]) -> str:
+    with _AuditLog(out_dir) as audit:
+        audit.append(row)
+    return str(audit.path)
 
 
 def _build_customer_config(req: OnboardingRequest) -> dict[str, Any]:
@@ -416,9 +570,7 @@ def _build_customer_config(req: OnboardingRequest) -> dict[str, Any]:
     terr = defs.get(req.territory_code, {})
     states = [str(s).upper() for s in (terr.get("states") or [])] or ["TX"]
 
-    brand_name = (os.environ.get("BRAND_NAME", "").strip() or "MicroFlowOps").strip()
-    mailing_address = (os.environ.get("MAILING_ADDRESS", "").strip() or "").strip()
-    operator_email = (os.environ.get("OPERATOR_EMAIL", "").strip() or os.environ.get("REPLY_TO_EMAIL", "").strip() or "support@microflowops.com").strip()
+    cfg = _sender_config()
 
     return {
         "customer_id": req.subscriber_key,
@@ -440,9 +592,9 @@ def _build_customer_config(req: OnboardingRequest) -> dict[str, Any]:
         # Keep recipients in config as well so deliver_daily.py QA validation passes.
         "email_recipients": [email.lower() for email in req.recipients],
         "pilot_mode": True,
-        "pilot_whitelist": [operator_email.lower()] + [email.lower() for email in req.recipients],
-        "brand_name": brand_name,
-        "mailing_address": mailing_address,
+        "pilot_whitelist": [cfg.operator_email.lower()] + [email.lower() for email in req.recipients],
+        "brand_name": cfg.brand_name,
+        "mailing_address": cfg.mailing_address,
         "allow_live_send": True,
     }
 
@@ -479,7 +631,7 @@ def _build_request(values: dict[str, str]) -> OnboardingRequest:
 
     subscriber_key = (values.get("SUBSCRIBER_KEY") or "").strip()
     if subscriber_key:
-        subscriber_key = re.sub(r"[^a-zA-Z0-9_\\-]+", "_", subscriber_key)
+        subscriber_key = _SUB_KEY_SANITIZE_RE.sub("_", subscriber_key)
     else:
         subscriber_key = _generate_subscriber_key(territory_code, recipients[0])
 
@@ -533,7 +685,7 @@ def main() -> int:
     repo_root = _repo_root()
     # Most repo helpers (territories.json, schema.sql) assume repo-root relative paths.
     os.chdir(repo_root)
-    _load_env(repo_root)
+    _load_env(str(repo_root / ".env"))
 
     if args.no_send_confirm:
         args.dry_run = True
@@ -563,9 +715,7 @@ def main() -> int:
         if Path(args.db).exists():
             conn = sqlite3.connect(args.db)
             try:
-                for email in req.recipients:
-                    if _is_suppressed(conn, email):
-                        suppressed.append(email)
+                suppressed = _suppressed_recipients(conn, req.recipients)
                 existing_key = _existing_subscriber_key_for_email(conn, req.recipients[0])
                 if existing_key and existing_key != req.subscriber_key:
                     db_notes.append(f"primary_email_already_on_file subscriber_key={existing_key}")
@@ -614,32 +764,23 @@ def main() -> int:
     # Ensure schema exists (writes begin here).
     _ensure_schema(args.db, args.schema)
 
-    conn = sqlite3.connect(args.db)
+    conn = _connect_for_writes(args.db)
     try:
+        conn.execute("BEGIN IMMEDIATE")
         # Ensure the territory exists (FK) and stays in sync with territories.json.
         _upsert_territory_from_json(conn, req.territory_code)
 
         # If the email already exists under a different subscriber_key, reuse it unless user forced a key.
         existing_for_email = _existing_subscriber_key_for_email(conn, req.recipients[0])
         if existing_for_email and ("SUBSCRIBER_KEY" not in values):
-            req = OnboardingRequest(**{**req.__dict__, "subscriber_key": existing_for_email})  # type: ignore[arg-type]
-
-        # If the key exists but is tied to another email, stop (avoid accidental reassignment).
-        if _subscriber_exists(conn, req.subscriber_key):
-            cur = conn.cursor()
-            cur.execute(
-                "SELECT lower(email) FROM subscribers WHERE subscriber_key = ? LIMIT 1",
-                (req.subscriber_key,),
-            )
-            row = cur.fetchone()
-            if row and str(row[0] or "").strip().lower() not in {req.recipients[0].lower()}:
-                raise OnboardingError(
-                    f"subscriber_key '{req.subscriber_key}' already exists for a different email ({row[0]}). "
-                    "Provide SUBSCRIBER_KEY explicitly or use a different primary recipient."
-                )
+            req = replace(req, subscriber_key=existing_for_email)
 
         _upsert_subscriber(conn, req)
-        conn.commit()
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
     finally:
         conn.close()
 
@@ -654,9 +795,7 @@ def main() -> int:
     if args.dry_run and Path(args.db).exists():
         conn = sqlite3.connect(args.db)
         try:
-            for email in req.recipients:
-                if _is_suppressed(conn, email):
-                    suppressed_recipients.append(email)
+            suppressed_recipients = _suppressed_recipients(conn, req.recipients)
         finally:
             conn.close()
 
@@ -12,14 +12,20 @@ Usage:
 
 import argparse
 import csv
+import functools
 import html
+import io
+import itertools
 import json
 import os
 import random
+import re
 import smtplib
 import sys
 import time
-from datetime import datetime, timedelta, date
+from collections import Counter, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, date, timezone
 from zoneinfo import ZoneInfo
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -60,9 +66,70 @@ DEFAULT_CONFIG = {
 
 # Placeholder patterns to reject
 PLACEHOLDER_PATTERNS = ["123 main street", "suite 100", "your address here", "example"]
+_PLACEHOLDER_RE = re.compile("|".join(re.escape(p) for p in PLACEHOLDER_PATTERNS))
 REQUIRED_REPLY_TO = "support@microflowops.com"
 
 
+@dataclass(frozen=True)
+class EmailEnv:
+    """Send-path environment settings, resolved once per run by build_env()."""
+    smtp_host: str
+    smtp_port: int
+    smtp_user: str
+    smtp_pass: str
+    from_email: str
+    reply_to: str
+    from_display_name: str
+    unsub_endpoint: str
+    footer_address: str | None  # None when MAIL_FOOTER_ADDRESS is unset
+    notify_email: str
+    daily_limit: int
+    hourly_limit: int
+    domain_limit: int
+
+
+def build_env() -> EmailEnv:
+    """Snapshot the send-path environment variables (same defaults as before)."""
+    env = os.environ
+    smtp_user = env.get("SMTP_USER", "")
+    from_email = env.get("FROM_EMAIL", smtp_user)
+    return EmailEnv(
+        smtp_host=env.get("SMTP_HOST", "smtppro.zoho.com"),
+        smtp_port=int(env.get("SMTP_PORT", "465")),
+        smtp_user=smtp_user,
+        smtp_pass=env.get("SMTP_PASS", ""),
+        from_email=from_email,
+        reply_to=env.get("REPLY_TO_EMAIL", from_email),
+        from_display_name=env.get("FROM_DISPLAY_NAME", "MicroFlowOps OSHA Alerts"),
+        unsub_endpoint=env.get("UNSUB_ENDPOINT_BASE", "").strip(),
+        footer_address=env.get("MAIL_FOOTER_ADDRESS"),
+        notify_email=env.get("NOTIFY_EMAIL", ""),
+        daily_limit=int(env.get("DAILY_SEND_LIMIT", "10")),
+        hourly_limit=int(env.get("PER_HOUR_LIMIT", "3")),
+        domain_limit=int(env.get("PER_DOMAIN_LIMIT", "2")),
+    )
+
+
+# Parsed file contents keyed by (loader, path, args) -> ((mtime_ns, size), value)
+_READ_CACHE: dict = {}
+
+
+def _cached_read(path: Path, loader, *args):
+    """
+    Return loader(path, *args), re-running it only when the file's (mtime_ns, size)
+    changed since the last call. Callers must copy before handing values out.
+    """
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = (loader, str(path), args)
+    hit = _READ_CACHE.get(key)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    value = loader(path, *args)
+    _READ_CACHE[key] = (stamp, value)
+    return value
+
+
 def html_escape(s: str) -> str:
     return html.escape(s or "", quote=True)
 
@@ -91,6 +158,11 @@ def get_priority_label(score: int | str) -> str:
     return "Low"
 
 
+def _email_domain(email: str) -> str:
+    """Lowercased part after the last '@' (the whole string when there is none)."""
+    return email[email.rfind("@") + 1:].lower()
+
+
 def get_observed_date(lead: dict) -> str:
     """Return YYYY-MM-DD for first_seen_at, falling back to date_opened."""
     first_seen = (lead.get("first_seen_at") or "").strip()
@@ -142,13 +214,13 @@ def validate_environment() -> tuple:
         errors.append("MAILING_ADDRESS is required (CAN-SPAM compliance)")
     else:
         addr_lower = mailing_address.lower()
-        for placeholder in PLACEHOLDER_PATTERNS:
-            if placeholder in addr_lower:
-                errors.append(
-                    f"MAILING_ADDRESS contains placeholder text ('{placeholder}'). "
-                    "Use a real physical mailing address."
-                )
-                break
+        if _PLACEHOLDER_RE.search(addr_lower):
+            # Report the first listed pattern, not the leftmost match in the address
+            placeholder = next(p for p in PLACEHOLDER_PATTERNS if p in addr_lower)
+            errors.append(
+                f"MAILING_ADDRESS contains placeholder text ('{placeholder}'). "
+                "Use a real physical mailing address."
+            )
     
     # REPLY_TO_EMAIL required (opt-out replies go here)
     reply_to = os.getenv("REPLY_TO_EMAIL", "")
@@ -161,8 +233,8 @@ def validate_environment() -> tuple:
     
     # REPLY_TO_EMAIL must be same domain as FROM_EMAIL
     if from_email and reply_to:
-        from_domain = from_email.split("@")[-1].lower() if "@" in from_email else ""
-        reply_domain = reply_to.split("@")[-1].lower() if "@" in reply_to else ""
+        from_domain = _email_domain(from_email) if "@" in from_email else ""
+        reply_domain = _email_domain(reply_to) if "@" in reply_to else ""
         if from_domain and reply_domain and from_domain != reply_domain:
             if os.getenv("ALLOW_REPLYTO_MISMATCH", "false").lower() != "true":
                 errors.append(
@@ -192,8 +264,6 @@ def validate_freshness() -> tuple:
     Validate data freshness from out/latest_run.json.
     Returns (is_fresh: bool, report: dict, errors: list).
     """
-    from datetime import timezone
-    
     run_json_path = SCRIPT_DIR / "out" / "latest_run.json"
     max_pipeline_hours = float(os.getenv("MAX_PIPELINE_AGE_HOURS", "18"))
     max_signal_hours = float(os.getenv("MAX_SIGNAL_AGE_HOURS", "36"))
@@ -295,17 +365,18 @@ def validate_freshness() -> tuple:
     return len(errors) == 0, report, errors
 
 
-def send_stale_data_alert(errors: list, report: dict):
+def send_stale_data_alert(errors: list, report: dict, env: EmailEnv | None = None):
     """Send email notification when data is stale."""
-    notify_email = os.getenv("NOTIFY_EMAIL", "")
+    env = env or build_env()
+    notify_email = env.notify_email
     if not notify_email:
         return
     
-    smtp_host = os.getenv("SMTP_HOST", "smtppro.zoho.com")
-    smtp_port = int(os.getenv("SMTP_PORT", "465"))
-    smtp_user = os.getenv("SMTP_USER", "")
-    smtp_pass = os.getenv("SMTP_PASS", "")
-    from_email = os.getenv("FROM_EMAIL", smtp_user)
+    smtp_host = env.smtp_host
+    smtp_port = env.smtp_port
+    smtp_user = env.smtp_user
+    smtp_pass = env.smtp_pass
+    from_email = env.from_email
     
     if not smtp_user or not smtp_pass:
         return
@@ -351,12 +422,16 @@ Timestamp: {datetime.now().isoformat()}
         print(f"[WARN] Failed to send stale data alert: {e}")
 
 
+def _read_json(path: Path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
 def load_config() -> dict:
     """Load cold email configuration."""
     config = DEFAULT_CONFIG.copy()
     if CONFIG_PATH.exists():
-        with open(CONFIG_PATH, "r") as f:
-            config.update(json.load(f))
+        config.update(_cached_read(CONFIG_PATH, _read_json))
     return config
 
 
@@ -523,17 +598,23 @@ def get_last_refresh_lines() -> tuple[str, str]:
 # =============================================================================
 # SUPPRESSION MANAGEMENT
 # =============================================================================
+def _read_suppression(path: Path) -> frozenset:
+    suppressed = set()
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            email = row.get("email", "").strip().lower()
+            if email:
+                suppressed.add(email)
+    return frozenset(suppressed)
+
+
 def load_suppression_list() -> set:
     """Load suppression list from CSV. Returns set of lowercase emails."""
-    suppressed = set()
-    if SUPPRESSION_PATH.exists():
-        with open(SUPPRESSION_PATH, "r", newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                email = row.get("email", "").strip().lower()
-                if email:
-                    suppressed.add(email)
-    return suppressed
+    if not SUPPRESSION_PATH.exists():
+        return set()
+    # Any write to suppression.csv changes its stamp, so new opt-outs are always seen.
+    return set(_cached_read(SUPPRESSION_PATH, _read_suppression))
 
 
 def is_suppressed(email: str, suppression_list: set) -> bool:
@@ -552,12 +633,15 @@ def is_suppressed(email: str, suppression_list: set) -> bool:
 # =============================================================================
 def load_recipients(recipients_path: Path | None = None) -> list:
     """Load recipients from CSV (supports legacy and business-contact schemas)."""
-    recipients = []
     path = recipients_path or RECIPIENTS_PATH
     if not path.exists():
         print(f"[ERROR] Recipients file not found: {path}")
-        return recipients
-    
+        return []
+    return [dict(r) for r in _cached_read(path, _read_recipients)]
+
+
+def _read_recipients(path: Path) -> list:
+    recipients = []
     with open(path, "r", newline="", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -607,89 +691,176 @@ LOG_FIELDS = [
 ]
 
 
+def _read_sent(path: Path, campaign_id: str | None) -> frozenset:
+    sent = set()
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if campaign_id is not None and row.get("campaign_id") != campaign_id:
+                continue
+            if row.get("status") in FINAL_SEND_STATUSES:
+                email = row.get("recipient_email", "").strip().lower()
+                if email:
+                    sent.add(email)
+    return frozenset(sent)
+
+
 def get_already_sent_today(campaign_id: str) -> set:
     """Get emails already sent today (final statuses only). Returns set of lowercase emails."""
-    sent = set()
-    if LOG_PATH.exists():
-        with open(LOG_PATH, "r", newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get("campaign_id") == campaign_id:
-                    email = row.get("recipient_email", "").strip().lower()
-                    if email and row.get("status") in FINAL_SEND_STATUSES:
-                        sent.add(email)
-    return sent
+    if not LOG_PATH.exists():
+        return set()
+    return set(_cached_read(LOG_PATH, _read_sent, campaign_id))
 
 
 def get_already_sent_all_time() -> set:
     """Get emails already sent across all campaigns (final statuses only)."""
-    sent = set()
-    if LOG_PATH.exists():
-        with open(LOG_PATH, "r", newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get("status") in FINAL_SEND_STATUSES:
-                    email = row.get("recipient_email", "").strip().lower()
-                    if email:
-                        sent.add(email)
-    return sent
+    if not LOG_PATH.exists():
+        return set()
+    return set(_cached_read(LOG_PATH, _read_sent, None))
 
 
-def get_throttle_stats() -> dict:
-    """Get current throttle statistics from today's log."""
-    from collections import Counter
-    
-    now = datetime.now()
-    today_prefix = now.strftime("%Y-%m-%d")
-    one_hour_ago = now - timedelta(hours=1)
-    
-    stats = {
-        "daily_count": 0,
-        "hourly_count": 0,
-        "domain_counts": Counter()
-    }
-    
+# Bytes read from the end of the send log per attempt when looking for today's rows
+TAIL_WINDOW_BYTES = 256 * 1024
+
+# Rows in the send log start with an ISO-8601 timestamp (log_send writes isoformat()).
+_ISO_ROW_START_RE = re.compile(rb"\d{4}-\d{2}-\d{2}T")
+
+
+def _row_start_at_or_after(f, offset: int) -> int:
+    """
+    Return the byte offset of the first log row starting after `offset`, skipping
+    the partial line there and any continuation lines of a quoted multi-line field.
+    """
+    f.seek(offset)
+    f.readline()
+    while True:
+        pos = f.tell()
+        line = f.readline()
+        if not line or _ISO_ROW_START_RE.match(line):
+            return pos
+
+
+def _today_final_sends(today_prefix: str) -> list:
+    """
+    Return (timestamp, recipient_email) for today's final-status rows in the send log.
+    The log is append-ordered, so only the tail window reaching back past today is parsed.
+    """
     if not LOG_PATH.exists():
-        return stats
-    
-    with open(LOG_PATH, "r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            ts = row.get("timestamp", "")
-            if not ts.startswith(today_prefix):
+        return []
+    with open(LOG_PATH, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8-sig")]), [])
+        if "timestamp" not in header or "status" not in header:
+            return []
+        i_ts = header.index("timestamp")
+        i_status = header.index("status")
+        i_email = header.index("recipient_email") if "recipient_email" in header else None
+
+        data_start = f.tell()
+        size = f.seek(0, os.SEEK_END)
+        window = TAIL_WINDOW_BYTES
+        while True:
+            start = data_start
+            if size - window > data_start:
+                start = _row_start_at_or_after(f, size - window)
+            f.seek(start)
+            rows = csv.reader(io.StringIO(f.read().decode("utf-8", errors="replace"), newline=""))
+            first = next(rows, None)
+            # Widen until the window starts before today (or covers the whole file)
+            if start > data_start and (first is None or (len(first) > i_ts and first[i_ts][:10] >= today_prefix)):
+                window *= 2
                 continue
-            if row.get("status") not in FINAL_SEND_STATUSES:
+            if first is not None:
+                rows = itertools.chain([first], rows)
+            break
+
+        sends = []
+        for row in rows:
+            if len(row) <= max(i_ts, i_status):
                 continue
-            
-            stats["daily_count"] += 1
-            
-            # Check hourly
+            if row[i_ts].startswith(today_prefix) and row[i_status] in FINAL_SEND_STATUSES:
+                email = row[i_email] if i_email is not None and len(row) > i_email else ""
+                sends.append((row[i_ts], email))
+        return sends
+
+
+class ThrottleTracker:
+    """
+    Today's send counts for throttle checks. The log is parsed once, then kept
+    current in-process via record(); it is only re-read when the day rolls over
+    or the log's (mtime, size) changes outside this process.
+    """
+
+    def __init__(self):
+        self._day = None
+        self._stamp = None
+        self.daily_count = 0
+        self.domain_counts = Counter()
+        self._recent = deque()  # parsed send times, oldest first
+
+    @staticmethod
+    def _log_stamp():
+        try:
+            st = LOG_PATH.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load(self, now: datetime):
+        self._day = now.strftime("%Y-%m-%d")
+        self._stamp = self._log_stamp()
+        self.daily_count = 0
+        self.domain_counts = Counter()
+        times = []
+        for ts, email in _today_final_sends(self._day):
+            self.daily_count += 1
             try:
-                row_time = datetime.fromisoformat(ts)
-                if row_time >= one_hour_ago:
-                    stats["hourly_count"] += 1
+                times.append(datetime.fromisoformat(ts))
             except (ValueError, TypeError):
                 pass
-            
-            # Count by domain
-            email = row.get("recipient_email", "")
             if "@" in email:
-                domain = email.split("@")[-1].lower()
-                stats["domain_counts"][domain] += 1
-    
-    return stats
+                self.domain_counts[_email_domain(email)] += 1
+        self._recent = deque(sorted(times))
+
+    def stats(self, now: datetime | None = None) -> dict:
+        now = now or datetime.now()
+        if now.strftime("%Y-%m-%d") != self._day or self._log_stamp() != self._stamp:
+            self._load(now)
+        one_hour_ago = now - timedelta(hours=1)
+        while self._recent and self._recent[0] < one_hour_ago:
+            self._recent.popleft()
+        return {
+            "daily_count": self.daily_count,
+            "hourly_count": len(self._recent),
+            "domain_counts": self.domain_counts,
+        }
+
+    def record(self, recipient_email: str, status: str, when: datetime | None = None):
+        """Account for a row this process just appended to the log."""
+        if status in FINAL_SEND_STATUSES:
+            self.daily_count += 1
+            self._recent.append(when or datetime.now())
+            if "@" in recipient_email:
+                self.domain_counts[_email_domain(recipient_email)] += 1
+        self._stamp = self._log_stamp()
+
+
+def get_throttle_stats() -> dict:
+    """Get current throttle statistics from today's log."""
+    return ThrottleTracker().stats()
 
 
-def check_throttle_limits(recipient_email: str) -> tuple:
+def check_throttle_limits(recipient_email: str, tracker: ThrottleTracker | None = None,
+                          env: EmailEnv | None = None) -> tuple:
     """
     Check if sending is allowed by throttle limits.
     Returns (allowed: bool, reason: str).
     """
-    daily_limit = int(os.getenv("DAILY_SEND_LIMIT", "10"))
-    hourly_limit = int(os.getenv("PER_HOUR_LIMIT", "3"))
-    domain_limit = int(os.getenv("PER_DOMAIN_LIMIT", "2"))
+    env = env or build_env()
+    daily_limit = env.daily_limit
+    hourly_limit = env.hourly_limit
+    domain_limit = env.domain_limit
     
-    stats = get_throttle_stats()
+    stats = tracker.stats() if tracker is not None else get_throttle_stats()
     
     if stats["daily_count"] >= daily_limit:
         return False, f"daily limit ({daily_limit}) reached"
@@ -698,7 +869,7 @@ def check_throttle_limits(recipient_email: str) -> tuple:
         return False, f"hourly limit ({hourly_limit}) reached"
     
     if "@" in recipient_email:
-        domain = recipient_email.split("@")[-1].lower()
+        domain = _email_domain(recipient_email)
         if stats["domain_counts"].get(domain, 0) >= domain_limit:
             return False, f"domain limit ({domain_limit}) reached for {domain}"
     
@@ -712,11 +883,14 @@ def load_leads(leads_path: Path = None) -> list:
     """Load leads from latest_leads.csv."""
     if leads_path is None:
         leads_path = LEADS_PATH
-    leads = []
     if not leads_path.exists():
         print(f"[WARN] Leads file not found: {leads_path}")
-        return leads
-    
+        return []
+    return [dict(l) for l in _cached_read(leads_path, _read_leads)]
+
+
+def _read_leads(leads_path: Path) -> list:
+    leads = []
     with open(leads_path, "r", newline="", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -743,14 +917,30 @@ def load_leads(leads_path: Path = None) -> list:
     return leads
 
 
-def select_sample_leads(leads: list, config: dict, recipient_email: str, 
-                         campaign_id: str, state_pref: str = None,
-                         as_of_date: date | None = None) -> list:
+@functools.lru_cache(maxsize=4096)
+def _parse_date_opened(value) -> datetime | None:
+    """Parse a YYYY-MM-DD date_opened once per distinct value; None when invalid."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except (ValueError, TypeError):
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _first_seen_timestamp(value: str) -> float:
+    """Epoch seconds for an ISO first_seen_at value; 0 when unparseable."""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (ValueError, TypeError):
+        return 0
+
+
+def build_sample_pool(leads: list, config: dict, state_pref: str = None,
+                      as_of_date: date | None = None) -> list:
     """
-    Select 2-5 sample leads using deterministic rules:
-    1. Prefer High/Medium priority leads
-    2. Do not include Low priority leads
-    3. Use hash-based shuffle to vary selection across recipients
+    Return the recent OPEN High/Medium leads for a state preference, freshest first.
+    Selection does not depend on the recipient, so callers can build this once per
+    state_pref and reuse it across recipients.
     """
     today = as_of_date or datetime.now().date()
     recency_cutoff = today - timedelta(days=config["recency_days"])
@@ -760,11 +950,8 @@ def select_sample_leads(leads: list, config: dict, recipient_email: str,
         status = (lead.get("case_status") or "").strip().upper()
         if status != "OPEN":
             return False
-        try:
-            opened = datetime.strptime(lead.get("date_opened", ""), "%Y-%m-%d").date()
-        except (ValueError, TypeError):
-            return False
-        return opened >= recency_cutoff
+        opened = _parse_date_opened(lead.get("date_opened", ""))
+        return opened is not None and opened.date() >= recency_cutoff
     
     recent_leads = [l for l in leads if is_recent_open(l)]
     
@@ -776,21 +963,13 @@ def select_sample_leads(leads: list, config: dict, recipient_email: str,
     
     # Sort by freshness: first_seen_at desc, then score desc
     def sort_key(lead):
-        # Parse first_seen_at for sorting (newest first)
         first_seen = lead.get("first_seen_at", "")
         if first_seen:
-            try:
-                fs_dt = datetime.fromisoformat(first_seen.replace("Z", "+00:00"))
-                fs_ts = fs_dt.timestamp()
-            except (ValueError, TypeError):
-                fs_ts = 0
+            fs_ts = _first_seen_timestamp(first_seen)
         else:
             # Fallback to date_opened
-            try:
-                opened_dt = datetime.strptime(lead.get("date_opened", ""), "%Y-%m-%d")
-                fs_ts = opened_dt.timestamp()
-            except (ValueError, TypeError):
-                fs_ts = 0
+            opened_dt = _parse_date_opened(lead.get("date_opened", ""))
+            fs_ts = opened_dt.timestamp() if opened_dt is not None else 0
         
         score = lead.get("lead_score", 0)
         return (-fs_ts, -score)  # Negative for descending
@@ -798,10 +977,24 @@ def select_sample_leads(leads: list, config: dict, recipient_email: str,
     recent_leads.sort(key=sort_key)
     
     # High/Medium only
-    preferred = [l for l in recent_leads if l["lead_score"] >= 6]
-    selected = preferred[:config["sample_leads_max"]]
-    
-    return selected
+    return [l for l in recent_leads if l["lead_score"] >= 6]
+
+
+def select_sample_leads(leads: list, config: dict, recipient_email: str, 
+                         campaign_id: str, state_pref: str = None,
+                         as_of_date: date | None = None,
+                         pool: list | None = None) -> list:
+    """
+    Select 2-5 sample leads using deterministic rules:
+    1. Prefer High/Medium priority leads
+    2. Do not include Low priority leads
+    3. Freshest first (first_seen_at desc, then score desc)
+
+    Pass a pool from build_sample_pool to skip re-filtering and re-sorting.
+    """
+    if pool is None:
+        pool = build_sample_pool(leads, config, state_pref, as_of_date=as_of_date)
+    return pool[:config["sample_leads_max"]]
 
 
 def select_sample_leads_with_reason(
@@ -811,10 +1004,11 @@ def select_sample_leads_with_reason(
     campaign_id: str,
     state_pref: str = None,
     as_of_date: date | None = None,
+    pool: list | None = None,
 ) -> tuple[list, str]:
     """Return samples and a structured skip reason when empty."""
     samples = select_sample_leads(
-        leads, config, recipient_email, campaign_id, state_pref, as_of_date=as_of_date
+        leads, config, recipient_email, campaign_id, state_pref, as_of_date=as_of_date, pool=pool
     )
     if not samples:
         return [], "no_high_med_leads"
@@ -885,17 +1079,19 @@ def format_lead_for_html(lead: dict) -> str:
 
 
 def generate_email_body(recipient: dict, sample_leads: list, 
-                         unsub_token: str, mailing_address: str) -> tuple:
+                         unsub_token: str, mailing_address: str,
+                         env: EmailEnv | None = None) -> tuple:
     """
     Generate polished email body (plain text and HTML).
     Returns (text_body, html_body).
     """
+    env = env or build_env()
     first_name = recipient.get("first_name", "").strip()
     firm = recipient.get("firm_name", "").strip() or "your firm"
     state_pref = recipient.get("state_pref", "").strip()
     
     # Footer address (required for cold outreach - physical mailing address)
-    footer_address = os.getenv("MAIL_FOOTER_ADDRESS", mailing_address)
+    footer_address = mailing_address if env.footer_address is None else env.footer_address
     
     # Greeting
     greeting = f"Hi {first_name}," if first_name else "Hi there,"
@@ -911,7 +1107,7 @@ def generate_email_body(recipient: dict, sample_leads: list,
     leads_html = "\n".join([format_lead_for_html(l) for l in sample_leads[:5]])
     
     # Build one-click URL for footer if available
-    unsub_endpoint = os.getenv("UNSUB_ENDPOINT_BASE", "").strip()
+    unsub_endpoint = env.unsub_endpoint
     unsub_url = f"{unsub_endpoint}?token={unsub_token}" if unsub_endpoint and unsub_token else ""
     
     refresh_text, refresh_html = get_last_refresh_lines()
@@ -1025,18 +1221,20 @@ Not affiliated with OSHA; this is an independent alert service (no legal advice)
 # =============================================================================
 def send_email(recipient_email: str, subject: str, text_body: str, 
                html_body: str, unsub_token: str = "", campaign_id: str = "",
-               sample_ids: list = None, dry_run: bool = False) -> tuple:
+               sample_ids: list = None, dry_run: bool = False,
+               env: EmailEnv | None = None) -> tuple:
     """
     Send email via SMTP with deliverability and tracking headers.
     Returns (success: bool, message_id: str, error: str).
     """
-    smtp_host = os.getenv("SMTP_HOST", "smtppro.zoho.com")
-    smtp_port = int(os.getenv("SMTP_PORT", "465"))
-    smtp_user = os.getenv("SMTP_USER", "")
-    smtp_pass = os.getenv("SMTP_PASS", "")
-    from_email = os.getenv("FROM_EMAIL", smtp_user)
-    reply_to = os.getenv("REPLY_TO_EMAIL", from_email)
-    from_display_name = os.getenv("FROM_DISPLAY_NAME", "MicroFlowOps OSHA Alerts")
+    env = env or build_env()
+    smtp_host = env.smtp_host
+    smtp_port = env.smtp_port
+    smtp_user = env.smtp_user
+    smtp_pass = env.smtp_pass
+    from_email = env.from_email
+    reply_to = env.reply_to
+    from_display_name = env.from_display_name
     
     # Format From header with display name (RFC 5322)
     from_header = f"{from_display_name} <{from_email}>" if from_display_name else from_email
@@ -1069,11 +1267,11 @@ def send_email(recipient_email: str, subject: str, text_body: str,
         
         # Add Date and Message-ID headers for deliverability
         msg["Date"] = formatdate(localtime=True)
-        msg["Message-ID"] = make_msgid(domain=from_email.split("@")[-1] if "@" in from_email else "microflowops.com")
+        msg["Message-ID"] = make_msgid(domain=from_email[from_email.rfind("@") + 1:] if "@" in from_email else "microflowops.com")
         
         # Add List-Unsubscribe headers (RFC 8058 One-Click only if endpoint exists)
         unsub_mailto = f"mailto:{reply_to}?subject=unsubscribe"
-        unsub_endpoint = os.getenv("UNSUB_ENDPOINT_BASE", "").strip()
+        unsub_endpoint = env.unsub_endpoint
         
         if unsub_endpoint and unsub_token:
             unsub_https = f"{unsub_endpoint}?token={unsub_token}"
@@ -1448,6 +1646,7 @@ def main():
     # Load configuration
     config = load_config()
     campaign_id = get_campaign_id()
+    env = build_env()
     mailing_address = os.getenv("MAILING_ADDRESS")  # Required, validated above
     
     print(f"[INFO] Campaign ID: {campaign_id}")
@@ -1558,26 +1757,32 @@ def main():
     # Send emails
     sent_count = 0
     failed_count = 0
+    throttle = ThrottleTracker()
+    sample_pools = {}
     
     for i, recipient in enumerate(to_send):
         email = recipient["email"]
         
         # Check throttle limits before each send
-        throttle_ok, throttle_reason = check_throttle_limits(email)
+        throttle_ok, throttle_reason = check_throttle_limits(email, throttle, env)
         if not throttle_ok:
             print(f"  [THROTTLE] {throttle_reason} - stopping sends")
             break
         
-        # Select sample leads
+        # Select sample leads (pool built once per state preference)
+        state_pref = recipient.get("state_pref")
+        if state_pref not in sample_pools:
+            sample_pools[state_pref] = build_sample_pool(leads, config, state_pref)
         samples, skip_reason = select_sample_leads_with_reason(
             leads, config, email, campaign_id, 
-            recipient.get("state_pref")
+            state_pref, pool=sample_pools[state_pref]
         )
         
         if not samples:
             print(f"  [SKIP] No suitable leads for {email}")
             log_send(email, "", [], "", campaign_id, "skipped", 
                      skip_reason or "no_suitable_leads", "")
+            throttle.record(email, "skipped")
             continue
         
         # Generate email (unique token per recipient+campaign)
@@ -1618,7 +1823,7 @@ def main():
                     unsub_token = ""
         subject = generate_email_subject(recipient, samples)
         text_body, html_body = generate_email_body(
-            recipient, samples, unsub_token, mailing_address
+            recipient, samples, unsub_token, mailing_address, env
         )
         
         # Extract sample IDs for tracking
@@ -1627,7 +1832,7 @@ def main():
         # Send with tracking headers
         success, message_id, error = send_email(
             email, subject, text_body, html_body, unsub_token, 
-            campaign_id, sample_ids, args.dry_run
+            campaign_id, sample_ids, args.dry_run, env
         )
         
         # Log
@@ -1638,6 +1843,7 @@ def main():
                  register_ok=register_ok,
                  register_http_status=register_http_status,
                  register_error=register_error)
+        throttle.record(email, status)
         
         if success:
             sent_count += 1
@@ -65,6 +65,10 @@ CREATE TABLE IF NOT EXISTS inspections (
     needs_review INTEGER NOT NULL DEFAULT 0,
     re_alert INTEGER NOT NULL DEFAULT 0,
     parse_invalid INTEGER NOT NULL DEFAULT 0,
+    -- Picked up by ingest_osha.py --refresh-invalid (indexed by ensure_inspection_columns)
+    needs_refresh INTEGER GENERATED ALWAYS AS (
+        parse_invalid = 1 OR establishment_name IS NULL OR instr(establishment_name, '.') > 0
+    ) VIRTUAL,
     
     -- Scoring
     lead_score INTEGER NOT NULL DEFAULT 0,
@@ -173,8 +177,10 @@ CREATE INDEX IF NOT EXISTS idx_inspections_needs_review ON inspections(needs_rev
 CREATE INDEX IF NOT EXISTS idx_inspections_lead_score ON inspections(lead_score DESC);
 CREATE INDEX IF NOT EXISTS idx_inspections_area_office ON inspections(area_office);
 CREATE UNIQUE INDEX IF NOT EXISTS idx_inspections_lead_key ON inspections(lead_key);
+CREATE INDEX IF NOT EXISTS idx_inspections_parse_invalid ON inspections(parse_invalid) WHERE parse_invalid = 1;
 CREATE INDEX IF NOT EXISTS idx_citations_inspection_id ON citations(inspection_id);
 CREATE INDEX IF NOT EXISTS idx_suppression_email ON suppression_list(email_or_domain);
+CREATE INDEX IF NOT EXISTS idx_suppression_lower ON suppression_list(lower(email_or_domain));
 CREATE INDEX IF NOT EXISTS idx_subscribers_active ON subscribers(active);
 CREATE INDEX IF NOT EXISTS idx_subscribers_send_time ON subscribers(send_time_local, timezone);
 CREATE INDEX IF NOT EXISTS idx_unsubscribe_events_email ON unsubscribe_events(email);
@@ -0,0 +1,245 @@
+import argparse
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+import inbound_inbox_triage as triage
+
+
+class _FakeSMTP:
+    def __init__(self, fail_after=None):
+        self.sent = []
+        self.messages = []
+        self.closed = False
+        self.fail_after = fail_after
+
+    def quit(self):
+        self.closed = True
+
+    def _record(self, to_email, message):
+        if self.fail_after is not None and len(self.sent) >= self.fail_after:
+            raise OSError("connection dropped")
+        self.sent.append(to_email)
+        self.messages.append(message)
+
+    def send_message(self, msg):
+        self._record(msg["To"], msg)
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        self._record(to_addrs[0], msg)
+
+
+class TestNotificationWorker(unittest.TestCase):
+    def _run_worker(self, server, items):
+        worker = triage.NotificationWorker()
+        with mock.patch.object(triage, "_SMTP_ENABLED", True), \
+                mock.patch.object(triage, "_open_smtp_session", return_value=server) as opener, \
+                mock.patch.object(triage, "send_smtp_email", return_value=True) as single:
+            for item in items:
+                worker.put(*item)
+            worker.shutdown()
+        return worker, opener, single
+
+    def test_reuses_one_session(self):
+        server = _FakeSMTP()
+        worker, opener, single = self._run_worker(
+            server, [("a@example.com", "s1", "b1"), ("b@example.com", "s2", "b2")])
+
+        self.assertEqual(worker.sent, 2)
+        self.assertEqual(opener.call_count, 1)
+        self.assertEqual(server.sent, ["a@example.com", "b@example.com"])
+        self.assertTrue(server.closed)
+        single.assert_not_called()
+
+    def test_failed_send_retried_individually(self):
+        server = _FakeSMTP(fail_after=1)
+        worker, _, single = self._run_worker(
+            server, [("a@example.com", "s1", "b1"), ("b@example.com", "s2", "b2")])
+
+        self.assertEqual(worker.sent, 2)
+        single.assert_called_once_with("b@example.com", "s2", "b2")
+
+    def test_ascii_sent_as_bytes_and_unicode_as_mime(self):
+        server = _FakeSMTP()
+        self._run_worker(server, [("a@example.com", "Hello", "line1\nline2"),
+                                  ("b@example.com", "Caf\u00e9", "body")])
+
+        raw, mime = server.messages
+        self.assertIsInstance(raw, bytes)
+        self.assertIn(b"Subject: Hello\r\n", raw)
+        self.assertTrue(raw.endswith(b"\r\n\r\nline1\r\nline2"))
+        self.assertEqual(mime["Subject"], "Caf\u00e9")
+
+
+class TestProcessedIds(unittest.TestCase):
+    def test_bounded_with_membership_and_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            state_path = Path(tmp) / "inbox_state.json"
+            state_path.write_text(json.dumps({"processed_message_ids": [f"m{i}" for i in range(5)]}))
+            with mock.patch.object(triage, "STATE_PATH", state_path):
+                state = triage.load_state()
+                ids = state["processed_message_ids"]
+                self.assertIn("m0", ids)
+                for i in range(5, triage.PROCESSED_IDS_MAX + 2):
+                    ids.append(f"m{i}")
+                self.assertEqual(len(ids), triage.PROCESSED_IDS_MAX)
+                self.assertNotIn("m1", ids)
+                self.assertIn("m2", ids)
+
+                triage.save_state(state)
+                saved = json.loads(state_path.read_text())["processed_message_ids"]
+            self.assertEqual(saved[0], "m2")
+            self.assertEqual(len(saved), triage.PROCESSED_IDS_MAX)
+
+
+class _FakeBatch:
+    def __init__(self, callback, responses):
+        self.callback = callback
+        self.responses = responses
+        self.request_ids = []
+
+    def add(self, request, request_id):
+        self.request_ids.append(request_id)
+
+    def execute(self):
+        for request_id in self.request_ids:
+            response = self.responses.get(request_id)
+            if response is None:
+                self.callback(request_id, None, RuntimeError("404"))
+            else:
+                self.callback(request_id, response, None)
+
+
+class _FakeGmailService:
+    def __init__(self, responses):
+        self.responses = responses
+        self.batches = []
+
+    def new_batch_http_request(self, callback):
+        batch = _FakeBatch(callback, self.responses)
+        self.batches.append(batch)
+        return batch
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def get(self, **kwargs):
+        return kwargs
+
+
+def _gmail_message(subject, sender):
+    return {"payload": {"headers": [{"name": "Subject", "value": subject},
+                                    {"name": "From", "value": sender}]}}
+
+
+class TestBatchedFetch(unittest.TestCase):
+    def test_batches_and_keeps_message_order(self):
+        service = _FakeGmailService({
+            "m1": _gmail_message("Please unsubscribe", "A <a@example.com>"),
+            "m2": _gmail_message("Pricing?", "B <b@example.com>"),
+        })
+        with mock.patch.object(triage, "GMAIL_BATCH_SIZE", 2):
+            results = triage.fetch_and_classify_all(service, ["m1", "bad", "m2"])
+
+        self.assertEqual([len(b.request_ids) for b in service.batches], [2, 1])
+        self.assertEqual(results[0]["category"], "unsubscribe")
+        self.assertIsNone(results[1])
+        self.assertEqual(results[2]["from_email"], "b@example.com")
+        self.assertEqual(results[2]["category"], "question")
+
+
+class TestCsvAppender(unittest.TestCase):
+    def test_escape_matches_csv_writer(self):
+        for value in ["plain", "a,b", 'say "hi"', "two\nlines", "cr\r", "", " padded "]:
+            buf = io.StringIO()
+            csv.writer(buf).writerow(["x", value])
+            self.assertEqual("x," + triage._csv_escape(value) + "\r\n", buf.getvalue())
+
+    def test_header_written_once_across_reopen(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "log.csv"
+            for value in ("1", "2"):
+                appender = triage.CsvAppender(path, ["a", "b"])
+                appender.writerow((value, triage._csv_escape('x,"y"\nz')))
+                appender.close()
+
+            with open(path, "r", newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual([r["a"] for r in rows], ["1", "2"])
+            self.assertEqual(rows[0]["b"], 'x,"y"\nz')
+
+
+class TestTodaySentCount(unittest.TestCase):
+    def test_tail_read_matches_full_scan(self):
+        today = datetime.now().strftime("%Y-%m-%d")
+        fields = ["timestamp", "recipient_email", "campaign_id", "status", "error"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cold_email_log.csv"
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(fields)
+                for i in range(200):
+                    writer.writerow(["2020-01-01T09:00:00", f"old{i}@example.com", "2020-01-01", "sent", "line1\nline2"])
+                for i in range(30):
+                    status = "sent" if i % 3 else "error"
+                    writer.writerow([f"{today}T09:00:00", f"new{i}@example.com", today, status, ""])
+
+            with mock.patch.object(triage, "COLD_EMAIL_LOG_PATH", path), \
+                    mock.patch.object(triage, "TAIL_WINDOW_BYTES", 256):
+                self.assertEqual(triage.get_today_sent_count(), 20)
+
+
+class TestDailySummaryWindow(unittest.TestCase):
+    def test_only_last_24h_rows_counted(self):
+        now = datetime.now()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "inbox_triage_log.csv"
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(triage.TRIAGE_LOG_FIELDS)
+                for i in range(300):
+                    ts = (now - timedelta(days=30, minutes=-i)).isoformat()
+                    writer.writerow([ts, f"old{i}", "a@example.com", "old\nsubject", "bounce", "x"])
+                for i in range(7):
+                    ts = (now - timedelta(hours=2, minutes=-i)).isoformat()
+                    writer.writerow([ts, f"new{i}", "b@example.com", "Pricing?", "question", "x"])
+
+            with mock.patch.dict(os.environ, {"NOTIFY_EMAIL": "ops@example.com"}), \
+                    mock.patch.object(triage, "TRIAGE_LOG_PATH", path), \
+                    mock.patch.object(triage, "BISECT_MIN_SPAN_BYTES", 64), \
+                    mock.patch.object(triage, "send_smtp_email") as send:
+                triage.generate_daily_summary()
+
+        subject, body = send.call_args[0][1], send.call_args[0][2]
+        self.assertIn("7 items", subject)
+        self.assertIn("question: 7", body)
+        self.assertNotIn("bounce", body)
+
+
+class TestWatchLoop(unittest.TestCase):
+    def test_watch_reuses_state_across_batches(self):
+        args = argparse.Namespace(daily_summary=False, dry_run=True, since_hours=24,
+                                  max_messages=100, watch_seconds=5)
+        state = {"processed_message_ids": triage.ProcessedIds()}
+        with mock.patch.object(triage, "INBOUND_BACKEND", "imap"), \
+                mock.patch.object(triage, "load_state", return_value=state) as load, \
+                mock.patch.object(triage, "run_imap_batch", return_value=True) as batch, \
+                mock.patch.object(triage.time, "sleep", side_effect=[None, KeyboardInterrupt]):
+            triage.run_triage(args)
+
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(batch.call_count, 2)
+        self.assertIs(batch.call_args[0][0], state)
+
+
+if __name__ == "__main__":
+    unittest.main()
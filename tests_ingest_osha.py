@@ -0,0 +1,434 @@
+import os
+import socket
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import ingest_osha
+
+
+def _results_page(*activity_nrs):
+    rows = "".join(
+        f"<tr><td><a href=\"establishment.inspection_detail?id={nr}.015\">{nr}.015</a></td>"
+        f"<td>01/05/2025</td><td>VA</td><td>Complaint</td><td>Complete</td>"
+        f"<td>236220</td><td>Example Builders LLC</td></tr>"
+        for nr in activity_nrs
+    )
+    return f"<html><body><table>{rows}</table></body></html>"
+
+
+class TestSession(unittest.TestCase):
+    def test_session_pools_keep_alive_connections(self):
+        session = ingest_osha.get_session()
+        adapter = session.get_adapter("https://www.osha.gov/ords/imis/establishment.search")
+
+        self.assertIs(adapter, session.get_adapter("http://127.0.0.1/inspection"))
+        self.assertEqual(adapter._pool_maxsize, ingest_osha.POOL_MAXSIZE)
+        self.assertEqual(adapter.max_retries.total, 0)
+        self.assertEqual(session.headers["Connection"], "keep-alive")
+        self.assertTrue(adapter._pool_block)
+        socket_options = adapter.poolmanager.connection_pool_kw["socket_options"]
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), socket_options)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_bursts_then_paces_and_honors_pause(self):
+        clock = _FakeClock()
+        with mock.patch.object(ingest_osha.time, "monotonic", clock.monotonic), \
+                mock.patch.object(ingest_osha.time, "sleep", clock.sleep):
+            bucket = ingest_osha.TokenBucket(rate=2.0, capacity=2)
+            bucket.acquire()
+            bucket.acquire()
+            self.assertEqual(clock.sleeps, [])
+
+            bucket.acquire()
+            self.assertEqual(clock.sleeps, [0.5])
+
+            # A slow response already spaced requests out: no sleep needed
+            clock.now += 3
+            bucket.acquire()
+            self.assertEqual(clock.sleeps, [0.5])
+
+            bucket.pause(10)
+            bucket.acquire()
+            self.assertAlmostEqual(sum(clock.sleeps[1:]), 10.0)
+
+
+class TestConcurrentSearch(unittest.TestCase):
+    def test_terms_merged_in_order_and_deduped(self):
+        pages = {"inc": ("111111111", "222222222"), "llc": ("222222222", "333333333")}
+
+        def fake_fetch(session, url):
+            term = parse_qs(urlparse(url).query)["establishment"][0]
+            return SimpleNamespace(text=_results_page(*pages.get(term, ())), url=url)
+
+        with mock.patch.object(ingest_osha, "fetch_with_retry", side_effect=fake_fetch) as fetch:
+            results = ingest_osha.search_osha_inspections(object(), "VA", "2025-01-01")
+
+        self.assertEqual(fetch.call_count, len(ingest_osha.SEARCH_TERMS))
+        self.assertEqual([r["activity_nr"] for r in results], ["111111111", "222222222", "333333333"])
+        self.assertEqual(results[0]["date_opened"], "2025-01-05")
+        self.assertEqual(results[0]["inspection_type"], "Complaint")
+        self.assertTrue(results[0]["detail_url"].startswith("https://www.osha.gov/ords/imis/"))
+
+
+class TestResultRowScan(unittest.TestCase):
+    def test_regex_scan_matches_soup_rows(self):
+        html = _results_page("111111111", "222222222").replace(
+            "Example Builders LLC", "Example &amp; Sons <b>Builders</b>")
+        html = html.replace("<tr>", "<TR class='row'><td><a name='x'></a></td>", 1)
+
+        fast = ingest_osha.scan_result_rows(html)
+        self.assertIsNotNone(fast)
+        self.assertEqual(fast, ingest_osha.soup_result_rows(ingest_osha.make_soup(html)))
+        self.assertEqual(fast[1][2], "222222222.015")
+
+    def test_nested_or_unclosed_markup_falls_back(self):
+        nested = "<table><tr><td><table><tr><td>x</td></tr></table></td></tr></table>"
+        unclosed = "<table><tr><td>1<td>2</table>"
+
+        self.assertIsNone(ingest_osha.scan_result_rows(nested))
+        self.assertIsNone(ingest_osha.scan_result_rows(unclosed))
+
+    @unittest.skipIf(ingest_osha.lxml is None, "lxml not installed")
+    def test_lxml_rows_match_soup_rows(self):
+        nested = _results_page("111111111").replace(
+            "<td>", "<td><table><tr><td>inner <a href='#'>x</a></td></tr></table>", 1)
+        for html in (nested, "<table><tr><td>1<td> <a href='a?id=2'> 2 </a></table><tr><td>stray</td></tr>"):
+            page_text, rows = ingest_osha.tree_result_rows(html)
+            soup = ingest_osha.make_soup(html)
+            self.assertEqual(rows, ingest_osha.soup_result_rows(soup))
+            self.assertEqual(page_text, soup.get_text())
+
+
+class TestPageHash(unittest.TestCase):
+    def test_page_hash_is_stable_and_fits_raw_hash(self):
+        h1 = ingest_osha.compute_page_hash("<html>a</html>")
+
+        self.assertEqual(h1, ingest_osha.compute_page_hash("<html>a</html>"))
+        self.assertNotEqual(h1, ingest_osha.compute_page_hash("<html>b</html>"))
+        self.assertEqual(len(h1), 32)
+        self.assertEqual(h1, ingest_osha.compute_page_hash(b"<html>a</html>"))
+        self.assertEqual(h1, ingest_osha.compute_hash("<html>a</html>"))
+
+
+def _inspection(activity_nr, **fields):
+    record = {
+        "activity_nr": activity_nr,
+        "establishment_name": "Example Builders LLC",
+        "site_state": "VA",
+        "site_city": "Arlington",
+        "date_opened": "2025-01-05",
+        "case_status": "OPEN",
+    }
+    record.update(fields)
+    return record
+
+
+class TestBatchUpsert(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.executescript((Path(__file__).parent / "schema.sql").read_text())
+
+    def tearDown(self):
+        self.conn.close()
+
+    def _row(self, activity_nr):
+        return self.conn.execute(
+            "SELECT violations_count, case_status, scope, re_alert, establishment_name "
+            "FROM inspections WHERE activity_nr = ?", (activity_nr,)).fetchone()
+
+    def test_batch_inserts_then_updates_without_nulling_fields(self):
+        inserted, updated = ingest_osha.upsert_inspections(self.conn, [
+            _inspection("111111111", scope="Complete"),
+            _inspection("222222222"),
+            _inspection("111111111", violations_count=2),
+        ])
+        self.conn.commit()
+
+        self.assertEqual((inserted, updated), (2, 1))
+        self.assertEqual(self._row("111111111"), (2, "OPEN", "Complete", 1, "Example Builders LLC"))
+
+        inserted, updated = ingest_osha.upsert_inspections(self.conn, [
+            _inspection("222222222", case_status="CLOSED", establishment_name=None),
+            _inspection("333333333"),
+        ])
+        self.conn.commit()
+
+        self.assertEqual((inserted, updated), (1, 1))
+        self.assertEqual(self._row("222222222"), (None, "CLOSED", None, 1, "Example Builders LLC"))
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM inspections").fetchone()[0], 3)
+
+    def test_flush_runs_one_explicit_transaction_on_autocommit_connection(self):
+        conn = sqlite3.connect(":memory:", isolation_level=None)
+        conn.executescript((Path(__file__).parent / "schema.sql").read_text())
+        statements = []
+        conn.set_trace_callback(statements.append)
+        pending = [_inspection("111111111"), _inspection("222222222")]
+
+        self.assertEqual(ingest_osha._flush_upserts(conn, pending), (2, 0, 0))
+
+        self.assertEqual(pending, [])
+        self.assertFalse(conn.in_transaction)
+        self.assertEqual([s for s in statements if s in ("BEGIN IMMEDIATE", "COMMIT")], ["BEGIN IMMEDIATE", "COMMIT"])
+        conn.close()
+
+    def test_changed_at_only_moves_when_record_changes(self):
+        def changed_at():
+            return self.conn.execute(
+                "SELECT changed_at, re_alert FROM inspections WHERE activity_nr = '111111111'").fetchone()
+
+        ingest_osha.upsert_inspections(self.conn, [_inspection("111111111")])
+        self.conn.execute("UPDATE inspections SET changed_at = 'before'")
+
+        ingest_osha.upsert_inspections(self.conn, [_inspection("111111111")])
+        self.assertEqual(changed_at(), ("before", 0))
+
+        ingest_osha.upsert_inspections(self.conn, [_inspection("111111111", scope="Partial")])
+        self.assertNotEqual(changed_at()[0], "before")
+        self.assertEqual(changed_at()[1], 0)
+
+
+class TestConfigureConnection(unittest.TestCase):
+    def _pragmas(self, conn):
+        ingest_osha.configure_connection(conn)
+        return [conn.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in ("journal_mode", "synchronous", "temp_store", "cache_size")]
+
+    def test_file_db_gets_wal_and_tuned_pragmas(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = sqlite3.connect(os.path.join(tmp, "osha.sqlite"))
+            try:
+                self.assertEqual(self._pragmas(conn), ["wal", 1, 2, -ingest_osha.SQLITE_CACHE_KIB])
+            finally:
+                conn.close()
+
+    def test_memory_db_keeps_its_journal(self):
+        conn = sqlite3.connect(":memory:")
+        self.assertEqual(self._pragmas(conn)[0], "memory")
+        conn.close()
+
+
+class TestExtractPage(unittest.TestCase):
+    HTML = (
+        "<html><head><title>Detail</title><script>var s = 'Case Status: X';</script></head><body>\n"
+        "<table><tr><th>Type <b>x</b></th><th> Scope </th></tr>"
+        "<tr><td> Accident <i>one</i></td><td>Complete</td></tr></table>\n"
+        "<p>Case Status: Open</p>\n</body></html>"
+    )
+
+    @unittest.skipIf(ingest_osha.lxml is None, "lxml not installed")
+    def test_lxml_path_matches_beautifulsoup(self):
+        fast = ingest_osha.extract_page(self.HTML)
+        with mock.patch.object(ingest_osha, "lxml", None):
+            slow = ingest_osha.extract_page(self.HTML)
+
+        self.assertEqual(fast, slow)
+        self.assertNotIn("var s", fast[0])
+        self.assertEqual(fast[1][0][1][0], (" Accident one", "Accidentone"))
+
+
+class TestRunIngestion(unittest.TestCase):
+    def test_details_fetched_concurrently_and_written_by_one_thread(self):
+        search_rows = [
+            {"activity_nr": nr, "detail_url": f"http://127.0.0.1/detail?id={nr}", "site_state": "VA"}
+            for nr in ("111111111", "222222222", "333333333")
+        ]
+
+        def fake_search(session, state, term, since_dt, now):
+            return search_rows if term == "inc" else []
+
+        def fake_fetch(session, url):
+            if "222222222" in url:
+                raise RuntimeError("boom")
+            html = ("<html><body>\n<p>Establishment Name: Example Builders LLC</p>\n"
+                    "<p>Date Opened: 01/05/2025</p>\n<p>Site Address</p>\n<p>Arlington, VA 22201</p>\n"
+                    "</body></html>")
+            return SimpleNamespace(text=html, content=html.encode("utf-8"), url=url, encoding="utf-8")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "osha.db")
+            with sqlite3.connect(db_path) as conn:
+                conn.executescript((Path(__file__).parent / "schema.sql").read_text())
+            with mock.patch.object(ingest_osha, "_search_term", side_effect=fake_search), \
+                    mock.patch.object(ingest_osha, "fetch_with_retry", side_effect=fake_fetch), \
+                    mock.patch.object(ingest_osha, "UPSERT_BATCH_SIZE", 1):
+                stats = ingest_osha.run_ingestion(db_path, 2, ["VA"], max_details=10)
+
+            conn = sqlite3.connect(db_path)
+            try:
+                rows = conn.execute("SELECT activity_nr, site_city FROM inspections ORDER BY activity_nr").fetchall()
+            finally:
+                conn.close()
+
+        self.assertEqual(stats["details_fetched"], 2)
+        self.assertEqual(stats["rows_inserted"], 2)
+        self.assertEqual(stats["errors_count"], 1)
+        self.assertEqual(rows, [("111111111", "Arlington"), ("333333333", "Arlington")])
+
+    def test_fresh_bulk_load_rebuilds_secondary_indexes_after_writes(self):
+        def fake_search(session, state, term, since_dt, now):
+            return [{"activity_nr": "111111111", "detail_url": "http://127.0.0.1/detail?id=1", "site_state": "VA"}]
+
+        def fake_fetch(session, url):
+            html = "<html><body>\n<p>Establishment Name: Example Builders LLC</p>\n</body></html>"
+            return SimpleNamespace(text=html, content=html.encode("utf-8"), url=url, encoding="utf-8")
+
+        def index_names(conn):
+            return sorted(r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'inspections' AND sql IS NOT NULL"))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "osha.db")
+            with sqlite3.connect(db_path) as conn:
+                conn.executescript((Path(__file__).parent / "schema.sql").read_text())
+                ingest_osha.ensure_inspection_columns(conn)
+                before = index_names(conn)
+            conn.close()
+
+            seen_during_write = []
+            real_flush = ingest_osha._flush_upserts
+
+            def spy_flush(conn, pending):
+                seen_during_write.append(index_names(conn))
+                return real_flush(conn, pending)
+
+            with mock.patch.object(ingest_osha, "_search_term", side_effect=fake_search), \
+                    mock.patch.object(ingest_osha, "fetch_with_retry", side_effect=fake_fetch), \
+                    mock.patch.object(ingest_osha, "_flush_upserts", side_effect=spy_flush), \
+                    mock.patch.object(ingest_osha, "BULK_LOAD_MIN_ROWS", 0):
+                stats = ingest_osha.run_ingestion(db_path, 2, ["VA"], max_details=10)
+
+            conn = sqlite3.connect(db_path)
+            try:
+                after = index_names(conn)
+            finally:
+                conn.close()
+
+        self.assertEqual(stats["rows_inserted"], 1)
+        self.assertEqual(seen_during_write[0], ["idx_inspections_lead_key"])
+        self.assertEqual(after, before)
+
+    def test_interrupted_bulk_load_indexes_rebuilt_on_next_run(self):
+        def index_names(conn):
+            return sorted(r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'inspections' AND sql IS NOT NULL"))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "osha.db")
+            conn = sqlite3.connect(db_path, isolation_level=None)
+            conn.executescript((Path(__file__).parent / "schema.sql").read_text())
+            ingest_osha.ensure_inspection_columns(conn)
+            before = index_names(conn)
+            ingest_osha._defer_secondary_indexes(conn)
+            # Process dies here: the finally-block rebuild never runs
+            conn.close()
+
+            conn = sqlite3.connect(db_path, isolation_level=None)
+            try:
+                self.assertEqual(index_names(conn), ["idx_inspections_lead_key"])
+                ingest_osha.ensure_inspection_columns(conn)
+                after = index_names(conn)
+                pending = conn.execute("SELECT COUNT(*) FROM deferred_indexes").fetchone()[0]
+            finally:
+                conn.close()
+
+        self.assertGreater(len(before), 1)
+        self.assertEqual(after, before)
+        self.assertEqual(pending, 0)
+
+    def test_refresh_invalid_writes_in_batches(self):
+        def fake_fetch(session, url):
+            html = "<html><body>\n<p>Establishment Name: Fixed Roofing LLC</p>\n</body></html>"
+            return SimpleNamespace(text=html, content=html.encode("utf-8"), url=url, encoding="utf-8")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "osha.db")
+            with sqlite3.connect(db_path) as conn:
+                conn.executescript((Path(__file__).parent / "schema.sql").read_text())
+                ingest_osha.upsert_inspections(conn, [
+                    _inspection(nr, establishment_name=name)
+                    for nr, name in (("111111111", None), ("222222222", "222222222.015"), ("333333333", "Acme, Inc."))
+                ] + [_inspection("444444444")])
+            with mock.patch.object(ingest_osha, "fetch_with_retry", side_effect=fake_fetch), \
+                    mock.patch.object(ingest_osha, "UPSERT_BATCH_SIZE", 2), \
+                    mock.patch.object(ingest_osha, "_flush_upserts", wraps=ingest_osha._flush_upserts) as flush:
+                stats = ingest_osha.refresh_invalid_records(db_path, max_details=10)
+
+            conn = sqlite3.connect(db_path)
+            try:
+                names = dict(conn.execute("SELECT activity_nr, establishment_name FROM inspections"))
+            finally:
+                conn.close()
+
+        self.assertEqual(flush.call_count, 2)
+        self.assertEqual((stats["refreshed"], stats["fixed"], stats["errors"]), (3, 3, 0))
+        self.assertEqual(set(names.values()), {"Fixed Roofing LLC", "Example Builders LLC"})
+        self.assertEqual(names["444444444"], "Example Builders LLC")
+
+
+class TestDetailPatterns(unittest.TestCase):
+    def test_activity_nr_from_query_and_text_labels(self):
+        html = "<html><body>\n<p>Activity Nr: 317000001.015</p>\n<p>Total Violations: 4</p>\n</body></html>"
+
+        from_query = ingest_osha.parse_inspection_detail(html, "http://127.0.0.1/inspection?activity_nr=123456789")
+        from_label = ingest_osha.parse_inspection_detail(html, "http://127.0.0.1/inspection")
+
+        self.assertEqual(from_query["activity_nr"], "123456789")
+        self.assertEqual(from_label["activity_nr"], "317000001")
+        self.assertEqual(from_label["violations_count"], 4)
+
+    def test_undecoded_body_parses_like_decoded_text(self):
+        html = ("<html><body>\n<p>Establishment Name: Caf\u00e9 Ni\u00f1o LLC</p>\n"
+                "<p>Date Opened: 01/05/2025</p>\n</body></html>")
+        body = html.encode("iso-8859-1")
+
+        from_text = ingest_osha.parse_inspection_detail(html, "http://127.0.0.1/inspection?id=1", raw=body)
+        from_bytes = ingest_osha.parse_inspection_detail(body, "http://127.0.0.1/inspection?id=1", encoding="ISO-8859-1")
+
+        self.assertEqual(from_bytes, from_text)
+        self.assertEqual(from_bytes["establishment_name"], "Caf\u00e9 Ni\u00f1o LLC")
+
+    def test_response_raw_hash_is_sha256_of_utf8_text(self):
+        html = "<html><body>\n<p>Establishment Name: Caf\u00e9 Ni\u00f1o LLC</p>\n</body></html>"
+        expected = ingest_osha.compute_hash(html)
+        for encoding in ("ISO-8859-1", "utf-8", None):
+            body = html.encode(encoding or "utf-8")
+            response = SimpleNamespace(text=html, content=body, encoding=encoding)
+            data = ingest_osha.parse_detail_response(response, "http://127.0.0.1/inspection?id=1")
+            self.assertEqual(data["raw_hash"], expected, encoding)
+            self.assertEqual(data["establishment_name"], "Caf\u00e9 Ni\u00f1o LLC")
+
+    def test_site_block_wins_over_earlier_establishment_label(self):
+        html = ("<html><body>\n<p>Establishment Name: Label Co</p>\n<p>Site Address:</p>\n"
+                "<p>Acme Roofing LLC</p>\n<p>Austin, TX 78701</p>\n<p>Mailing Address:</p>\n"
+                "<p>9 Oak Rd, Dallas, TX 75201</p>\n<p>NAICS: 238160 Roofing</p>\n"
+                "</body></html>")
+
+        data = ingest_osha.parse_inspection_detail(html, "http://127.0.0.1/inspection?id=1")
+
+        self.assertEqual(data["establishment_name"], "Acme Roofing LLC")
+        self.assertEqual((data["site_city"], data["site_state"], data["site_zip"]), ("Austin", "TX", "78701"))
+        self.assertEqual((data["mail_address1"], data["mail_city"]), ("9 Oak Rd", "Dallas"))
+        self.assertEqual(data["naics"], "238160")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import csv
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import onboard_subscriber as onboard
+from lead_filters import merge_territory_definition
+
+
+class _FakeSMTP:
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    def send_message(self, msg):
+        self.sent.append(msg["To"])
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+def _request(recipients):
+    return onboard.OnboardingRequest(
+        territory_tag="TX_TRIANGLE",
+        territory_code="TX_TRIANGLE_V1",
+        send_time_local="08:00",
+        timezone="America/Chicago",
+        threshold="MEDIUM",
+        content_filter="high_medium",
+        include_low_fallback=True,
+        recipients=recipients,
+        display_name="Acme",
+        subscriber_key="sub_test",
+        notes="",
+        trial_length_days=7,
+    )
+
+
+class TestConfirmationEmails(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.tmp.name) / "osha.sqlite")
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript((Path(__file__).parent / "schema.sql").read_text(encoding="utf-8"))
+        conn.executemany(
+            "INSERT INTO suppression_list (email_or_domain, reason) VALUES (?, ?)",
+            [("Blocked@Example.com", "unsubscribe"), ("optout.org", "domain")],
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_suppressed_by_email_or_domain(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            blocked = onboard._suppressed_recipients(
+                conn, ["ok@example.com", "blocked@example.com", "anyone@optout.org"])
+        finally:
+            conn.close()
+        self.assertEqual(blocked, ["blocked@example.com", "anyone@optout.org"])
+
+    def test_one_session_for_all_recipients(self):
+        server = _FakeSMTP()
+        req = _request(["a@example.com", "blocked@example.com", "b@example.com"])
+        with mock.patch.dict(os.environ, {"SMTP_USER": "u", "SMTP_PASS": "p"}), \
+                mock.patch.object(onboard, "_open_smtp_session", return_value=server) as opener:
+            result = onboard._send_confirmation_emails(self.db_path, req)
+
+        self.assertEqual(opener.call_count, 1)
+        self.assertEqual(server.sent, ["a@example.com", "b@example.com"])
+        self.assertTrue(server.closed)
+        self.assertEqual((result["sent"], result["suppressed"], result["errors"]), (2, 1, []))
+
+
+class TestUpsertSubscriber(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.executescript((Path(__file__).parent / "schema.sql").read_text(encoding="utf-8"))
+        self.conn.execute(
+            "INSERT INTO territories (territory_code, description, states_json, office_patterns_json, "
+            "fallback_city_patterns_json, active) VALUES ('TX_TRIANGLE_V1', '', '[]', '[]', '[]', 1)"
+        )
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_updates_same_email_and_refuses_reassignment(self):
+        onboard._upsert_subscriber(self.conn, _request(["a@example.com"]))
+        onboard._upsert_subscriber(self.conn, _request(["a@example.com", "b@example.com"]))
+        with self.assertRaisesRegex(onboard.OnboardingError, r"different email \(a@example.com\)"):
+            onboard._upsert_subscriber(self.conn, _request(["c@example.com"]))
+
+        rows = self.conn.execute("SELECT email, recipients_json FROM subscribers").fetchall()
+        self.assertEqual(rows, [("a@example.com", '["a@example.com", "b@example.com"]')])
+
+
+class TestTerritoryDefinitions(unittest.TestCase):
+    def test_territory_merged_mid_process_is_seen(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmp.name)
+
+        with self.assertRaisesRegex(onboard.OnboardingError, "Unknown territory"):
+            onboard._resolve_territory_code("OK_TULSA")
+        merge_territory_definition("OK_TULSA_V1", {"description": "Tulsa", "states": ["ok"]})
+        self.assertEqual(onboard._resolve_territory_code("OK_TULSA"), ("OK_TULSA", "OK_TULSA_V1"))
+
+        merge_territory_definition("OK_TULSA_V1", {"description": "Tulsa metro", "states": ["ok"]})
+        self.assertEqual(onboard._territory_row("OK_TULSA_V1")[:2], ("Tulsa metro", '["OK"]'))
+
+
+class TestAuditLog(unittest.TestCase):
+    def test_header_written_once_across_batches(self):
+        row = {field: "x" for field in onboard.AUDIT_LOG_FIELDS}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = onboard._append_audit_row(tmp, {**row, "status": "single"})
+            with onboard._AuditLog(tmp) as audit:
+                audit.append({**row, "status": "batch1"})
+                audit.append({**row, "status": "batch2"})
+
+            with open(path, "r", newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual([r["status"] for r in rows], ["single", "batch1", "batch2"])
+
+
+class TestEnsureSchema(unittest.TestCase):
+    def _query(self, db_path, sql):
+        conn = sqlite3.connect(db_path)
+        try:
+            return conn.execute(sql).fetchall()
+        finally:
+            conn.close()
+
+    def test_skipped_when_stamped_and_missing_objects_recreated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = str(Path(tmp) / "data" / "osha.sqlite")
+            schema_path = Path(tmp) / "schema.sql"
+            # The INSERT only runs when the script is applied, so the row count shows each apply
+            schema_path.write_text(
+                "CREATE TABLE IF NOT EXISTS a (id INTEGER);\n"
+                "CREATE INDEX IF NOT EXISTS idx_a ON a(id);\n"
+                "INSERT INTO a VALUES (1);\n",
+                encoding="utf-8",
+            )
+            onboard._ensure_schema(db_path, str(schema_path))
+            onboard._ensure_schema(db_path, str(schema_path))
+            self.assertEqual(self._query(db_path, "SELECT COUNT(*) FROM a"), [(1,)])
+
+            conn = sqlite3.connect(db_path)
+            conn.execute("DROP INDEX idx_a")
+            conn.commit()
+            conn.close()
+            onboard._ensure_schema(db_path, str(schema_path))
+            names = {r[0] for r in self._query(db_path, "SELECT name FROM sqlite_master")}
+            self.assertEqual(names, {"a", "idx_a"})
+            self.assertEqual(self._query(db_path, "SELECT COUNT(*) FROM a"), [(2,)])
+
+            schema_path.write_text(
+                "CREATE TABLE IF NOT EXISTS a (id INTEGER);\nCREATE TABLE IF NOT EXISTS b (id INTEGER);\n",
+                encoding="utf-8",
+            )
+            onboard._ensure_schema(db_path, str(schema_path))
+            tables = {r[0] for r in self._query(db_path, "SELECT name FROM sqlite_master WHERE type = 'table'")}
+            self.assertEqual(tables, {"a", "b"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import outbound_cold_email as oce
+
+
+class TestCachedReads(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.sup_path = Path(self.tmp.name) / "suppression.csv"
+        self.sup_path.write_text("email,reason\nA@Example.com,unsubscribe\n", encoding="utf-8")
+        patcher = mock.patch.object(oce, "SUPPRESSION_PATH", self.sup_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unchanged_file_parsed_once_and_copies_returned(self):
+        with mock.patch.object(oce, "_read_suppression", wraps=oce._read_suppression) as reader:
+            first = oce.load_suppression_list()
+            first.add("mutated@example.com")
+            second = oce.load_suppression_list()
+        self.assertEqual(reader.call_count, 1)
+        self.assertEqual(second, {"a@example.com"})
+
+    def test_new_opt_out_seen_after_file_changes(self):
+        self.assertEqual(oce.load_suppression_list(), {"a@example.com"})
+        with open(self.sup_path, "a", encoding="utf-8") as f:
+            f.write("b@example.com,unsubscribe\n")
+        self.assertEqual(oce.load_suppression_list(), {"a@example.com", "b@example.com"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 from datetime import date
 
-from outbound_cold_email import select_sample_leads, select_sample_leads_with_reason
+from outbound_cold_email import build_sample_pool, select_sample_leads, select_sample_leads_with_reason
 
 
 class TestOutboundSelection(unittest.TestCase):
@@ -78,6 +78,27 @@ class TestOutboundSelection(unittest.TestCase):
         self.assertEqual(samples, [])
         self.assertEqual(reason, "no_high_med_leads")
 
+    def test_shared_pool_matches_per_recipient_selection(self):
+        leads = [
+            {
+                "activity_nr": f"A{i}",
+                "site_state": "TX" if i % 2 else "CA",
+                "date_opened": f"2026-01-{20 + i:02d}",
+                "lead_score": 6 + i % 4,
+                "case_status": "OPEN",
+                "first_seen_at": "",
+            }
+            for i in range(8)
+        ]
+        config = {**self.config, "sample_leads_max": 3}
+        pool = build_sample_pool(leads, config, "TX", as_of_date=self.as_of)
+
+        for email in ("a@example.com", "b@example.com"):
+            expected = select_sample_leads(leads, config, email, "camp", "TX", as_of_date=self.as_of)
+            samples = select_sample_leads(leads, config, email, "camp", "TX", pool=pool)
+            self.assertEqual(samples, expected)
+        self.assertEqual([s["activity_nr"] for s in samples], ["A7", "A5", "A3"])
+
 
 if __name__ == "__main__":
     unittest.main()
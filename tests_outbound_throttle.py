@@ -0,0 +1,90 @@
+import csv
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+import outbound_cold_email as oce
+
+
+def _write_log(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=oce.LOG_FIELDS)
+        writer.writeheader()
+        for ts, email, status in rows:
+            writer.writerow({"timestamp": ts, "recipient_email": email, "status": status})
+
+
+class TestThrottleTracker(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.tmp.name) / "cold_email_log.csv"
+        patcher = mock.patch.object(oce, "LOG_PATH", self.log_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+        self.now = datetime.now().replace(microsecond=0)
+        if self.now.hour < 3:
+            self.now = self.now.replace(hour=3)
+        _write_log(self.log_path, [
+            ((self.now - timedelta(days=1)).isoformat(), "old@a.com", "sent"),
+            ((self.now - timedelta(hours=2)).isoformat(), "x@a.com", "sent"),
+            ((self.now - timedelta(minutes=10)).isoformat(), "y@B.com", "delivered"),
+            ((self.now - timedelta(minutes=5)).isoformat(), "z@a.com", "failed"),
+        ])
+
+    def test_matches_log_and_counts_sends_without_rereading(self):
+        tracker = oce.ThrottleTracker()
+        stats = tracker.stats(self.now)
+        self.assertEqual((stats["daily_count"], stats["hourly_count"]), (2, 1))
+        self.assertEqual(dict(stats["domain_counts"]), {"a.com": 1, "b.com": 1})
+
+        with mock.patch.object(oce, "_today_final_sends", wraps=oce._today_final_sends) as scan:
+            for email, status in (("n@a.com", "sent"), ("s@a.com", "skipped")):
+                oce.log_send(email, "", [], "", "c", status, "", "")
+                tracker.record(email, status, when=self.now)
+            stats = tracker.stats(self.now)
+            scan.assert_not_called()
+        self.assertEqual((stats["daily_count"], stats["hourly_count"]), (3, 2))
+        self.assertEqual(stats["domain_counts"]["a.com"], 2)
+
+    def test_out_of_band_log_change_triggers_reload(self):
+        tracker = oce.ThrottleTracker()
+        tracker.stats(self.now)
+        with open(self.log_path, "a", newline="", encoding="utf-8") as f:
+            csv.DictWriter(f, fieldnames=oce.LOG_FIELDS).writerow(
+                {"timestamp": self.now.isoformat(), "recipient_email": "w@c.com", "status": "sent"})
+
+        stats = tracker.stats(self.now)
+        self.assertEqual(stats["daily_count"], 3)
+        self.assertEqual(stats["domain_counts"]["c.com"], 1)
+
+
+class TestTodayFinalSends(unittest.TestCase):
+    def test_tail_scan_matches_full_scan(self):
+        today = datetime.now().replace(microsecond=0)
+        rows = []
+        for i in range(300):
+            rows.append(((today - timedelta(days=2, minutes=i)).isoformat(), f"old{i}@a.com", "sent"))
+        for i in range(50):
+            rows.append(((today.replace(hour=0, minute=0) + timedelta(seconds=i)).isoformat(),
+                         f"n{i}@b.com", ("sent", "failed", "delivered")[i % 3]))
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = Path(tmp) / "cold_email_log.csv"
+            with open(log_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=oce.LOG_FIELDS)
+                writer.writeheader()
+                for ts, email, status in rows:
+                    writer.writerow({"timestamp": ts, "recipient_email": email, "status": status,
+                                     "error": "line one\nline two"})
+            expected = [(ts, email) for ts, email, status in rows
+                        if ts.startswith(today.date().isoformat()) and status in oce.FINAL_SEND_STATUSES]
+            with mock.patch.object(oce, "LOG_PATH", log_path), \
+                    mock.patch.object(oce, "TAIL_WINDOW_BYTES", 512):
+                self.assertEqual(oce._today_final_sends(today.date().isoformat()), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
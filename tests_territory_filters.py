@@ -1,9 +1,14 @@
+import json
+import os
+import tempfile
 import unittest
 
 from lead_filters import (
     apply_content_filter,
     dedupe_by_activity_nr,
     filter_by_territory,
+    load_territory_definitions,
+    merge_territory_definition,
     normalize_content_filter,
 )
 
@@ -53,6 +58,42 @@ class TestLeadFilters(unittest.TestCase):
         matched = {row["site_city"] for row in filtered}
         self.assertEqual(matched, {"Houston", "Dallas/Fort Worth", "Austin", "San Antonio"})
 
+    def test_fused_patterns_match_like_individual_patterns(self):
+        definitions = {
+            "T": {
+                "states": ["TX"],
+                "office_patterns": [r"\bwaco\b", r"(?i)tyler", r"(x)\1"],
+                "fallback_city_patterns": [r"\bsan[\s-]*marcos\b", r"\bkilleen\b"],
+            }
+        }
+        leads = [
+            {"activity_nr": "1", "site_state": "TX", "area_office": "WACO Office"},
+            {"activity_nr": "2", "site_state": "TX", "area_office": "Tyler"},
+            {"activity_nr": "3", "site_state": "TX", "area_office": "xx"},
+            {"activity_nr": "4", "site_state": "TX", "site_city": "San-Marcos"},
+            {"activity_nr": "5", "site_state": "TX", "area_office": "xy", "site_city": "Lubbock"},
+        ]
+
+        filtered, stats = filter_by_territory(leads, "T", definitions)
+
+        self.assertEqual([row["activity_nr"] for row in filtered], ["1", "2", "3", "4"])
+        self.assertEqual(stats["matched_by_office"], 3)
+        self.assertEqual(stats["excluded_territory"], 1)
+
+    def test_territory_definitions_reloaded_after_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "territories.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"A": {"states": ["TX"]}}, f)
+
+            first = load_territory_definitions(path)
+            first.pop("A")
+            self.assertIn("A", load_territory_definitions(path))
+            self.assertIn("TX_TRIANGLE_V1", first)
+
+            merge_territory_definition("B", {"states": ["OK"]}, path)
+            self.assertEqual(load_territory_definitions(path)["B"]["states"], ["OK"])
+
     def test_dedupe_by_activity_nr_keeps_best_score(self):
         leads = [
             {"activity_nr": "100", "lead_score": 6, "first_seen_at": "2026-02-01T08:00:00"},